@@ -0,0 +1,146 @@
+from langchain_core.tools import BaseTool, StructuredTool
+from zoho.async_crm_client import AsyncZohoCRMClient
+from utils.query_validator import validate_and_format_coql
+from utils.lazy import Lazy
+from .tools import (
+    zoho_credentials,
+    rate_limiter,
+    token_state,
+    field_cache,
+    module_cache,
+    record_cache,
+    query_cache,
+    users_directory,
+    client_metrics,
+    QUERY_TOOL_MAX_BYTES,
+    QUERY_TOOL_MAX_ROWS,
+    query_tool_result,
+    get_fields_tool,
+    query_records_tool,
+    create_records_tool,
+    update_records_tool,
+    upsert_records_tool,
+    bulk_write_records_tool,
+    convert_lead_tool,
+    send_mail_tool,
+    get_module_api_name_tool,
+    get_specific_record_tool,
+    create_task_tool,
+)
+
+async_zoho_client = Lazy(lambda: AsyncZohoCRMClient(
+    *zoho_credentials(),
+    rate_limiter=rate_limiter,
+    token_state=token_state,
+    field_cache=field_cache,
+    module_cache=module_cache,
+    record_cache=record_cache,
+    query_cache=query_cache,
+    users=users_directory,
+    metrics=client_metrics,
+))
+
+
+def get_async_zoho_client() -> AsyncZohoCRMClient:
+    return async_zoho_client.get()
+
+
+async def aresolve_module(module: str) -> str:
+    return await get_async_zoho_client().resolve_module(module) or module
+
+
+async def aget_fields_tool(module: str, datatypes: list):
+    return await get_async_zoho_client().get_fields(await aresolve_module(module), datatypes)
+
+
+async def aquery_records_tool(query: str, max_rows: int | None = None):
+    validation = validate_and_format_coql(query)
+
+    if not validation["valid"]:
+        return {
+            "success": False,
+            "error": "INVALID_QUERY",
+            "message": "Query validation failed",
+            "details": {
+                "original_query": query,
+                "errors": validation["errors"],
+                "warnings": validation["warnings"]
+            }
+        }
+
+    if max_rows:
+        response = await get_async_zoho_client().query_all_records(
+            query, max_rows=min(max_rows, QUERY_TOOL_MAX_ROWS), max_bytes=QUERY_TOOL_MAX_BYTES
+        )
+    else:
+        response = await get_async_zoho_client().query_records(query)
+
+    return query_tool_result(response, validation)
+
+
+async def acreate_records_tool(module: str, payload: dict):
+    return await get_async_zoho_client().create_record(await aresolve_module(module), payload)
+
+
+async def aconvert_lead_tool(record_id: str, payload: dict):
+    return await get_async_zoho_client().convert_lead(record_id, payload)
+
+
+async def aupdate_records_tool(module_api_name: str, body: dict):
+    return await get_async_zoho_client().update_records(await aresolve_module(module_api_name), body)
+
+
+async def aupsert_records_tool(module: str, payload: dict):
+    return await get_async_zoho_client().upsert_records(await aresolve_module(module), payload)
+
+
+async def abulk_write_records_tool(module: str, records: list, operation: str = "upsert", find_by: str | None = None):
+    return await get_async_zoho_client().bulk_write_records(await aresolve_module(module), records, operation, find_by)
+
+
+async def asend_mail_tool(to_mail: str, mail_subject: str, mail_content: str):
+    return await get_async_zoho_client().send_mail(to_mail, mail_subject, mail_content)
+
+
+async def aget_module_api_name_tool():
+    return await get_async_zoho_client().get_module_api_name()
+
+
+async def aget_specific_record_tool(module: str, record_id: str):
+    return await get_async_zoho_client().get_specific_record(await aresolve_module(module), record_id)
+
+
+async def acreate_task_tool(payload):
+    return await get_async_zoho_client().create_Task(payload)
+
+
+def with_coroutine(sync_tool: BaseTool, coroutine) -> StructuredTool:
+    """
+    Pair a synchronous @tool with its native coroutine.
+
+    The returned tool keeps the original name, description and argument
+    schema, runs `coroutine` on the event loop under ainvoke (LangGraph
+    server) and falls back to the blocking implementation under invoke.
+    """
+    return StructuredTool(
+        name=sync_tool.name,
+        description=sync_tool.description,
+        args_schema=sync_tool.args_schema,
+        func=sync_tool.func,
+        coroutine=coroutine,
+    )
+
+
+tools = [
+    with_coroutine(get_fields_tool, aget_fields_tool),
+    with_coroutine(query_records_tool, aquery_records_tool),
+    with_coroutine(create_records_tool, acreate_records_tool),
+    with_coroutine(update_records_tool, aupdate_records_tool),
+    with_coroutine(upsert_records_tool, aupsert_records_tool),
+    with_coroutine(bulk_write_records_tool, abulk_write_records_tool),
+    with_coroutine(convert_lead_tool, aconvert_lead_tool),
+    with_coroutine(send_mail_tool, asend_mail_tool),
+    with_coroutine(get_module_api_name_tool, aget_module_api_name_tool),
+    with_coroutine(get_specific_record_tool, aget_specific_record_tool),
+    with_coroutine(create_task_tool, acreate_task_tool),
+]
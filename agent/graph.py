@@ -1,7 +1,6 @@
 from typing import TypedDict, List, Annotated, Any
 from langgraph.graph import StateGraph, START, END, MessagesState, add_messages
 from langgraph.prebuilt import ToolNode
-from langchain_groq import ChatGroq
 from langchain_core.messages import (
     BaseMessage,
     AIMessage,
@@ -11,57 +10,93 @@ from langchain_core.messages import (
     ToolMessage,
 )
 from typing_extensions import Literal
-from .tools import (
-    get_fields_tool,
-    query_records_tool,
-    create_records_tool,
-    update_records_tool,
-    convert_lead_tool,
-    send_mail_tool,
-    get_module_api_name_tool,
-    get_specific_record_tool,
-    create_task_tool
-)
+from langchain_core.runnables import RunnableLambda
+from .async_tools import get_async_zoho_client, tools
+from .profiling import AGENT_PROFILE, GraphProfiler
+from .tools import get_zoho_client
+from utils.lazy import Lazy
+from utils.log import graph_log_fields, log_context
+from zoho.composite import batching
 
 from .prompts import get_system_prompt_text
+import inspect
 import os
 from datetime import datetime, timezone
 from langchain.messages import RemoveMessage
 from pydantic import BaseModel, Field
-groq_api_key = os.getenv("GROQ_DEV_API")
-if not groq_api_key:
-    raise ValueError("Environment variable GROQ_DEV_API is not set!")
-os.environ["GROQ_API_KEY"] = groq_api_key
+model_name = "qwen/qwen3-32b"
 
 
+def _configure_groq():
+    groq_api_key = os.getenv("GROQ_DEV_API")
+    if not groq_api_key:
+        raise ValueError("Environment variable GROQ_DEV_API is not set!")
+    os.environ["GROQ_API_KEY"] = groq_api_key
 
-tools = [
-    get_fields_tool,
-    query_records_tool,
-    create_records_tool,
-    update_records_tool,
-    convert_lead_tool,
-    send_mail_tool,
-    get_module_api_name_tool,
-    get_specific_record_tool,
-    create_task_tool
-]
 
-model_name = "qwen/qwen3-32b"
+def _build_llm():
+    from langchain_groq import ChatGroq
 
-llm = ChatGroq(
-    temperature=0,
-    model_name=model_name,
-    max_retries=2
-).bind_tools(tools)
-
-summary_llm = ChatGroq(
-    temperature=0,
-    model_name=model_name,
-    max_retries=2,
-    max_tokens=512,
-    streaming=False
-)
+    _configure_groq()
+    return ChatGroq(
+        temperature=0,
+        model_name=model_name,
+        max_retries=2
+    ).bind_tools(tools)
+
+
+def _build_summary_llm():
+    from langchain_groq import ChatGroq
+
+    _configure_groq()
+    return ChatGroq(
+        temperature=0,
+        model_name=model_name,
+        max_retries=2,
+        max_tokens=512,
+        streaming=False
+    )
+
+
+llm = Lazy(_build_llm)
+summary_llm = Lazy(_build_summary_llm)
+
+
+def _warm_models():
+    llm.get()
+    summary_llm.get()
+    # LangSmith's client is also built lazily, on the first traced run.
+    from langsmith.utils import tracing_is_enabled
+
+    if tracing_is_enabled():
+        from langchain_core.tracers.langchain import get_client
+
+        get_client()
+
+
+def warm_up():
+    """
+    Build the models, the LangSmith client and the sync Zoho client and
+    fetch its first access token ahead of traffic instead of on the first
+    user turn. For synchronous (`invoke`) deployments. Safe to call more
+    than once.
+    """
+    _warm_models()
+    get_zoho_client().access_token
+
+
+async def awarm_up():
+    """
+    Async twin of warm_up for the LangGraph server, where tools run through
+    AsyncZohoCRMClient: builds the async client and fetches its token.
+
+    Await it from the worker's start hook, e.g. the lifespan of a custom
+    Starlette app registered as `"http": {"app": ...}` in langgraph.json.
+    It has to run on the server's event loop: the client's HTTP pool is
+    bound to the loop that opened it.
+    """
+    _warm_models()
+    await get_async_zoho_client().tokens.get_token()
 
 
 
@@ -71,7 +106,7 @@ class AgentState(TypedDict):
     summary_count: int
 
 
-def call_model(state: AgentState):
+def build_model_messages(state: AgentState) -> list:
     system_prompt_text = get_system_prompt_text()
     MessageLengthToAI = 10
 
@@ -86,13 +121,21 @@ def call_model(state: AgentState):
         recent_messages = state["messages"][-MessageLengthToAI:] if len(state["messages"]) > MessageLengthToAI else state["messages"]
         messages = [SystemMessage(content=system_message)] + recent_messages
 
-    response = llm.invoke(messages)
+    return messages
+
+
+def call_model(state: AgentState):
+    response = llm.get().invoke(build_model_messages(state))
     return {"messages": response}
 
 
-def summarize_conversation(state: AgentState):
+async def acall_model(state: AgentState):
+    response = await llm.get().ainvoke(build_model_messages(state))
+    return {"messages": response}
+
+
+def build_summary_messages(state: AgentState) -> list:
     summary = state.get("summary", "")
-    summary_count = state.get("summary_count", 0)
     summary_message = f"""
         You are an expert at summarize conversation while preserving all critical information
 
@@ -126,9 +169,20 @@ def summarize_conversation(state: AgentState):
         )
     ]
 
-    messages = filtered_messages + [HumanMessage(content=summary_message)]
-    response = summary_llm.invoke(messages)
-    
+    return filtered_messages + [HumanMessage(content=summary_message)]
+
+
+def summarize_conversation(state: AgentState):
+    summary_count = state.get("summary_count", 0)
+    response = summary_llm.get().invoke(build_summary_messages(state))
+
+    return {"summary": response.content, "summary_count": summary_count + 1 }
+
+
+async def asummarize_conversation(state: AgentState):
+    summary_count = state.get("summary_count", 0)
+    response = await summary_llm.get().ainvoke(build_summary_messages(state))
+
     return {"summary": response.content, "summary_count": summary_count + 1 }
 
 
@@ -167,11 +221,55 @@ def should_continue(state: MessagesState):
     return END
 
 
+tool_node = ToolNode(tools)
+
+
+def has_parallel_tool_calls(state: AgentState) -> bool:
+    return len(getattr(state["messages"][-1], "tool_calls", None) or []) > 1
+
+
+def run_tools(state: AgentState, config):
+    """
+    Run the tool calls of the last AI message. When it issued several at
+    once, their independent Zoho reads are coalesced into composite
+    requests instead of one round trip each.
+    """
+    if not has_parallel_tool_calls(state):
+        return tool_node.invoke(state, config)
+    with batching():
+        return tool_node.invoke(state, config)
+
+
+async def arun_tools(state: AgentState, config):
+    if not has_parallel_tool_calls(state):
+        return await tool_node.ainvoke(state, config)
+    with batching():
+        return await tool_node.ainvoke(state, config)
+
+
+def logged_node(func, afunc) -> RunnableLambda:
+    """
+    Graph node whose log lines (including the Zoho requests it makes) carry
+    the LangGraph thread id and node name.
+    """
+    pass_config = "config" in inspect.signature(func).parameters
+
+    def run(state: AgentState, config):
+        with log_context(**graph_log_fields(config)):
+            return func(state, config) if pass_config else func(state)
+
+    async def arun(state: AgentState, config):
+        with log_context(**graph_log_fields(config)):
+            return await (afunc(state, config) if pass_config else afunc(state))
+
+    return RunnableLambda(run, afunc=arun, name=func.__name__)
+
+
 graph = StateGraph(AgentState)
 
-graph.add_node("agent",call_model)
-graph.add_node("tools",ToolNode(tools))
-graph.add_node("summary_node",summarize_conversation)
+graph.add_node("agent",logged_node(call_model, acall_model))
+graph.add_node("tools",logged_node(run_tools, arun_tools))
+graph.add_node("summary_node",logged_node(summarize_conversation, asummarize_conversation))
 
 graph.add_conditional_edges(
     START,
@@ -194,4 +292,9 @@ graph.add_conditional_edges(
 graph.add_edge("tools","agent")
 
 
-app = graph.compile()
\ No newline at end of file
+# Per-turn node/tool/LLM timings and token usage; see agent.profiling.
+profiler = GraphProfiler() if AGENT_PROFILE else None
+
+app = graph.compile()
+if profiler is not None:
+    app = app.with_config(callbacks=[profiler])
\ No newline at end of file
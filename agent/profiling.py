@@ -0,0 +1,344 @@
+"""
+Per-turn profiling for the agent graph.
+
+GraphProfiler is a LangChain callback handler: attached to the compiled
+graph (AGENT_PROFILE=1 does this in agent.graph) it times every graph node,
+tool call and chat-model call of a turn and reads the model's token usage.
+It needs nothing from LangSmith.
+
+Each finished turn becomes a TurnProfile. It is logged at INFO, kept in
+memory under its LangGraph run_id, added to the process-wide ProfileReport,
+and, with AGENT_PROFILE_PATH set, appended to that file as a JSON line.
+Aggregate a file with:
+
+    python -m agent.profiling report profiles.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.log import get_logger, log_fields
+
+AGENT_PROFILE = os.getenv("AGENT_PROFILE", "false").lower() in ("1", "true", "yes")
+AGENT_PROFILE_PATH = os.getenv("AGENT_PROFILE_PATH")
+# Finished turns kept for lookup by run_id.
+AGENT_PROFILE_KEEP = int(os.getenv("AGENT_PROFILE_KEEP", "200"))
+# Most recent samples kept per ProfileReport series for the percentiles.
+AGENT_PROFILE_SAMPLES = int(os.getenv("AGENT_PROFILE_SAMPLES", "1000"))
+
+log = get_logger(__name__)
+
+
+@dataclass
+class TurnProfile:
+    run_id: str
+    thread_id: str | None
+    started: float
+    total: float = 0.0
+    error: str | None = None
+    # name -> list of wall times in seconds, one per call
+    nodes: dict = field(default_factory=lambda: defaultdict(list))
+    tools: dict = field(default_factory=lambda: defaultdict(list))
+    llm: list = field(default_factory=list)
+    # tool calls made by each pass through the tools node
+    tool_calls_per_step: list = field(default_factory=list)
+    tokens: dict = field(default_factory=lambda: {"input": 0, "output": 0, "total": 0})
+
+    @property
+    def tool_calls(self) -> int:
+        return sum(len(times) for times in self.tools.values())
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["nodes"], data["tools"] = dict(self.nodes), dict(self.tools)
+        data["tool_calls"] = self.tool_calls
+        return data
+
+
+class GraphProfiler(BaseCallbackHandler):
+    """Callback handler that builds a TurnProfile for each top-level graph run."""
+
+    # Called inline on the event loop / worker thread instead of being scheduled.
+    run_inline = True
+
+    def __init__(self, report: "ProfileReport | None" = None, path: str | None = AGENT_PROFILE_PATH, keep: int = AGENT_PROFILE_KEEP):
+        self.report = report if report is not None else ProfileReport()
+        self.path = path
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._turns: dict[UUID, TurnProfile] = {}
+        # run_id -> (turn, kind, name, start) for runs still open
+        self._open: dict[UUID, tuple] = {}
+        self.finished: OrderedDict[str, TurnProfile] = OrderedDict()
+
+    def get(self, run_id) -> TurnProfile | None:
+        with self._lock:
+            return self.finished.get(str(run_id))
+
+    def _turn(self, parent_run_id) -> TurnProfile | None:
+        if parent_run_id is None:
+            return None
+        turn = self._turns.get(parent_run_id)
+        if turn is None:
+            opened = self._open.get(parent_run_id)
+            turn = opened[0] if opened else None
+        return turn
+
+    def _start(self, run_id, parent_run_id, kind: str, name: str | None):
+        with self._lock:
+            turn = self._turn(parent_run_id)
+            if turn is not None:
+                self._open[run_id] = (turn, kind, name, time.perf_counter())
+
+    def _end(self, run_id) -> tuple | None:
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is None:
+                return None
+            turn, kind, name, start = opened
+            elapsed = time.perf_counter() - start
+            if kind == "node":
+                turn.nodes[name].append(elapsed)
+            elif kind == "tool":
+                turn.tools[name].append(elapsed)
+            elif kind == "llm":
+                turn.llm.append(elapsed)
+            return turn, kind, name
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        if parent_run_id is None:
+            with self._lock:
+                self._turns[run_id] = TurnProfile(
+                    run_id=str(run_id),
+                    thread_id=((metadata or {}).get("thread_id")),
+                    started=time.time(),
+                )
+                self._open[run_id] = (self._turns[run_id], "turn", None, time.perf_counter())
+            return
+
+        node = (metadata or {}).get("langgraph_node")
+        name = kwargs.get("name")
+        # The node's own run (not a runnable nested inside it) carries a graph:step
+        # tag; LangGraph's internal __start__ step is not a node of ours.
+        if node and name == node and not node.startswith("__") and any(tag.startswith("graph:step:") for tag in tags or ()):
+            self._start(run_id, parent_run_id, "node", node)
+        else:
+            self._start(run_id, parent_run_id, "chain", name)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None:
+            self._finish(run_id)
+            return
+        ended = self._end(run_id)
+        if ended and ended[1] == "node" and ended[2] == "tools":
+            turn = ended[0]
+            messages = (outputs or {}).get("messages") if isinstance(outputs, dict) else None
+            with self._lock:
+                turn.tool_calls_per_step.append(len(messages) if isinstance(messages, list) else 0)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None:
+            self._finish(run_id, error)
+        else:
+            self._end(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "tool", kwargs.get("name") or (serialized or {}).get("name"))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "llm", None)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "llm", None)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        ended = self._end(run_id)
+        if ended is None:
+            return
+        usage = token_usage(response)
+        with self._lock:
+            for key, value in usage.items():
+                ended[0].tokens[key] += value
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def _finish(self, run_id, error: BaseException | None = None):
+        with self._lock:
+            turn = self._turns.pop(run_id, None)
+            opened = self._open.pop(run_id, None)
+            if turn is None:
+                return
+            turn.total = time.perf_counter() - opened[3] if opened else 0.0
+            turn.error = type(error).__name__ if error is not None else None
+            # Drop anything of this turn still open (e.g. a cancelled tool).
+            for key in [key for key, value in self._open.items() if value[0] is turn]:
+                del self._open[key]
+            self.finished[turn.run_id] = turn
+            while len(self.finished) > self.keep:
+                self.finished.popitem(last=False)
+
+        self.report.add(turn)
+        log.info(
+            "turn profile",
+            extra=log_fields(
+                run_id=turn.run_id,
+                thread_id=turn.thread_id,
+                total_ms=_ms(turn.total),
+                nodes={name: _ms(sum(times)) for name, times in turn.nodes.items()},
+                tools={name: _ms(sum(times)) for name, times in turn.tools.items()},
+                tool_calls=turn.tool_calls,
+                llm_calls=len(turn.llm),
+                tokens=turn.tokens["total"],
+                error=turn.error,
+            ),
+        )
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(turn.to_dict()) + "\n")
+
+
+def token_usage(response) -> dict:
+    """Input/output/total tokens of an LLMResult, from usage_metadata or the provider's llm_output."""
+    usage = {"input": 0, "output": 0, "total": 0}
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                found = True
+                usage["input"] += metadata.get("input_tokens", 0)
+                usage["output"] += metadata.get("output_tokens", 0)
+                usage["total"] += metadata.get("total_tokens", 0)
+    if not found:
+        provider = (response.llm_output or {}).get("token_usage") or {}
+        usage["input"] = provider.get("prompt_tokens", 0)
+        usage["output"] = provider.get("completion_tokens", 0)
+        usage["total"] = provider.get("total_tokens", usage["input"] + usage["output"])
+    return usage
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Series:
+    """
+    Call count and total time of one timer, plus a ring of its most recent
+    samples for the percentiles, so a long-running server's report stays a
+    fixed size.
+    """
+
+    __slots__ = ("count", "total", "recent")
+
+    def __init__(self, keep: int = AGENT_PROFILE_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=keep)
+
+    def extend(self, samples):
+        for sample in samples:
+            self.count += 1
+            self.total += sample
+            self.recent.append(sample)
+
+    def percentile(self, pct: float) -> float:
+        return _percentile(self.recent, pct)
+
+
+class ProfileReport:
+    """
+    Aggregates TurnProfiles (live, or loaded from an AGENT_PROFILE_PATH file).
+    Counts and totals are exact; p50/p95 cover the last `keep` samples of
+    each series.
+    """
+
+    def __init__(self, keep: int = AGENT_PROFILE_SAMPLES):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.errors = 0
+        self.totals = Series(keep)
+        self.nodes = defaultdict(lambda: Series(keep))
+        self.tools = defaultdict(lambda: Series(keep))
+        self.llm = Series(keep)
+        self.tool_calls = 0
+        self.tokens = {"input": 0, "output": 0, "total": 0}
+
+    def add(self, turn: TurnProfile | dict):
+        turn = turn.to_dict() if isinstance(turn, TurnProfile) else turn
+        with self._lock:
+            self.turns += 1
+            self.errors += bool(turn.get("error"))
+            self.totals.extend((turn["total"],))
+            for name, times in turn["nodes"].items():
+                self.nodes[name].extend(times)
+            for name, times in turn["tools"].items():
+                self.tools[name].extend(times)
+            self.llm.extend(turn["llm"])
+            self.tool_calls += turn["tool_calls"]
+            for key in self.tokens:
+                self.tokens[key] += turn["tokens"].get(key, 0)
+
+    @classmethod
+    def load(cls, path: str) -> "ProfileReport":
+        report = cls()
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    report.add(json.loads(line))
+        return report
+
+    def render(self) -> str:
+        with self._lock:
+            if not self.turns:
+                return "no turns recorded\n"
+            lines = [
+                f"turns={self.turns} errors={self.errors} "
+                f"tool_calls/turn={self.tool_calls / self.turns:.2f} "
+                f"tokens in={self.tokens['input']} out={self.tokens['output']} total={self.tokens['total']}",
+                "",
+                f"{'':<28}{'calls':>7}{'total ms':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}",
+            ]
+            rows = [("turn", self.totals), ("llm", self.llm)]
+            rows += [(f"node:{name}", times) for name, times in sorted(self.nodes.items())]
+            rows += [(f"tool:{name}", times) for name, times in sorted(self.tools.items(), key=lambda item: -item[1].total)]
+            for label, times in rows:
+                if not times.count:
+                    continue
+                lines.append(
+                    f"{label:<28}{times.count:>7}{_ms(times.total):>12.1f}{_ms(times.total / times.count):>10.1f}"
+                    f"{_ms(times.percentile(50)):>10.1f}{_ms(times.percentile(95)):>10.1f}"
+                )
+            return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate agent turn profiles.")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("path", nargs="?", default=AGENT_PROFILE_PATH)
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("pass a profile file or set AGENT_PROFILE_PATH")
+    print(ProfileReport.load(args.path).render(), end="")
+
+
+if __name__ == "__main__":
+    main()
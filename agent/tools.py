@@ -1,16 +1,79 @@
 from langchain.tools import tool
-from zoho.crm_client import ZohoCRMClient
+from zoho.cache import TTLCache
+from zoho.crm_client import FIELDS_CACHE_TTL, MODULES_CACHE_TTL, ZohoCRMClient
+from zoho.coql import COQL_CACHE_SIZE, COQL_CACHE_TTL
+from zoho.metrics import default_metrics
+from zoho.rate_limiter import RateLimiter
+from zoho.records import RECORDS_CACHE_SIZE, RECORDS_CACHE_TTL
+from zoho.token_manager import TokenState
+from zoho.users_directory import UsersDirectory
 import os
 from dotenv import load_dotenv
 load_dotenv()
+from utils.lazy import Lazy
+from utils.log import get_logger, log_body, log_fields
 from utils.query_validator import validate_and_format_coql
 
-refresh_token = os.getenv("ZDH_1_REFRESH")
-client_id = os.getenv("ZDH_1_CLIENTID")
-client_secret = os.getenv("ZDH_1_CLIENTSECRET")
-zapikey = os.getenv("MAIL_API_KEY")
+log = get_logger(__name__)
+
+
+def zoho_credentials():
+    return (
+        os.getenv("ZDH_1_REFRESH"),
+        os.getenv("ZDH_1_CLIENTID"),
+        os.getenv("ZDH_1_CLIENTSECRET"),
+        os.getenv("MAIL_API_KEY"),
+    )
+
+
+# One org, one budget: the sync and async clients queue on the same rate
+# limiter and use (and refresh) the same access token.
+rate_limiter = RateLimiter()
+token_state = TokenState()
+# Metadata caches shared by the sync and async clients (and so by every conversation).
+field_cache = TTLCache(ttl=FIELDS_CACHE_TTL)
+module_cache = TTLCache(ttl=MODULES_CACHE_TTL)
+# Full records: a write from either client invalidates what both serve.
+record_cache = TTLCache(ttl=RECORDS_CACHE_TTL, maxsize=RECORDS_CACHE_SIZE)
+query_cache = TTLCache(ttl=COQL_CACHE_TTL, maxsize=COQL_CACHE_SIZE)
+users_directory = UsersDirectory()
+# Zoho request metrics for both clients (None unless ZOHO_METRICS is set).
+client_metrics = default_metrics()
+# Ceiling on what one query_records_tool call pages into the conversation,
+# whatever max_rows the model asks for.
+QUERY_TOOL_MAX_ROWS = int(os.getenv("AGENT_QUERY_MAX_ROWS", "2000"))
+QUERY_TOOL_MAX_BYTES = int(os.getenv("AGENT_QUERY_MAX_BYTES", "262144"))
+
+zoho_client = Lazy(lambda: ZohoCRMClient(
+    *zoho_credentials(),
+    rate_limiter=rate_limiter,
+    token_state=token_state,
+    field_cache=field_cache,
+    module_cache=module_cache,
+    record_cache=record_cache,
+    query_cache=query_cache,
+    users=users_directory,
+    metrics=client_metrics,
+))
+
+
+def get_zoho_client() -> ZohoCRMClient:
+    return zoho_client.get()
+
+
+def query_tool_result(response: dict, validation: dict) -> dict:
+    """query_records_tool's result; more_records tells the model that rows were left out."""
+    info = ((response.get("data") or {}).get("info") or {}) if response.get("success") else {}
+    return {
+        "response": response,
+        "more_records": bool(info.get("more_records")),
+        "COQL_Validation": validation,
+    }
+
 
-zoho = ZohoCRMClient(refresh_token, client_id, client_secret,zapikey)
+def resolve_module(module: str) -> str:
+    """Normalize a module label or API name locally; unknown names pass through unchanged."""
+    return get_zoho_client().resolve_module(module) or module
 
 
 
@@ -36,13 +99,13 @@ def get_fields_tool(module: str, datatypes: list):
             "currency", "double", "userlookup", "phone", "textarea", "formula", or "ALL".
     </arguments>
     """
-    return zoho.get_fields(module, datatypes)
+    return get_zoho_client().get_fields(resolve_module(module), datatypes)
 
 
 
 
 @tool("query_records_tool")
-def query_records_tool(query: str):
+def query_records_tool(query: str, max_rows: int | None = None):
     """
     <use_case>
     Executes a COQL (Zoho CRM Object Query Language) query to fetch records from a Zoho CRM module.
@@ -57,18 +120,25 @@ def query_records_tool(query: str):
     - When combining multiple conditions in WHERE, wrap logical groups in parentheses for clarity and correctness.
       Example: SELECT Event_Title FROM Events WHERE ((Event_Status = 'Completed') and (Event_Date > '2024-01-01'))
     - The query will be automatically validated and formatted before execution.
+    - Without max_rows only the first page is returned. Set max_rows to let the tool page through the
+      result itself instead of writing OFFSET queries across several calls; it is capped (2000 rows and
+      a size budget by default).
+    - "more_records": true in the result means rows were left out: narrow the WHERE clause, select fewer
+      fields, or continue with OFFSET.
     </important_notes>
 
     <arguments>
         query (str): A COQL query string following Zoho CRM syntax rules.
+        max_rows (int, optional): Fetch up to this many rows across pages (capped by the tool).
     </arguments>
     """
     validation = validate_and_format_coql(query)
+    log.debug(
+        "coql validation",
+        extra=log_fields(valid=validation["valid"], errors=validation["errors"], warnings=validation["warnings"]),
+    )
+    log_body(log, "coql query", query)
 
-    print("-"*30)
-    print("Validation",validation)
-    print("-"*30)
-    
     if not validation["valid"]:
         return {
             "success": False,
@@ -81,17 +151,14 @@ def query_records_tool(query: str):
             }
         }
     else:
+        if max_rows:
+            response = get_zoho_client().query_all_records(
+                query, max_rows=min(max_rows, QUERY_TOOL_MAX_ROWS), max_bytes=QUERY_TOOL_MAX_BYTES
+            )
+        else:
+            response = get_zoho_client().query_records(query)
 
-        print("-"*30)
-        print("query",query)
-        print("-"*30)
-
-        response = zoho.query_records(query)
-        
-        return {
-            "response":response,
-            "COQL_Validation":validation
-        }
+        return query_tool_result(response, validation)
 
 
 
@@ -106,7 +173,8 @@ def create_records_tool(module: str, payload: dict):
     - ⚠️ NEVER call this tool if any mandatory field is missing. Instead, ask the user for the missing information.
     - Use only official Zoho CRM **API field names** (e.g., "Deal_Name", not "Deal Name").
     - Lookup fields (e.g., Account, Owner, Pipeline) must be passed as: {"id": "record_id"}.
-    - The payload must include a "data" key containing a list of 1–100 record objects.
+    - The payload must include a "data" key containing a list of record objects. Lists over 100 records are
+      split into 100-record requests automatically; check "summary" in the result for records that failed.
     - The module name must be a valid Zoho CRM module (e.g., "Leads", "Deals", "Events").
     - To suppress automation triggers (e.g., workflows, approvals), include "trigger": [] in the payload.
     - For Discount field if the user ask to apply "10%" send the payload with "10%" as string.
@@ -117,7 +185,7 @@ def create_records_tool(module: str, payload: dict):
     <arguments>
         module (str): The target Zoho CRM module (e.g., "Leads", "Deals", "Accounts").
         payload (dict): A dictionary containing:
-            - "data" (list): List of record objects (1–100 records).
+            - "data" (list): List of record objects (any number; sent in batches of 100).
             - Optional "trigger" (list): Controls which automations run (e.g., ["workflow"]). Use [] to disable all.
     </arguments>
 
@@ -132,7 +200,7 @@ def create_records_tool(module: str, payload: dict):
     **Very Important Step:Display the data and ask for Approval before creating the record.**
     </critical_reminder>
     """
-    return zoho.create_record(module, payload)
+    return get_zoho_client().create_record(resolve_module(module), payload)
 
 
 
@@ -178,7 +246,7 @@ def convert_lead_tool(record_id: str, payload: dict):
     }
     </example_payload>
     """
-    return zoho.convert_lead(record_id, payload)
+    return get_zoho_client().convert_lead(record_id, payload)
 
 
 
@@ -188,7 +256,7 @@ def update_records_tool(module_api_name: str, body: dict):
     """
     <use_case>
     Updates one or multiple existing records in a Zoho CRM module.
-    This tool supports bulk updates (up to 100 records per call) and fine-grained control over field behavior,
+    This tool supports bulk updates (lists over 100 records are sent in batches of 100) and fine-grained control over field behavior,
     including subforms, picklist appending, lookup unlinking, and automation triggers.
     </use_case>
 
@@ -203,7 +271,7 @@ def update_records_tool(module_api_name: str, body: dict):
     <arguments>
         module_api_name (str): The API name of the target Zoho CRM module (e.g., "Leads", "Invoices").
         body (dict): A dictionary containing:
-            - "data" (list): List of record objects to update (1–100 records). Each must contain "id".
+            - "data" (list): List of record objects to update. Each must contain "id".
             - Optional top-level keys:
             - Subform fields may be included using Zoho’s subform API structure.
     </arguments>
@@ -218,7 +286,62 @@ def update_records_tool(module_api_name: str, body: dict):
     - To update a single record: include its id in the "data" list (no separate `record_id` parameter needed).
     </usage_guidance>
     """
-    return zoho.update_records(module_api_name, body)
+    return get_zoho_client().update_records(resolve_module(module_api_name), body)
+
+
+
+@tool("upsert_records_tool")
+def upsert_records_tool(module: str, payload: dict):
+    """
+    <use_case>
+    Inserts records, or updates the existing record when a duplicate is found, in one call.
+    Use this instead of querying for duplicates and then calling create_records_tool.
+    </use_case>
+
+    <important_notes>
+    - Zoho matches records on "duplicate_check_fields" (e.g., ["Email"]). When omitted, the module's
+      system duplicate-check fields are used (e.g., Email for Leads and Contacts).
+    - Use only official Zoho CRM **API field names**; lookups are passed as {"id": "record_id"}.
+    - Lists over 100 records are split into 100-record requests automatically.
+    - Each result entry has "action": "insert" or "update" telling what happened to that record.
+    </important_notes>
+
+    <arguments>
+        module (str): The target Zoho CRM module (e.g., "Leads", "Contacts").
+        payload (dict): A dictionary containing:
+            - "data" (list): List of record objects.
+            - Optional "duplicate_check_fields" (list): Field API names used to find the existing record.
+            - Optional "trigger" (list): Controls which automations run. Use [] to disable all.
+    </arguments>
+    """
+    return get_zoho_client().upsert_records(resolve_module(module), payload)
+
+
+@tool("bulk_write_records_tool")
+def bulk_write_records_tool(module: str, records: list, operation: str = "upsert", find_by: str | None = None):
+    """
+    <use_case>
+    Imports a large number of records (thousands) through a Zoho Bulk Write job.
+    Prefer upsert_records_tool for a few hundred records or fewer; a bulk job takes longer to start.
+    </use_case>
+
+    <important_notes>
+    - Each record is a flat object of field API names; lookups may be given as {"id": "record_id"}.
+    - operation "upsert" and "update" need find_by: a unique field API name (e.g., "Email") or "id".
+    - The result lists added/updated/skipped counts per job and the first failed rows with their errors.
+    - If a job is still running after about two minutes, the result has "pending_job" with its id instead of its
+      counts; the job finishes in Zoho on its own, so do not resubmit those records. Any "unsubmitted_records"
+      (after the first 25,000) need a new call.
+    </important_notes>
+
+    <arguments>
+        module (str): The target Zoho CRM module (e.g., "Leads").
+        records (list[dict]): The records to write.
+        operation (str): "insert", "update" or "upsert" (default).
+        find_by (str, optional): Field used to match existing records for update/upsert.
+    </arguments>
+    """
+    return get_zoho_client().bulk_write_records(resolve_module(module), records, operation, find_by)
 
 
 
@@ -244,7 +367,7 @@ def send_mail_tool(to_mail: str, mail_subject: str, mail_content: str):
             "Hello,<br><br>Thank you for your interest in our service.<br><br>Best regards,<br>Team"
     </arguments>
     """
-    return zoho.send_mail(to_mail, mail_subject, mail_content)
+    return get_zoho_client().send_mail(to_mail, mail_subject, mail_content)
 
 
 @tool("get_module_api_name_tool")
@@ -257,9 +380,11 @@ def get_module_api_name_tool():
     <important_notes>
     - This is especially useful for custom modules where the API name may not match the display name.
     - Always use the returned API name in subsequent tool calls (e.g., in `query_records_tool`, `update_records_tool`).
+    - Tools that take a module argument already accept a plural or singular label in any case and resolve it
+      to the API name themselves, so this call is only needed for the FROM clause of a COQL query.
     </important_notes>
     """
-    return zoho.get_module_api_name()
+    return get_zoho_client().get_module_api_name()
 
 
 @tool("get_specific_record_tool")
@@ -275,7 +400,7 @@ def get_specific_record_tool(module: str, record_id: str):
         record_id (str): The unique ID of the record to retrieve.
     </arguments>
     """
-    return zoho.get_specific_record(module, record_id)
+    return get_zoho_client().get_specific_record(resolve_module(module), record_id)
 
 
 
@@ -313,4 +438,4 @@ def create_task_tool(payload):
             }
     </arguments>
     """
-    return zoho.create_Task(payload)
+    return get_zoho_client().create_Task(payload)
@@ -0,0 +1,208 @@
+"""
+Micro-benchmarks for the pure-Python code that runs on every agent turn.
+
+    python benchmarks/bench_hot_paths.py                  # run, compare with the baseline
+    python benchmarks/bench_hot_paths.py -k coql --rounds 50
+    python benchmarks/bench_hot_paths.py --save           # record a new baseline
+
+Covers COQL validation and cache-key canonicalization (including a long
+query with a 500-id IN list), get_fields filtering of a 500-field module,
+get_module_api_name reshaping of 200 modules, get_system_prompt_text and
+the message windowing call_model does on a 200-message history.
+
+Like pytest-benchmark, each case is calibrated to a loop count that takes
+at least --min-time per round, then timed for --rounds rounds. The
+fastest round is what gets compared (--stat median to use the median):
+it is the least disturbed by other load on the machine. Baselines live in
+benchmarks/baselines/hot_paths.json and are only meaningful on the
+machine and Python they were recorded with (both are stored). The run
+exits 1 when any case is more than --threshold slower than its baseline.
+--save with -k updates only the selected cases.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from agent.graph import build_model_messages
+from agent.prompts import get_system_prompt_text
+from utils.query_validator import canonical_coql, validate_and_format_coql
+from zoho.crm_client import filter_fields, format_modules
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "hot_paths.json")
+
+DATA_TYPES = ("text", "email", "phone", "picklist", "multiselectpicklist", "date", "datetime", "currency", "lookup", "boolean")
+
+
+def _long_coql() -> str:
+    ids = ", ".join(f"'{5725767000000000000 + index}'" for index in range(500))
+    return (
+        "SELECT id, Last_Name, First_Name, Email, Lead_Status, Owner, Created_Time FROM Leads "
+        f"WHERE ((Lead_Status = 'Contacted' AND Created_Time >= '2026-01-01T00:00:00Z') OR Owner IN ({ids})) "
+        "AND Email IS NOT NULL ORDER BY Created_Time DESC LIMIT 2000"
+    )
+
+
+def _fields_payload(count: int = 500) -> dict:
+    return {
+        "fields": [
+            {
+                "api_name": f"Field_{index}",
+                "field_label": f"Field {index}",
+                "data_type": DATA_TYPES[index % len(DATA_TYPES)],
+                "system_mandatory": index % 50 == 0,
+                "pick_list_values": [
+                    {"display_value": f"Option {option}", "actual_value": f"Option {option}"}
+                    for option in range(25 if DATA_TYPES[index % len(DATA_TYPES)].endswith("picklist") else 0)
+                ],
+            }
+            for index in range(count)
+        ]
+    }
+
+
+def _modules_payload(count: int = 200) -> dict:
+    return {
+        "modules": [
+            {
+                "api_name": f"Module_{index}",
+                "module_name": f"Module_{index}",
+                "plural_label": f"Modules {index}",
+                "singular_label": f"Module {index}",
+                "actual_plural_label": f"Modules {index}",
+                "actual_singular_label": f"Module {index}",
+                "generated_type": "custom" if index > 40 else "default",
+            }
+            for index in range(count)
+        ]
+    }
+
+
+def _history(count: int = 200) -> list:
+    messages = []
+    for index in range(count // 4):
+        messages += [
+            HumanMessage(content=f"Show me the leads contacted this week, batch {index}"),
+            AIMessage(content="", tool_calls=[{"name": "query_records_tool", "args": {"query": "select Email from Leads"}, "id": f"call_{index}"}]),
+            ToolMessage(content=json.dumps({"data": [{"id": str(row), "Email": f"user{row}@example.com"} for row in range(20)]}), tool_call_id=f"call_{index}"),
+            AIMessage(content=f"Found 20 leads for batch {index}."),
+        ]
+    return messages
+
+
+def cases() -> dict:
+    long_query = _long_coql()
+    short_query = "select Last_Name, Email from Leads where Lead_Status = 'New' and Owner = '1' limit 200"
+    fields = _fields_payload()
+    modules = _modules_payload()
+    history = _history()
+    return {
+        "coql.validate.short": lambda: validate_and_format_coql(short_query),
+        "coql.validate.in_500": lambda: validate_and_format_coql(long_query),
+        "coql.canonical.in_500": lambda: canonical_coql(long_query),
+        "fields.filter_500.picklist": lambda: filter_fields(fields, ["picklist", "multiselectpicklist"]),
+        "fields.filter_500.all": lambda: filter_fields(fields, ["ALL"]),
+        "modules.format_200": lambda: format_modules(modules),
+        "prompt.system_text": get_system_prompt_text,
+        "messages.window_200": lambda: build_model_messages({"messages": history, "summary": None, "summary_count": 0}),
+        "messages.window_200.summary": lambda: build_model_messages({"messages": history, "summary": "Earlier: 40 lead lookups.", "summary_count": 19}),
+    }
+
+
+def measure(fn, rounds: int, min_time: float) -> dict:
+    """Per-call seconds over `rounds` rounds of a loop calibrated to take at least min_time."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    # As timeit does: a collection landing in one round would dominate it.
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        gc.enable()
+    return {
+        "loops": loops,
+        "min_us": min(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "mean_us": statistics.mean(samples) * 1e6,
+        "stdev_us": statistics.stdev(samples) * 1e6 if len(samples) > 1 else 0.0,
+    }
+
+
+def _environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="select", help="only run cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.02, help="seconds per round, at least")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--stat", choices=["min", "median"], default="min", help="statistic compared with the baseline")
+    args = parser.parse_args()
+
+    stored = {"results": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            stored = json.load(file)
+        if not args.save and stored.get("environment") != _environment():
+            print(f"note: baseline was recorded on {stored.get('environment')}, this is {_environment()}\n")
+    baseline = {} if args.save else stored["results"]
+    key = f"{args.stat}_us"
+
+    results, regressions = {}, []
+    print(f"{'':<30}{'median us':>12}{'min us':>10}{'stdev us':>10}{'base ' + args.stat:>11}{'change':>9}")
+    for name, fn in cases().items():
+        if args.select and args.select not in name:
+            continue
+        result = results[name] = measure(fn, args.rounds, args.min_time)
+        line = f"{name:<30}{result['median_us']:>12.1f}{result['min_us']:>10.1f}{result['stdev_us']:>10.1f}"
+        reference = baseline.get(name)
+        if reference:
+            change = result[key] / reference[key] - 1
+            line += f"{reference[key]:>11.1f}{change:>+9.0%}"
+            if change > args.threshold:
+                regressions.append((name, change))
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"environment": _environment(), "results": {**stored["results"], **results}}, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"\nbaseline saved to {os.path.relpath(args.baseline)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) more than {args.threshold:.0%} slower than baseline:")
+        for name, change in regressions:
+            print(f"  {name} {change:+.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold vs pooled request latency against a local stand-in server.
+
+    python benchmarks/bench_http_pool.py --requests 500
+
+"cold" opens a new connection per call (module-level requests.get, the way
+ZohoCRMClient used to talk to Zoho); "pooled" reuses keep-alive connections
+through zoho.session.PooledSession. Pass --tls to serve over a throwaway
+self-signed certificate so the handshake cost is part of the comparison.
+"""
+import argparse
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import urllib3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zoho.session import PooledSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({"data": [{"id": "1", "Last_Name": "Stand-in"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _self_signed_context(workdir):
+    cert = os.path.join(workdir, "cert.pem")
+    key = os.path.join(workdir, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert, key)
+    return ctx
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _run(label, get, url, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        get(url).content
+        samples.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{label:<8} n={count:<5} "
+        f"mean={statistics.mean(samples):7.3f}ms "
+        f"p50={_percentile(samples, 50):7.3f}ms "
+        f"p95={_percentile(samples, 95):7.3f}ms "
+        f"total={sum(samples):9.1f}ms"
+    )
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    scheme = "http"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.tls:
+            server.socket = _self_signed_context(workdir).wrap_socket(server.socket, server_side=True)
+            scheme = "https"
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"{scheme}://127.0.0.1:{server.server_address[1]}/crm/v8/Leads"
+
+        session = PooledSession()
+        verify = not args.tls
+
+        cold = _run("cold", lambda u: requests.get(u, verify=verify, timeout=10), url, args.requests)
+        pooled = _run("pooled", lambda u: session.get(u, verify=verify), url, args.requests)
+        print(f"speedup  {cold / pooled:.2f}x")
+
+        session.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Worker startup time: wall clock of `import main` in fresh interpreters.
+
+    python benchmarks/bench_import_time.py --runs 10 --top 15
+
+Each run starts a new Python process, so nothing is shared between
+samples. Zoho and Groq endpoints are pointed at an unroutable address:
+if anything does network I/O at import time, it shows up as a failure or
+a multi-second outlier instead of silently hitting production.
+--top prints the slowest modules from `python -X importtime` for one run.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("LANGSMITH_TRACING", "false")
+    env.setdefault("LANGSMITH_ENDPOINT", "http://127.0.0.1:9")
+    env.setdefault("LANGSMITH_API_KEY", "bench")
+    env.setdefault("LANGSMITH_PROJECT", "bench")
+    env["ZOHO_API_DOMAIN"] = "http://127.0.0.1:9"
+    env["ZOHO_ACCOUNTS_DOMAIN"] = "http://127.0.0.1:9"
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _import_once(env) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _slowest_modules(env, top: int):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:9.1f}ms cumulative {self_us / 1000:8.1f}ms self  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+
+    env = _env()
+    samples = [_import_once(env) * 1000 for _ in range(args.runs)]
+
+    print(
+        f"import main  runs={args.runs} "
+        f"min={min(samples):8.1f}ms "
+        f"mean={statistics.mean(samples):8.1f}ms "
+        f"max={max(samples):8.1f}ms"
+    )
+
+    if args.top:
+        print(f"slowest {args.top} modules (-X importtime):")
+        _slowest_modules(env, args.top)
+
+
+if __name__ == "__main__":
+    main()
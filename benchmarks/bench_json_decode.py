@@ -0,0 +1,113 @@
+"""
+JSON decode cost per COQL response: old triple parse vs zoho.json_body.
+
+    python benchmarks/bench_json_decode.py --rows 2000 --runs 20
+    python benchmarks/bench_json_decode.py --payload recorded_coql.json
+
+"triple" is what ZohoCRMClient used to do with every response: json() for
+the debug print, again for tool_error details or the cache, and again for
+the return value. "once" decodes through response_json() with the stdlib
+parser, "orjson" the same with orjson (skipped when it is not installed).
+Without --payload a COQL-shaped body of --rows records is generated; a
+recorded response saved from Zoho can be passed instead.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zoho import json_body
+
+
+def _coql_payload(rows: int) -> bytes:
+    rng = random.Random(7)
+    data = [
+        {
+            "id": str(5725767000000000000 + index),
+            "Deal_Name": f"Renewal {index} – Société Générale",
+            "Stage": rng.choice(["Qualification", "Negotiation", "Closed Won"]),
+            "Amount": round(rng.uniform(100, 250000), 2),
+            "Closing_Date": "2026-10-17",
+            "Modified_Time": "2026-10-17T09:30:00+00:00",
+            "Owner": {"id": str(5725767000000100000 + index % 40), "name": "Sales Rep", "email": "rep@example.com"},
+            "Account_Name": {"id": str(5725767000000200000 + index % 500), "name": f"Account {index % 500}"},
+            "Description": "Multi-year renewal; pricing reviewed with procurement. " * 3,
+            "Tag": [{"name": "enterprise"}, {"name": "renewal"}],
+        }
+        for index in range(rows)
+    ]
+    return json.dumps({"data": data, "info": {"count": rows, "more_records": False}}).encode()
+
+
+def _response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+def _triple(content):
+    response = _response(content)
+    print_body = response.json()
+    details = response.json() if response.text else {}
+    return print_body, details, response.json()
+
+
+def _once(content):
+    response = _response(content)
+    return json_body.response_json(response), json_body.response_json(response, {}), json_body.response_json(response)
+
+
+def _run(label, decode, content, runs):
+    decode(content)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        decode(content)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    print(
+        f"{label:<7} runs={runs:<4} "
+        f"mean={statistics.mean(samples):8.2f}ms "
+        f"min={min(samples):8.2f}ms "
+        f"max={max(samples):8.2f}ms"
+    )
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--payload", help="recorded COQL response body (JSON file)")
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as file:
+            content = file.read()
+    else:
+        content = _coql_payload(args.rows)
+    print(f"payload  {len(content) / 1e6:.2f} MB")
+
+    triple = _run("triple", _triple, content, args.runs)
+
+    json_body.JSON_BACKEND = "json"
+    once = _run("once", _once, content, args.runs)
+    print(f"speedup  {triple / once:.2f}x  (json, decoded once)")
+
+    if json_body.orjson is not None:
+        json_body.JSON_BACKEND = "auto"
+        fast = _run("orjson", _once, content, args.runs)
+        print(f"speedup  {triple / fast:.2f}x  (orjson, decoded once)")
+
+
+if __name__ == "__main__":
+    main()
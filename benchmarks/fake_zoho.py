@@ -0,0 +1,1074 @@
+"""
+Offline stand-in for the Zoho CRM endpoints ZohoCRMClient talks to.
+
+    python benchmarks/fake_zoho.py --port 8765 --latency 0.05 --errors 429:0.02,503:0.01
+    python benchmarks/fake_zoho.py --record fixtures/ --upstream https://www.zohoapis.com
+    python benchmarks/fake_zoho.py --replay fixtures/ --fallback
+
+then point the client at it:
+
+    ZOHO_API_DOMAIN=http://127.0.0.1:8765 ZOHO_ACCOUNTS_DOMAIN=http://127.0.0.1:8765 \
+    ZOHO_CONTENT_DOMAIN=http://127.0.0.1:8765
+
+Serves OAuth token refresh, COQL, records list/get/create/update/upsert,
+lead conversion, settings/fields, settings/modules, users, org, the agentmail
+function and composite requests from a generated in-memory dataset, with the
+pagination limits Zoho enforces (200 per records page, page_token past 2000
+rows, 2000 per COQL page). Every request can be delayed (--latency,
+--jitter) and fail at random with given statuses (--errors), composite
+sub-requests included; 429s carry a Retry-After.
+
+Bulk Read and Bulk Write jobs are faked too. A job reports IN PROGRESS for
+its first --bulk-polls status checks, then COMPLETED. Read results are real
+zipped CSVs of --bulk-page rows per job, paged by page number for the first
+BULK_READ_PAGES_BEFORE_TOKEN pages and by next_page_token after that, so
+multi-page streaming, spooling and CSV parsing run against any --records
+count. Bulk Write takes the zip from /crm/v8/upload, applies it to the data
+when the job completes, and serves the per-row result report. Set
+ZOHO_BULK_POLL_INITIAL low (e.g. 0.01) on the client side to skip its 2 s
+first poll.
+
+--record forwards everything to the real Zoho (--upstream / --accounts-upstream)
+and stores each response as a JSON fixture, with tokens redacted. --replay
+serves those fixtures instead; --fallback answers misses from the fake data.
+
+Benchmarks use it in-process:
+
+    with FakeZoho(latency=0.02, records=1000) as zoho:
+        client = ZohoCRMClient("r", "c", "s", "k", api_domain=zoho.url, accounts_domain=zoho.url, content_domain=zoho.url)
+"""
+import argparse
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+import zipfile
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+RECORDS_MAX_PER_PAGE = 200
+RECORDS_PAGE_TOKEN_AFTER = 2000
+COQL_MAX_LIMIT = 2000
+COQL_DEFAULT_LIMIT = 200
+WRITE_MAX_RECORDS = 100
+USERS_MAX_PER_PAGE = 200
+BULK_READ_PAGE = 200_000
+BULK_READ_PAGES_BEFORE_TOKEN = 5
+
+# module -> (singular label, [(api_name, data_type, mandatory, picklist values)])
+SCHEMA = {
+    "Leads": ("Lead", [
+        ("Last_Name", "text", True, None),
+        ("First_Name", "text", False, None),
+        ("Email", "email", False, None),
+        ("Company", "text", False, None),
+        ("Lead_Status", "picklist", False, ["New", "Contacted", "Qualified", "Lost"]),
+        ("Annual_Revenue", "currency", False, None),
+    ]),
+    "Contacts": ("Contact", [
+        ("Last_Name", "text", True, None),
+        ("First_Name", "text", False, None),
+        ("Email", "email", False, None),
+        ("Phone", "phone", False, None),
+    ]),
+    "Accounts": ("Account", [
+        ("Account_Name", "text", True, None),
+        ("Industry", "picklist", False, ["Software", "Retail", "Finance", "Manufacturing"]),
+        ("Website", "website", False, None),
+    ]),
+    "Deals": ("Deal", [
+        ("Deal_Name", "text", True, None),
+        ("Stage", "picklist", False, ["Qualification", "Negotiation", "Closed Won", "Closed Lost"]),
+        ("Amount", "currency", False, None),
+        ("Closing_Date", "date", False, None),
+    ]),
+    "Tasks": ("Task", [
+        ("Subject", "text", True, None),
+        ("Status", "picklist", False, ["Not Started", "In Progress", "Completed"]),
+        ("Due_Date", "date", False, None),
+    ]),
+}
+
+ORG_ID = "800000001"
+_ID_BASE = 5725767000000000000
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+
+
+def _value(module: str, name: str, data_type: str, values: list | None, index: int):
+    rng = random.Random(f"{module}:{name}:{index}")
+    if values:
+        return rng.choice(values)
+    if data_type == "email":
+        return f"user{index}@example.com"
+    if data_type == "currency":
+        return round(rng.uniform(100, 250000), 2)
+    if data_type == "date":
+        return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    if data_type == "phone":
+        return f"+1555{index:07d}"
+    if data_type == "website":
+        return f"https://company{index}.example.com"
+    return f"{name.replace('_', ' ')} {index}"
+
+
+def _fields_payload(module: str) -> dict:
+    return {
+        "fields": [
+            {
+                "api_name": name,
+                "field_label": name.replace("_", " "),
+                "data_type": data_type,
+                "system_mandatory": mandatory,
+                "pick_list_values": [{"display_value": v, "actual_value": v} for v in values or []],
+            }
+            for name, data_type, mandatory, values in [("id", "bigint", False, None), *SCHEMA[module][1]]
+        ]
+    }
+
+
+def _modules_payload() -> dict:
+    return {
+        "modules": [
+            {
+                "api_name": module,
+                "module_name": module,
+                "plural_label": module,
+                "singular_label": singular,
+                "actual_plural_label": module,
+                "actual_singular_label": singular,
+                "generated_type": "default",
+                "api_supported": True,
+            }
+            for module, (singular, _) in SCHEMA.items()
+        ]
+    }
+
+
+def _error(code: str, message: str, **details) -> dict:
+    return {"code": code, "details": details, "message": message, "status": "error"}
+
+
+def _page_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+
+def _page_offset(token: str) -> int | None:
+    try:
+        kind, offset = base64.urlsafe_b64decode(token.encode()).decode().split(":")
+        return int(offset) if kind == "offset" else None
+    except ValueError:
+        return None
+
+
+_COQL_RE = re.compile(
+    r"^\s*select\s+(?P<fields>.+?)\s+from\s+(?P<module>\w+)"
+    r"(?:\s+where\s+(?P<where>.+?))?"
+    r"(?:\s+order\s+by\s+(?P<order>\w+)(?:\s+(?P<direction>asc|desc))?)?"
+    r"(?:\s+limit\s+(?P<a>\d+)(?:\s*(?P<sep>,|\s+offset\s+)\s*(?P<b>\d+))?)?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_RE = re.compile(r"^\(?\s*(\w+)\s*(=|!=|like)\s*'((?:[^'\\]|\\.)*)'\s*\)?$", re.IGNORECASE)
+
+
+def _matches(record: dict, where: str | None) -> bool:
+    """Conjunctions of `field = 'v'`, `field != 'v'`, `field like '%v%'`; anything else matches."""
+    if not where:
+        return True
+    for condition in re.split(r"\s+and\s+", where.strip().strip("()"), flags=re.IGNORECASE):
+        match = _CONDITION_RE.match(condition.strip())
+        if not match:
+            continue
+        name, operator, expected = match.groups()
+        actual = str(record.get(name, ""))
+        operator = operator.lower()
+        if operator == "=" and actual != expected:
+            return False
+        if operator == "!=" and actual == expected:
+            return False
+        if operator == "like" and expected.strip("%").casefold() not in actual.casefold():
+            return False
+    return True
+
+
+def _criteria_matches(record: dict, criteria: dict | None) -> bool:
+    """Bulk Read criteria: `equal` / `not_equal` / `in` comparisons and and/or groups; others match."""
+    if not criteria:
+        return True
+    if "group" in criteria:
+        results = (_criteria_matches(record, item) for item in criteria["group"])
+        return any(results) if criteria.get("group_operator", "and").lower() == "or" else all(results)
+    actual = _csv_cell(record.get((criteria.get("field") or {}).get("api_name")))
+    expected = criteria.get("value")
+    comparator = criteria.get("comparator", "equal")
+    if comparator == "equal":
+        return actual == _csv_cell(expected)
+    if comparator == "not_equal":
+        return actual != _csv_cell(expected)
+    if comparator == "in":
+        return actual in {_csv_cell(value) for value in expected or ()}
+    return True
+
+
+def _csv_cell(value) -> str:
+    """A value as Zoho's CSV exports write it: lookups as their id, lists ;-joined."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return str(value.get("id", ""))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return ";".join(_csv_cell(item) for item in value)
+    return str(value)
+
+
+def _zip_csv(header: list, rows, name: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(name, "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+            writer = csv.writer(text)
+            writer.writerow(header)
+            writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _unzip_csv(content: bytes) -> list[list[str]]:
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        name = next(name for name in archive.namelist() if name.lower().endswith(".csv"))
+        with archive.open(name) as raw:
+            return list(csv.reader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")))
+
+
+def _multipart_file(headers: dict, body: bytes) -> bytes | None:
+    """Content of the `file` part of a multipart/form-data body."""
+    content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    if not message.is_multipart():
+        return None
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    return None
+
+
+class FakeZoho:
+    """
+    In-process fake Zoho server. `records` rows are generated per module;
+    `errors` maps status codes to the probability that a request fails with
+    it. calls counts requests by the endpoint labels ZohoCRMClient uses.
+    Bulk Read jobs return `bulk_page` rows each and every bulk job needs
+    `bulk_polls` status checks before it completes.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        records: int = 500,
+        users: int = 25,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        errors: dict | None = None,
+        token_ttl: int = 3600,
+        seed: int = 7,
+        record_dir: str | None = None,
+        replay_dir: str | None = None,
+        fallback: bool = False,
+        upstream: str = "https://www.zohoapis.com",
+        accounts_upstream: str = "https://accounts.zoho.com",
+        bulk_page: int = BULK_READ_PAGE,
+        bulk_polls: int = 1,
+    ):
+        self.records_per_module = records
+        self.bulk_page = bulk_page
+        self.bulk_polls = bulk_polls
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = dict(errors or {})
+        self.token_ttl = token_ttl
+        self.record_dir = record_dir
+        self.replay_dir = replay_dir
+        self.fallback = fallback
+        self.upstream = upstream.rstrip("/")
+        self.accounts_upstream = accounts_upstream.rstrip("/")
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._next_id = _ID_BASE + 10_000_000
+        self._tokens: dict[str, float] = {}
+        self._forced: list[tuple[int, str | None]] = []
+        self.data: dict[str, dict[str, dict]] = {module: self._generate(module) for module in SCHEMA}
+        self.users = [self._user(index) for index in range(users)]
+        self.mails: list[dict] = []
+        # job id -> {"job": public job details, "polls": status checks so far, "result": zip bytes, ...}
+        self.bulk_jobs: dict[str, dict] = {}
+        self.uploads: dict[str, bytes] = {}
+        self.calls = Counter()
+        self.faults = Counter()
+
+        for directory in (record_dir, replay_dir):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.zoho = self
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    # -- lifecycle --------------------------------------------------------
+
+    def start(self) -> "FakeZoho":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # -- test controls ----------------------------------------------------
+
+    def fail_next(self, status: int, count: int = 1, path: str | None = None):
+        """Make the next `count` requests (whose path contains `path`) fail with `status`."""
+        with self._lock:
+            self._forced.extend([(status, path)] * count)
+
+    def expire_tokens(self):
+        """Invalidate every issued access token, so the next call gets a 401."""
+        with self._lock:
+            self._tokens.clear()
+
+    # -- data -------------------------------------------------------------
+
+    def _generate(self, module: str) -> dict:
+        offset = list(SCHEMA).index(module) * 1_000_000
+        rows = {}
+        for index in range(self.records_per_module):
+            record_id = str(_ID_BASE + offset + index)
+            rows[record_id] = {
+                "id": record_id,
+                **{name: _value(module, name, data_type, values, index) for name, data_type, _, values in SCHEMA[module][1]},
+                "Owner": self._owner(index),
+                "Created_Time": "2026-01-01T09:00:00+00:00",
+                "Modified_Time": "2026-01-01T09:00:00+00:00",
+            }
+        return rows
+
+    @staticmethod
+    def _owner(index: int) -> dict:
+        return {"id": str(_ID_BASE + 9_000_000 + index % 25), "name": f"User {index % 25}", "email": f"owner{index % 25}@example.com"}
+
+    @staticmethod
+    def _user(index: int) -> dict:
+        return {
+            "id": str(_ID_BASE + 9_000_000 + index),
+            "full_name": f"User {index}",
+            "first_name": "User",
+            "last_name": str(index),
+            "email": f"owner{index}@example.com",
+            "status": "disabled" if index % 10 == 9 else "active",
+            "confirm": index % 7 != 6,
+            "profile": {"id": "1", "name": "Administrator" if index == 0 else "Standard"},
+            "role": {"id": "2", "name": "CEO" if index == 0 else "Sales"},
+            "Modified_Time": "2026-01-01T09:00:00+00:00",
+        }
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    # -- request pipeline -------------------------------------------------
+
+    def handle(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict, bytes]:
+        parts = urlsplit(target)
+        path, query = parts.path, dict(parse_qsl(parts.query))
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        fault = self._fault(path)
+        if fault:
+            self.faults[str(fault)] += 1
+            extra = {"Retry-After": "1"} if fault == 429 else {}
+            code = "TOO_MANY_REQUESTS" if fault == 429 else "INTERNAL_ERROR"
+            return self._json(fault, _error(code, "injected fault"), extra)
+
+        if self.record_dir:
+            return self._record(method, target, headers, body)
+        if self.replay_dir:
+            replayed = self._replay(method, path, query, body)
+            if replayed is not None or not self.fallback:
+                return replayed or self._json(501, _error("FIXTURE_MISSING", "no fixture for this request", key=fixture_name(method, path, query, body)))
+
+        status, payload, extra = self.route(method, path, query, headers, body)
+        return self._json(status, payload, extra)
+
+    def _fault(self, path: str) -> int | None:
+        with self._lock:
+            for index, (status, prefix) in enumerate(self._forced):
+                if prefix is None or prefix in path:
+                    del self._forced[index]
+                    return status
+        if path.startswith("/oauth"):
+            return None
+        for status, rate in self.errors.items():
+            if self._random.random() < rate:
+                return status
+        return None
+
+    @staticmethod
+    def _json(status: int, payload, extra: dict | None = None) -> tuple[int, dict, bytes]:
+        headers = {"Content-Type": "application/json;charset=UTF-8", **(extra or {})}
+        if payload is None:
+            return status, headers, b""
+        if isinstance(payload, bytes):
+            # File downloads; `extra` carries their Content-Type.
+            return status, headers, payload
+        return status, headers, json.dumps(payload).encode()
+
+    def _authorized(self, headers: dict) -> bool:
+        token = (headers.get("Authorization") or "").removeprefix("Zoho-oauthtoken ")
+        with self._lock:
+            expires = self._tokens.get(token)
+        return expires is not None and expires > time.time()
+
+    def route(self, method: str, path: str, query: dict, headers: dict, body: bytes) -> tuple[int, dict | bytes | None, dict]:
+        """Dispatch to the fake endpoint; returns (status, JSON payload / file bytes / None, extra headers)."""
+        if path == "/oauth/v2/token" and method == "POST":
+            self.calls["oauth.token"] += 1
+            return self._token(query)
+
+        if path == "/crm/v7/functions/agentmail/actions/execute" and method == "POST":
+            self.calls["functions.mail"] += 1
+            if not query.get("zapikey"):
+                return 401, _error("INVALID_API_KEY", "zapikey is missing"), {}
+            mail = json.loads(body or b"{}")
+            with self._lock:
+                self.mails.append(mail)
+            return 200, {"code": "success", "details": {"output": "mail sent", "id": self._new_id()}, "message": "function executed successfully"}, {}
+
+        if path.startswith("/crm/bulk/v8/"):
+            if not self._authorized(headers):
+                return 401, _error("INVALID_TOKEN", "invalid oauth token"), {}
+            parts = path.removeprefix("/crm/bulk/v8/").strip("/").split("/")
+            return self._bulk(method, parts, json.loads(body) if body and method == "POST" else {})
+
+        if not path.startswith("/crm/v8/"):
+            return 404, _error("INVALID_URL_PATTERN", "unsupported path"), {}
+        if not self._authorized(headers):
+            return 401, _error("INVALID_TOKEN", "invalid oauth token"), {}
+
+        parts = path.removeprefix("/crm/v8/").strip("/").split("/")
+        if parts == ["upload"] and method == "POST":
+            self.calls["bulk.write.upload"] += 1
+            return self._upload(headers, body)
+        payload = json.loads(body) if body else {}
+
+        if parts == ["coql"] and method == "POST":
+            self.calls["coql"] += 1
+            return self._coql(payload.get("select_query", ""))
+        if parts == ["__composite_requests"] and method == "POST":
+            self.calls["composite"] += 1
+            return self._composite(payload, headers)
+        if parts == ["settings", "fields"]:
+            self.calls["settings.fields"] += 1
+            module = query.get("module")
+            if module not in SCHEMA:
+                return 400, _error("INVALID_MODULE", "the module name given seems to be invalid", param="module"), {}
+            return 200, _fields_payload(module), {}
+        if parts == ["settings", "modules"]:
+            self.calls["settings.modules"] += 1
+            return 200, _modules_payload(), {}
+        if parts == ["org"]:
+            self.calls["settings.org"] += 1
+            return 200, {"org": [{"id": ORG_ID, "zgid": ORG_ID, "company_name": "Fake Org"}]}, {}
+        if parts[0] == "users":
+            return self._users(parts[1:], query)
+
+        module = parts[0]
+        if module not in self.data:
+            return 400, _error("INVALID_MODULE", "the module name given seems to be invalid"), {}
+
+        if len(parts) == 1 and method == "GET":
+            self.calls["records.list"] += 1
+            return self._list(module, query)
+        if len(parts) == 1 and method == "POST":
+            self.calls["records.create"] += 1
+            return self._write(module, payload, create=True)
+        if len(parts) == 1 and method == "PUT":
+            self.calls["records.update"] += 1
+            return self._write(module, payload, create=False)
+        if parts[1:] == ["upsert"] and method == "POST":
+            self.calls["records.upsert"] += 1
+            return self._upsert(module, payload)
+        if len(parts) == 2 and method == "GET":
+            self.calls["records.get"] += 1
+            record = self.data[module].get(parts[1])
+            return (200, {"data": [record]}, {}) if record else (204, None, {})
+        if len(parts) == 2 and method == "PUT":
+            self.calls["records.update"] += 1
+            rows = [{**row, "id": parts[1]} for row in payload.get("data", [])]
+            return self._write(module, {**payload, "data": rows}, create=False)
+        if len(parts) == 4 and parts[2:] == ["actions", "convert"] and module == "Leads" and method == "POST":
+            self.calls["leads.convert"] += 1
+            return self._convert(parts[1])
+        return 404, _error("INVALID_URL_PATTERN", "unsupported path"), {}
+
+    # -- endpoints --------------------------------------------------------
+
+    def _token(self, query: dict):
+        if not query.get("refresh_token"):
+            return 400, {"error": "invalid_code"}, {}
+        token = f"fake-{self._new_id()}"
+        with self._lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return 200, {"access_token": token, "expires_in": self.token_ttl, "api_domain": "", "token_type": "Bearer"}, {}
+
+    def _coql(self, query: str):
+        match = _COQL_RE.match(query)
+        if not match:
+            return 400, _error("SYNTAX_ERROR", "error occured while parsing the query"), {}
+        module = next((name for name in SCHEMA if name.casefold() == match["module"].casefold()), None)
+        if module is None:
+            return 400, _error("INVALID_QUERY", "invalid module", module=match["module"]), {}
+        if match["fields"].strip() == "*":
+            return 400, _error("INVALID_QUERY", "select * is not supported"), {}
+
+        limit, offset = COQL_DEFAULT_LIMIT, 0
+        if match["a"]:
+            if match["sep"] == ",":
+                offset, limit = int(match["a"]), int(match["b"])
+            else:
+                limit, offset = int(match["a"]), int(match["b"] or 0)
+        if limit > COQL_MAX_LIMIT:
+            return 400, _error("LIMIT_EXCEEDED", f"limit cannot exceed {COQL_MAX_LIMIT}", limit=COQL_MAX_LIMIT), {}
+
+        rows = [record for record in self.data[module].values() if _matches(record, match["where"])]
+        if match["order"]:
+            rows.sort(key=lambda record: str(record.get(match["order"], "")), reverse=(match["direction"] or "").lower() == "desc")
+        page = rows[offset:offset + limit]
+        if not page:
+            return 204, None, {}
+
+        selected = [name.strip() for name in match["fields"].split(",")]
+        data = [{"id": record["id"], **{name: record.get(name) for name in selected if name != "id"}} for record in page]
+        return 200, {"data": data, "info": {"count": len(data), "more_records": offset + limit < len(rows)}}, {}
+
+    def _list(self, module: str, query: dict):
+        if not query.get("fields"):
+            return 400, _error("REQUIRED_PARAM_MISSING", "One of the expected parameter is missing", param="fields"), {}
+        per_page = min(int(query.get("per_page", RECORDS_MAX_PER_PAGE)), RECORDS_MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        if query.get("page_token"):
+            offset = _page_offset(query["page_token"])
+            if offset is None:
+                return 400, _error("INVALID_DATA", "invalid page token", param="page_token"), {}
+        else:
+            offset = (page - 1) * per_page
+            if offset >= RECORDS_PAGE_TOKEN_AFTER:
+                return 400, _error(
+                    "DISCRETE_PAGINATION_LIMIT_EXCEEDED",
+                    f"use page_token to fetch records beyond {RECORDS_PAGE_TOKEN_AFTER}",
+                ), {}
+
+        rows = list(self.data[module].values())
+        if query.get("sort_by"):
+            rows.sort(key=lambda record: str(record.get(query["sort_by"], "")), reverse=query.get("sort_order") == "desc")
+        chunk = rows[offset:offset + per_page]
+        if not chunk:
+            return 204, None, {}
+
+        fields = [name for name in query["fields"].split(",") if name]
+        more = offset + per_page < len(rows)
+        info = {
+            "per_page": per_page,
+            "count": len(chunk),
+            "page": page,
+            "more_records": more,
+            "next_page_token": _page_token(offset + per_page) if more else None,
+            "previous_page_token": None,
+            "page_token_expiry": "2099-01-01T00:00:00+00:00",
+        }
+        data = [{"id": record["id"], **{name: record.get(name) for name in fields}} for record in chunk]
+        return 200, {"data": data, "info": info}, {}
+
+    def _write(self, module: str, payload: dict, create: bool):
+        rows = payload.get("data")
+        if not isinstance(rows, list) or not rows:
+            return 400, _error("INVALID_DATA", "data is missing"), {}
+        if len(rows) > WRITE_MAX_RECORDS:
+            return 400, _error("LIMIT_EXCEEDED", f"only {WRITE_MAX_RECORDS} records can be written per call", limit=WRITE_MAX_RECORDS), {}
+
+        mandatory = [name for name, _, required, _ in SCHEMA[module][1] if required]
+        results = []
+        with self._lock:
+            for row in rows:
+                if create:
+                    missing = next((name for name in mandatory if not row.get(name)), None)
+                    if missing:
+                        results.append(_error("MANDATORY_NOT_FOUND", "required field not found", api_name=missing))
+                        continue
+                    record_id = self._new_id()
+                    self.data[module][record_id] = {**row, "id": record_id, "Created_Time": _now(), "Modified_Time": _now()}
+                    message = "record added"
+                else:
+                    record_id = str(row.get("id", ""))
+                    if record_id not in self.data[module]:
+                        results.append(_error("INVALID_DATA", "the related id given seems to be invalid", api_name="id", id=record_id))
+                        continue
+                    self.data[module][record_id].update({**row, "id": record_id, "Modified_Time": _now()})
+                    message = "record updated"
+                results.append({
+                    "code": "SUCCESS",
+                    "details": {"id": record_id, "Modified_Time": _now(), "Created_Time": self.data[module][record_id]["Created_Time"]},
+                    "message": message,
+                    "status": "success",
+                })
+
+        ok = any(result["status"] == "success" for result in results)
+        return (201 if create else 200) if ok else 400, {"data": results}, {}
+
+    def _upsert(self, module: str, payload: dict):
+        rows = payload.get("data")
+        if not isinstance(rows, list) or not rows:
+            return 400, _error("INVALID_DATA", "data is missing"), {}
+        if len(rows) > WRITE_MAX_RECORDS:
+            return 400, _error("LIMIT_EXCEEDED", f"only {WRITE_MAX_RECORDS} records can be written per call", limit=WRITE_MAX_RECORDS), {}
+
+        check = payload.get("duplicate_check_fields") or ["Email"]
+        results = []
+        with self._lock:
+            for row in rows:
+                existing = next(
+                    (
+                        record for record in self.data[module].values()
+                        if any(row.get(name) and record.get(name) == row.get(name) for name in check)
+                    ),
+                    None,
+                )
+                if existing is not None:
+                    existing.update({**row, "id": existing["id"], "Modified_Time": _now()})
+                    record_id, action = existing["id"], "update"
+                else:
+                    record_id, action = self._new_id(), "insert"
+                    self.data[module][record_id] = {**row, "id": record_id, "Created_Time": _now(), "Modified_Time": _now()}
+                results.append({
+                    "code": "SUCCESS",
+                    "duplicate_field": check[0] if action == "update" else None,
+                    "action": action,
+                    "details": {"id": record_id, "Modified_Time": _now()},
+                    "message": f"record {'updated' if action == 'update' else 'added'}",
+                    "status": "success",
+                })
+        return 200, {"data": results}, {}
+
+    def _convert(self, lead_id: str):
+        with self._lock:
+            lead = self.data["Leads"].pop(lead_id, None)
+            if lead is None:
+                return 400, _error("INVALID_DATA", "the id given seems to be invalid", api_name="id"), {}
+            contact_id, account_id = self._new_id(), self._new_id()
+            self.data["Contacts"][contact_id] = {
+                "id": contact_id,
+                "Last_Name": lead.get("Last_Name"),
+                "First_Name": lead.get("First_Name"),
+                "Email": lead.get("Email"),
+            }
+            self.data["Accounts"][account_id] = {"id": account_id, "Account_Name": lead.get("Company") or lead.get("Last_Name")}
+        return 200, {
+            "data": [{
+                "Contacts": {"name": lead.get("Last_Name"), "id": contact_id},
+                "Deals": None,
+                "Accounts": {"name": lead.get("Company"), "id": account_id},
+            }]
+        }, {}
+
+    def _users(self, rest: list, query: dict):
+        if rest:
+            self.calls["users.get"] += 1
+            user = next((user for user in self.users if user["id"] == rest[0]), None)
+            return (200, {"users": [user]}, {}) if user else (204, None, {})
+
+        self.calls["users.list"] += 1
+        per_page = min(int(query.get("per_page", USERS_MAX_PER_PAGE)), USERS_MAX_PER_PAGE)
+        page = int(query.get("page", 1))
+        users = self.users
+        if query.get("type") == "ActiveUsers":
+            users = [user for user in users if user["status"] == "active"]
+        chunk = users[(page - 1) * per_page:page * per_page]
+        if not chunk:
+            return 204, None, {}
+        info = {"per_page": per_page, "count": len(chunk), "page": page, "more_records": page * per_page < len(users)}
+        return 200, {"users": chunk, "info": info}, {}
+
+    def _composite(self, payload: dict, headers: dict):
+        results = []
+        for sub in payload.get("__composite_requests", []):
+            # Injected faults reach sub-requests too, as Zoho fails them one by one.
+            fault = self._fault(sub.get("uri", ""))
+            if fault:
+                self.faults[str(fault)] += 1
+                code = "TOO_MANY_REQUESTS" if fault == 429 else "INTERNAL_ERROR"
+                status, body = fault, _error(code, "injected fault")
+            else:
+                status, body, _ = self.route(sub.get("method", "GET"), sub.get("uri", ""), sub.get("params") or {}, headers, b"")
+            results.append({
+                "sub_request_id": sub.get("sub_request_id"),
+                "status": "success" if status < 400 else "error",
+                "details": {"response": {"status_code": status, "body": body, "headers": {}}},
+            })
+        return 200, {"__composite_requests": results}, {}
+
+    # -- bulk -------------------------------------------------------------
+
+    def _bulk(self, method: str, parts: list, payload: dict):
+        kind = parts[0]
+        if kind not in ("read", "write") or len(parts) > 3 or (len(parts) == 3 and parts[2] != "result"):
+            return 404, _error("INVALID_URL_PATTERN", "unsupported path"), {}
+        if len(parts) == 1:
+            if method != "POST":
+                return 404, _error("INVALID_URL_PATTERN", "unsupported path"), {}
+            self.calls[f"bulk.{kind}.create"] += 1
+            return self._bulk_read_create(payload) if kind == "read" else self._bulk_write_create(payload)
+
+        with self._lock:
+            entry = self.bulk_jobs.get(parts[1])
+        if entry is None or (entry["job"]["operation"] == "read") != (kind == "read"):
+            return 400, _error("INVALID_DATA", "the job id given seems to be invalid", api_name="id"), {}
+
+        if len(parts) == 2:
+            self.calls[f"bulk.{kind}.status"] += 1
+            job = self._bulk_poll(entry)
+            return 200, ({"data": [job]} if kind == "read" else job), {}
+
+        self.calls[f"bulk.{kind}.download"] += 1
+        if entry.get("result") is None:
+            return 400, _error("INVALID_REQUEST", "the job is not completed yet"), {}
+        disposition = f'attachment; filename="{parts[1]}.zip"'
+        return 200, entry["result"], {"Content-Type": "application/zip", "Content-Disposition": disposition}
+
+    def _bulk_poll(self, entry: dict) -> dict:
+        """Count a status check; the one after `bulk_polls` in-progress checks completes the job."""
+        with self._lock:
+            job = entry["job"]
+            state_key = "state" if job["operation"] == "read" else "status"
+            if job[state_key] != "COMPLETED":
+                entry["polls"] += 1
+                if entry["polls"] > self.bulk_polls:
+                    (self._finish_read if job["operation"] == "read" else self._finish_write)(entry)
+                else:
+                    job[state_key] = "IN PROGRESS"
+            return json.loads(json.dumps(job))
+
+    def _bulk_job(self, operation: str, state_key: str) -> dict:
+        return {
+            "id": self._new_id(),
+            "operation": operation,
+            state_key: "ADDED",
+            "created_by": {"id": self.users[0]["id"] if self.users else ORG_ID, "name": "User 0"},
+            "created_time": _now(),
+        }
+
+    def _bulk_read_create(self, payload: dict):
+        query = payload.get("query") or {}
+        module = (query.get("module") or {}).get("api_name")
+        if module not in self.data:
+            return 400, _error("INVALID_DATA", "the module given seems to be invalid", api_name="module"), {}
+        if query.get("page_token"):
+            offset = _page_offset(query["page_token"])
+            if offset is None:
+                return 400, _error("INVALID_DATA", "invalid page token", api_name="page_token"), {}
+            page = offset // self.bulk_page + 1
+        else:
+            page = int(query.get("page") or 1)
+            if page > BULK_READ_PAGES_BEFORE_TOKEN:
+                return 400, _error("INVALID_DATA", f"use page_token beyond page {BULK_READ_PAGES_BEFORE_TOKEN}", api_name="page"), {}
+
+        with self._lock:
+            job = self._bulk_job("read", "state")
+            job["query"] = query
+            self.bulk_jobs[job["id"]] = {"job": job, "polls": 0, "module": module, "page": page}
+        details = {key: job[key] for key in ("id", "operation", "state", "created_by", "created_time")}
+        return 201, {"data": [{"status": "success", "code": "ADDED_SUCCESSFULLY", "message": "Added successfully.", "details": details}], "info": {}}, {}
+
+    def _finish_read(self, entry: dict):
+        """Snapshot the job's page of rows as a zipped CSV (called with the lock held)."""
+        job, module, page = entry["job"], entry["module"], entry["page"]
+        query = job["query"]
+        rows = [record for record in self.data[module].values() if _criteria_matches(record, query.get("criteria"))]
+        offset = (page - 1) * self.bulk_page
+        chunk = rows[offset:offset + self.bulk_page]
+        fields = query.get("fields") or [*(name for name, *_ in SCHEMA[module][1]), "Owner", "Created_Time", "Modified_Time"]
+        fields = [name for name in fields if name.lower() != "id"]
+        entry["result"] = _zip_csv(
+            ["Id", *fields],
+            ([record["id"], *(_csv_cell(record.get(name)) for name in fields)] for record in chunk),
+            f"{job['id']}.csv",
+        )
+
+        more = offset + self.bulk_page < len(rows)
+        job["state"] = "COMPLETED"
+        job["result"] = {
+            "page": page,
+            "per_page": self.bulk_page,
+            "count": len(chunk),
+            "download_url": f"/crm/bulk/v8/read/{job['id']}/result",
+            "more_records": more,
+        }
+        # Past the page-number limit Zoho pages by token, as the records API does past 2000 rows.
+        if more and page >= BULK_READ_PAGES_BEFORE_TOKEN:
+            job["result"]["next_page_token"] = _page_token(offset + self.bulk_page)
+
+    def _upload(self, headers: dict, body: bytes):
+        lowered = {name.lower(): value for name, value in headers.items()}
+        if lowered.get("feature") != "bulk-write" or lowered.get("x-crm-org") != ORG_ID:
+            return 400, _error("INVALID_REQUEST", "feature and X-CRM-ORG headers are required"), {}
+        content = _multipart_file(headers, body)
+        if not content:
+            return 400, _error("INVALID_DATA", "file is missing", api_name="file"), {}
+        try:
+            zipfile.ZipFile(io.BytesIO(content)).testzip()
+        except zipfile.BadZipFile:
+            return 400, _error("INVALID_FILE", "the file is not a zip archive"), {}
+        file_id = self._new_id()
+        with self._lock:
+            self.uploads[file_id] = content
+        return 200, {"status": "success", "code": "FILE_UPLOAD_SUCCESS", "message": "file uploaded.", "details": {"file_id": file_id, "created_time": _now()}}, {}
+
+    def _bulk_write_create(self, payload: dict):
+        operation = payload.get("operation")
+        resources = payload.get("resource") or []
+        if operation not in ("insert", "update", "upsert") or len(resources) != 1:
+            return 400, _error("INVALID_DATA", "operation and one resource are required"), {}
+        resource = resources[0]
+        module = (resource.get("module") or {}).get("api_name")
+        if module not in self.data:
+            return 400, _error("INVALID_DATA", "the module given seems to be invalid", api_name="module"), {}
+        if operation != "insert" and not resource.get("find_by"):
+            return 400, _error("MANDATORY_NOT_FOUND", "find_by is required", api_name="find_by"), {}
+        with self._lock:
+            content = self.uploads.pop(str(resource.get("file_id")), None)
+            if content is None:
+                return 400, _error("INVALID_DATA", "the file_id given seems to be invalid", api_name="file_id"), {}
+            job = self._bulk_job(operation, "status")
+            job["resource"] = [{**resource, "status": "ADDED"}]
+            self.bulk_jobs[job["id"]] = {"job": job, "polls": 0, "rows": _unzip_csv(content), "ignore_empty": payload.get("ignore_empty", True)}
+        return 201, {"status": "success", "code": "ADDED_SUCCESSFULLY", "message": "Added successfully.", "details": {key: job[key] for key in ("id", "created_by", "created_time")}}, {}
+
+    def _finish_write(self, entry: dict):
+        """Apply the uploaded rows and build the result report (called with the lock held)."""
+        job = entry["job"]
+        resource = job["resource"][0]
+        module, find_by, operation = resource["module"]["api_name"], resource.get("find_by"), job["operation"]
+        mapping = {int(item["index"]): item["api_name"] for item in resource.get("field_mappings") or []}
+        mandatory = [name for name, _, required, _ in SCHEMA[module][1] if required]
+        header, *rows = entry["rows"] or [[]]
+
+        counts = {"added_count": 0, "updated_count": 0, "skipped_count": 0}
+        report = []
+        for row in rows:
+            values = {
+                mapping[index]: value for index, value in enumerate(row)
+                if index in mapping and (value != "" or not entry["ignore_empty"])
+            }
+            key = values.get(find_by) if find_by else None
+            existing = None
+            if key:
+                existing = self.data[module].get(key) if find_by == "id" else next(
+                    (record for record in self.data[module].values() if _csv_cell(record.get(find_by)) == key), None
+                )
+            if existing is not None and operation != "insert":
+                existing.update({**values, "id": existing["id"], "Modified_Time": _now()})
+                report.append([*row, existing["id"], "UPDATED", ""])
+                counts["updated_count"] += 1
+                continue
+            missing = next((name for name in mandatory if not values.get(name)), None)
+            if operation == "update" or missing:
+                error = "NOT_FOUND" if operation == "update" else f"MANDATORY_NOT_FOUND:{missing}"
+                report.append([*row, "", "SKIPPED", error])
+                counts["skipped_count"] += 1
+                continue
+            record_id = self._new_id()
+            self.data[module][record_id] = {**values, "id": record_id, "Created_Time": _now(), "Modified_Time": _now()}
+            report.append([*row, record_id, "ADDED", ""])
+            counts["added_count"] += 1
+
+        entry["result"] = _zip_csv([*header, "RECORD_ID", "STATUS", "ERRORS"], report, f"{job['id']}.csv")
+        resource["status"] = job["status"] = "COMPLETED"
+        resource["file"] = {"status": "COMPLETED", "name": f"{job['id']}.csv", "total_count": len(rows), **counts}
+        job["result"] = {"download_url": f"/crm/bulk/v8/write/{job['id']}/result"}
+
+    # -- record / replay --------------------------------------------------
+
+    def _record(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict, bytes]:
+        import requests
+
+        parts = urlsplit(target)
+        base = self.accounts_upstream if parts.path.startswith("/oauth") else self.upstream
+        forward = {name: value for name, value in headers.items() if name.lower() not in ("host", "content-length", "connection", "accept-encoding")}
+        response = requests.request(method, base + target, headers=forward, data=body or None, timeout=60)
+        content_type = response.headers.get("Content-Type", "application/json")
+
+        try:
+            payload = response.json() if response.content else None
+        except ValueError:
+            payload = None
+        if payload is not None:
+            fixture = {
+                "request": {"method": method, "path": parts.path, "query": _scrub_query(dict(parse_qsl(parts.query)))},
+                "status": response.status_code,
+                "headers": {name: value for name, value in response.headers.items() if name.lower().startswith("x-")},
+                "body": _redact(payload),
+            }
+            name = fixture_name(method, parts.path, dict(parse_qsl(parts.query)), body)
+            with open(os.path.join(self.record_dir, name), "w", encoding="utf-8") as file:
+                json.dump(fixture, file, indent=1)
+            with self._lock:
+                self.calls[f"recorded:{parts.path}"] += 1
+        return response.status_code, {"Content-Type": content_type}, response.content
+
+    def _replay(self, method: str, path: str, query: dict, body: bytes) -> tuple[int, dict, bytes] | None:
+        name = fixture_name(method, path, query, body)
+        try:
+            with open(os.path.join(self.replay_dir, name), encoding="utf-8") as file:
+                fixture = json.load(file)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.calls[f"replayed:{path}"] += 1
+        if path == "/oauth/v2/token" and isinstance(fixture["body"], dict):
+            # Hand out a token the fake accepts if it falls back later.
+            status, payload, _ = self._token({"refresh_token": "replay"})
+            return self._json(status, payload)
+        return self._json(fixture["status"], fixture["body"], fixture.get("headers"))
+
+
+_SECRET_PARAMS = frozenset({"refresh_token", "client_id", "client_secret", "zapikey", "code"})
+_SECRET_KEYS = frozenset({"access_token", "refresh_token", "id_token"})
+
+
+def _scrub_query(query: dict) -> dict:
+    return {key: ("redacted" if key in _SECRET_PARAMS else value) for key, value in query.items()}
+
+
+def _redact(payload):
+    if isinstance(payload, dict):
+        return {key: ("redacted" if key in _SECRET_KEYS else _redact(value)) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [_redact(value) for value in payload]
+    return payload
+
+
+def fixture_name(method: str, path: str, query: dict, body: bytes) -> str:
+    """Stable fixture file name for a request; credentials never affect it."""
+    if path.startswith("/oauth"):
+        identity = ""
+    else:
+        params = sorted((key, value) for key, value in query.items() if key not in _SECRET_PARAMS)
+        try:
+            canonical = json.dumps(json.loads(body), sort_keys=True) if body else ""
+        except ValueError:
+            canonical = hashlib.sha1(body).hexdigest()
+        identity = json.dumps([params, canonical])
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")
+    return f"{method}_{slug}_{hashlib.sha1(identity.encode()).hexdigest()[:12]}.json"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _serve(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status, headers, content = self.server.zoho.handle(self.command, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_errors(spec: str) -> dict:
+    """'429:0.02,503:0.01' -> {429: 0.02, 503: 0.01}"""
+    errors = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        status, rate = item.split(":")
+        errors[int(status)] = float(rate)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--records", type=int, default=500, help="generated records per module")
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay, seconds")
+    parser.add_argument("--errors", default="", help="status:rate pairs, e.g. 429:0.02,503:0.01")
+    parser.add_argument("--token-ttl", type=int, default=3600)
+    parser.add_argument("--bulk-page", type=int, default=BULK_READ_PAGE, help="rows per Bulk Read job")
+    parser.add_argument("--bulk-polls", type=int, default=1, help="status checks a bulk job stays IN PROGRESS for")
+    parser.add_argument("--record", metavar="DIR", help="proxy to Zoho and save fixtures here")
+    parser.add_argument("--replay", metavar="DIR", help="serve saved fixtures from here")
+    parser.add_argument("--fallback", action="store_true", help="answer replay misses from the fake data")
+    parser.add_argument("--upstream", default="https://www.zohoapis.com")
+    parser.add_argument("--accounts-upstream", default="https://accounts.zoho.com")
+    args = parser.parse_args()
+
+    zoho = FakeZoho(
+        host=args.host,
+        port=args.port,
+        records=args.records,
+        users=args.users,
+        latency=args.latency,
+        jitter=args.jitter,
+        errors=parse_errors(args.errors),
+        token_ttl=args.token_ttl,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        fallback=args.fallback,
+        upstream=args.upstream,
+        accounts_upstream=args.accounts_upstream,
+        bulk_page=args.bulk_page,
+        bulk_polls=args.bulk_polls,
+    )
+    mode = "record" if args.record else "replay" if args.replay else "fake"
+    print(f"fake Zoho ({mode}) on {zoho.url}")
+    print(f"  ZOHO_API_DOMAIN={zoho.url} ZOHO_ACCOUNTS_DOMAIN={zoho.url} ZOHO_CONTENT_DOMAIN={zoho.url}")
+    try:
+        zoho.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        zoho.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Load test for the compiled agent graph (main.py:agent) against fakes.
+
+    python benchmarks/load_graph.py --concurrency 20 --conversations 200 --turns 4
+    python benchmarks/load_graph.py --mode threads --zoho-latency 0.08 --llm-latency 0.4
+    python benchmarks/load_graph.py --max-p95 1500 --output load.json
+
+Each simulated conversation sends --turns user messages through app
+(ainvoke on one event loop with --mode async, invoke on a thread pool with
+--mode threads), carrying the returned state into the next turn as the
+server does. --concurrency conversations run at once.
+
+The chat model is scripted: it picks a scenario from the user message
+(record lookup, parallel field + COQL search, record creation, deal
+report), emits that scenario's tool calls, then answers once the tool
+results are in. Only the LLM's latency (--llm-latency) is simulated. Tools
+run unchanged against benchmarks/fake_zoho.py, so Zoho client pooling,
+batching, caching and retries are all exercised.
+
+Reports throughput, p50/p95/p99 turn latency, the per-node/tool
+breakdown from agent.profiling.GraphProfiler, Zoho calls per endpoint,
+and resident memory growth per conversation. The clients keep their
+default rate limits (ZOHO_RATE_LIMIT_* applies), so time queued for them
+is reported too. --max-p95 exits non-zero when the p95 turn latency (ms)
+is above it, for use as a pre-deploy gate.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from fake_zoho import _ID_BASE, FakeZoho, parse_errors
+from utils.lazy import Lazy
+from utils.log import configure_logging
+from zoho.rate_limiter import RateLimiter
+from zoho.token_manager import TokenState
+
+SCENARIOS = {
+    "lookup": lambda rng: [
+        ("get_specific_record_tool", {"module": "Leads", "record_id": str(_ID_BASE + rng.randrange(400))}),
+    ],
+    "search": lambda rng: [
+        ("get_fields_tool", {"module": "Leads", "datatypes": ["email", "picklist"]}),
+        ("query_records_tool", {
+            "query": f"select Last_Name, Email, Lead_Status from Leads where Lead_Status = "
+                     f"'{rng.choice(['New', 'Contacted', 'Qualified'])}' limit 50"
+        }),
+    ],
+    "create": lambda rng: [
+        ("create_records_tool", {
+            "module": "Leads",
+            "payload": {"data": [{"Last_Name": f"Load {rng.randrange(10**6)}", "Email": f"load{rng.randrange(10**6)}@example.com"}]},
+        }),
+    ],
+    "report": lambda rng: [
+        ("query_records_tool", {"query": "select Deal_Name, Amount, Stage from Deals where Stage = 'Closed Won' limit 200"}),
+    ],
+}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for the Groq model. The reply depends only on the
+    messages it is given, so one instance can serve every conversation.
+    """
+
+    latency: float = 0.0
+    summary: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _reply(self, messages) -> AIMessage:
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        if self.summary:
+            message = AIMessage(content=f"Summary of {len(messages)} messages.")
+        elif isinstance(messages[-1], ToolMessage):
+            results = [m for m in messages if isinstance(m, ToolMessage)]
+            message = AIMessage(content=f"Done: {len(results)} tool results, {sum(len(str(m.content)) for m in results)} chars.")
+        else:
+            text = str(messages[-1].content)
+            scenario = text.split(":", 1)[0]
+            rng = random.Random(text)
+            calls = SCENARIOS.get(scenario, SCENARIOS["lookup"])(rng)
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": args, "id": f"call_{index}_{rng.randrange(10**9)}"}
+                    for index, (name, args) in enumerate(calls)
+                ],
+            )
+        output_tokens = max(1, len(str(message.content)) // 4 + 20 * len(message.tool_calls))
+        message.usage_metadata = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_chars // 4 + output_tokens,
+        }
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+def _rss() -> int:
+    """Resident set size in bytes (Linux), or peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _user_message(conversation: int, turn: int) -> HumanMessage:
+    scenario = list(SCENARIOS)[(conversation + turn) % len(SCENARIOS)]
+    return HumanMessage(content=f"{scenario}: conversation {conversation} turn {turn}")
+
+
+def _install(graph_module, zoho: FakeZoho, llm_latency: float) -> RateLimiter:
+    """Point the graph's model and Zoho clients at the fakes; returns the clients' shared rate limiter."""
+    import agent.async_tools as async_tools
+    import agent.tools as sync_tools
+    from zoho.async_crm_client import AsyncZohoCRMClient
+    from zoho.crm_client import ZohoCRMClient
+
+    limiter = RateLimiter()
+    options = {
+        "api_domain": zoho.url,
+        "accounts_domain": zoho.url,
+        "rate_limiter": limiter,
+        "token_state": TokenState(),
+        "metrics": sync_tools.client_metrics,
+    }
+    sync_tools.zoho_client = Lazy(lambda: ZohoCRMClient("r", "c", "s", "k", **options))
+    async_tools.async_zoho_client = Lazy(lambda: AsyncZohoCRMClient("r", "c", "s", "k", **options))
+    graph_module.llm = Lazy(lambda: ScriptedChatModel(latency=llm_latency))
+    graph_module.summary_llm = Lazy(lambda: ScriptedChatModel(latency=llm_latency, summary=True))
+    return limiter
+
+
+def _run_threads(app, conversations: range, turns: int, concurrency: int, latencies: list, errors: list):
+    def conversation(index):
+        state = {"messages": []}
+        config = {"configurable": {"thread_id": f"load-{index}"}}
+        for turn in range(turns):
+            start = time.perf_counter()
+            try:
+                state = app.invoke({**state, "messages": state["messages"] + [_user_message(index, turn)]}, config)
+            except Exception as exc:
+                errors.append(repr(exc))
+                return
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(conversation, conversations))
+
+
+async def _run_async(app, conversations: range, turns: int, concurrency: int, latencies: list, errors: list):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def conversation(index):
+        async with gate:
+            state = {"messages": []}
+            config = {"configurable": {"thread_id": f"load-{index}"}}
+            for turn in range(turns):
+                start = time.perf_counter()
+                try:
+                    state = await app.ainvoke({**state, "messages": state["messages"] + [_user_message(index, turn)]}, config)
+                except Exception as exc:
+                    errors.append(repr(exc))
+                    return
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(conversation(index) for index in conversations))
+    finally:
+        # The pool can only be closed on the loop asyncio.run is about to end.
+        import agent.async_tools as async_tools
+
+        await async_tools.get_async_zoho_client().aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=["async", "threads"], default="async")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=3, help="user messages per conversation")
+    parser.add_argument("--warmup", type=int, default=5, help="conversations run first and left out of the numbers")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per chat-model call")
+    parser.add_argument("--zoho-latency", type=float, default=0.05, help="seconds per Zoho request")
+    parser.add_argument("--zoho-jitter", type=float, default=0.02)
+    parser.add_argument("--zoho-errors", default="", help="status:rate pairs, e.g. 429:0.01,503:0.01")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the top Python allocation sites that grew")
+    parser.add_argument("--max-p95", type=float, help="exit 1 if p95 turn latency (ms) is above this")
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    import agent.graph as graph_module
+    from agent.profiling import GraphProfiler
+
+    configure_logging(level=args.log_level)
+
+    zoho = FakeZoho(latency=args.zoho_latency, jitter=args.zoho_jitter, errors=parse_errors(args.zoho_errors)).start()
+    limiter = _install(graph_module, zoho, args.llm_latency)
+
+    def run(app, conversations, latencies, errors):
+        if args.mode == "threads":
+            _run_threads(app, conversations, args.turns, args.concurrency, latencies, errors)
+        else:
+            asyncio.run(_run_async(app, conversations, args.turns, args.concurrency, latencies, errors))
+
+    # Warm-up: builds clients, fetches the token, fills the field/module caches.
+    run(graph_module.app, range(args.warmup), [], [])
+    zoho.calls.clear()
+    limits_before = limiter.stats()
+
+    profiler = GraphProfiler(path=None)
+    app = graph_module.app.with_config(callbacks=[profiler])
+    if args.tracemalloc:
+        tracemalloc.start()
+    gc.collect()
+    rss_before = _rss()
+    traced_before = tracemalloc.take_snapshot() if args.tracemalloc else None
+
+    latencies, errors = [], []
+    started = time.perf_counter()
+    run(app, range(args.warmup, args.warmup + args.conversations), latencies, errors)
+    wall = time.perf_counter() - started
+
+    gc.collect()
+    rss_growth = _rss() - rss_before
+    zoho.stop()
+    queued = {
+        name: {
+            "queued": stats["queued"] - limits_before[name]["queued"],
+            "wait_s": round(stats["queue_wait_seconds"] - limits_before[name]["queue_wait_seconds"], 3),
+        }
+        for name, stats in limiter.stats().items()
+    }
+
+    turns = len(latencies)
+    results = {
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "conversations": args.conversations,
+        "turns": turns,
+        "errors": len(errors),
+        "wall_s": round(wall, 3),
+        "turns_per_s": round(turns / wall, 2),
+        "latency_ms": {
+            f"p{pct}": round(_percentile(latencies, pct) * 1000, 1) for pct in (50, 95, 99)
+        } if latencies else {},
+        "zoho_calls": dict(zoho.calls),
+        "zoho_faults": dict(zoho.faults),
+        "rate_limiter": queued,
+        "rss_growth_kb": rss_growth // 1024,
+        "rss_growth_per_conversation_kb": round(rss_growth / 1024 / max(args.conversations, 1), 1),
+        "tokens": dict(profiler.report.tokens),
+    }
+
+    print(
+        f"{args.mode}: {args.conversations} conversations x {args.turns} turns, concurrency {args.concurrency}, "
+        f"llm {args.llm_latency * 1000:.0f} ms, zoho {args.zoho_latency * 1000:.0f}±{args.zoho_jitter * 1000:.0f} ms"
+    )
+    print(f"  {turns} turns in {wall:.2f}s = {results['turns_per_s']} turns/s, {len(errors)} errors")
+    if latencies:
+        print("  turn latency " + "  ".join(f"{name} {value:.1f} ms" for name, value in results["latency_ms"].items()))
+    print(
+        f"  zoho calls {sum(zoho.calls.values())} "
+        + " ".join(f"{name}={count}" for name, count in sorted(zoho.calls.items()))
+    )
+    waits = [f"{name}={stats['queued']} ({stats['wait_s']:.2f}s)" for name, stats in queued.items() if stats["queued"]]
+    if waits:
+        print("  rate limiter queued " + " ".join(waits))
+    print(f"  rss growth {results['rss_growth_kb']} KiB ({results['rss_growth_per_conversation_kb']} KiB/conversation)")
+    for error in errors[:5]:
+        print(f"  error: {error}")
+    print()
+    print(profiler.report.render(), end="")
+
+    if args.tracemalloc:
+        print("\ntop allocation growth:")
+        for stat in tracemalloc.take_snapshot().compare_to(traced_before, "lineno")[:10]:
+            print(f"  {stat}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.max_p95 is not None and latencies and results["latency_ms"]["p95"] > args.max_p95:
+        print(f"\np95 {results['latency_ms']['p95']} ms is above --max-p95 {args.max_p95} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from benchmarks.fake_zoho import FakeZoho
+from zoho.async_crm_client import AsyncZohoCRMClient
+from zoho.crm_client import ZohoCRMClient
+
+
+@pytest.fixture
+def zoho():
+    with FakeZoho(records=50) as server:
+        yield server
+
+
+def _options(zoho: FakeZoho, **overrides) -> dict:
+    return {"api_domain": zoho.url, "accounts_domain": zoho.url, "content_domain": zoho.url, **overrides}
+
+
+@pytest.fixture
+def make_client(zoho):
+    """ZohoCRMClient pointed at the fake server; keyword arguments go to the constructor."""
+    return lambda **overrides: ZohoCRMClient("refresh", "id", "secret", "zapikey", **_options(zoho, **overrides))
+
+
+@pytest.fixture
+def make_async_client(zoho):
+    """AsyncZohoCRMClient pointed at the fake server; close it before the test's loop ends."""
+    return lambda **overrides: AsyncZohoCRMClient("refresh", "id", "secret", "zapikey", **_options(zoho, **overrides))
+
+
+def _run_concurrently(count: int, fn) -> list:
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        barrier.wait()
+        results[index] = fn()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture
+def concurrently():
+    """concurrently(count, fn): call fn from `count` threads released together; returns the results."""
+    return _run_concurrently
@@ -0,0 +1,69 @@
+from zoho.cache import TTLCache
+
+LEAD_ID = "5725767000000000000"
+
+
+def _cache(**options):
+    now = [0.0]
+    return TTLCache(clock=lambda: now[0], **options), now
+
+
+def test_entries_expire_after_ttl():
+    cache, now = _cache(ttl=10)
+    cache.set("a", 1)
+
+    now[0] = 9.9
+    assert cache.get("a") == 1
+    now[0] = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_per_entry_ttl_overrides_default():
+    cache, now = _cache(ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+
+    now[0] = 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache, _ = _cache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation():
+    cache, _ = _cache(ttl=10)
+    for key in [("Leads", "1"), ("Leads", "2"), ("Deals", "1")]:
+        cache.set(key, key)
+
+    assert cache.invalidate(("Leads", "1")) is True
+    assert cache.invalidate(("Leads", "1")) is False
+    assert cache.invalidate_where(lambda key: key[0] == "Leads") == 1
+    assert cache.get(("Deals", "1")) == ("Deals", "1")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_client_write_invalidates_cached_record(zoho, make_client):
+    client = make_client()
+
+    client.get_specific_record("Leads", LEAD_ID)
+    client.get_specific_record("Leads", LEAD_ID)
+    assert zoho.calls["records.get"] == 1
+
+    assert client.update_records("Leads", {"data": [{"id": LEAD_ID, "Company": "Renamed"}]})["success"]
+    record = client.get_specific_record("Leads", LEAD_ID)
+
+    assert zoho.calls["records.get"] == 2
+    assert record["data"]["data"][0]["Company"] == "Renamed"
@@ -0,0 +1,80 @@
+import asyncio
+
+from zoho.composite import batching
+
+LEAD_ID = 5725767000000000000
+
+
+def _ids(count: int) -> list[str]:
+    return [str(LEAD_ID + index) for index in range(count)]
+
+
+def _get_concurrently(concurrently, client, ids: list[str]) -> list:
+    pending = iter(ids)
+
+    def call():
+        with batching(window=0.1):
+            return client.get_specific_record("Leads", next(pending))
+
+    return concurrently(len(ids), call)
+
+
+def test_concurrent_reads_share_one_composite_call(zoho, make_client, concurrently):
+    client = make_client()
+    client.access_token
+
+    results = _get_concurrently(concurrently, client, _ids(3))
+
+    assert all(result["success"] for result in results)
+    assert sorted(result["data"]["data"][0]["id"] for result in results) == _ids(3)
+    assert zoho.calls["composite"] == 1
+    assert zoho.calls["records.get"] == 3
+
+
+def test_retryable_sub_responses_are_resent_on_their_own(zoho, make_client, concurrently):
+    client = make_client()
+    client.access_token
+    ids = _ids(3)
+    zoho.fail_next(429, path=f"/Leads/{ids[0]}")
+    zoho.fail_next(503, path=f"/Leads/{ids[1]}")
+
+    results = _get_concurrently(concurrently, client, ids)
+
+    assert all(result["success"] for result in results)
+    assert zoho.calls["composite"] == 1
+    # The two failed sub-requests were retried directly; the third was served in the batch.
+    assert zoho.calls["records.get"] == 1 + 2
+    assert zoho.faults == {"429": 1, "503": 1}
+
+
+def test_rejected_composite_call_falls_back_to_direct_requests(zoho, make_client, concurrently):
+    client = make_client()
+    client.access_token
+    # 400 is not retryable, so the composite call fails as a whole.
+    zoho.fail_next(400, path="__composite_requests")
+
+    results = _get_concurrently(concurrently, client, _ids(3))
+
+    assert all(result["success"] for result in results)
+    assert zoho.calls["composite"] == 0
+    assert zoho.calls["records.get"] == 3
+
+
+def test_async_retryable_sub_responses_are_resent(zoho, make_async_client):
+    client = make_async_client()
+    ids = _ids(3)
+
+    async def run():
+        try:
+            await client.tokens.get_token()
+            zoho.fail_next(503, path=f"/Leads/{ids[2]}")
+            with batching(window=0.1):
+                return await asyncio.gather(*(client.get_specific_record("Leads", record_id) for record_id in ids))
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+
+    assert all(result["success"] for result in results)
+    assert zoho.calls["composite"] == 1
+    assert zoho.calls["records.get"] == 2 + 1
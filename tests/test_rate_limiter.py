@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+from zoho.rate_limiter import EndpointLimit, RateLimiter
+
+
+def test_bucket_paces_calls_after_the_burst():
+    limiter = RateLimiter({"read": EndpointLimit(rate=20, burst=2, concurrency=10)})
+
+    started = time.monotonic()
+    for _ in range(6):
+        with limiter.limit("records.get"):
+            pass
+    elapsed = time.monotonic() - started
+
+    # Two calls ride the burst; the other four wait 1/20 s each.
+    assert 0.18 <= elapsed < 1
+    stats = limiter.stats()["read"]
+    assert stats["calls"] == 6
+    assert stats["queued"] == 4
+
+
+def test_bucket_refills_while_idle():
+    now = [0.0]
+    limiter = RateLimiter({"write": EndpointLimit(rate=1, burst=1, concurrency=5)}, clock=lambda: now[0])
+    bucket = limiter._bucket("records.create")
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 1.0
+    now[0] = 10
+    # Refills to the burst size, not beyond: one free call, then the debt is back.
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 1.0
+
+
+def test_concurrency_cap():
+    limiter = RateLimiter({"coql": EndpointLimit(rate=1000, burst=1000, concurrency=2)})
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def call():
+        with limiter.limit("coql"):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+
+
+def test_unclassified_endpoints_pass_through():
+    limiter = RateLimiter({"read": EndpointLimit(rate=0.001, burst=0, concurrency=1)})
+
+    started = time.monotonic()
+    with limiter.limit("oauth.token"):
+        pass
+
+    assert time.monotonic() - started < 0.05
+
+
+def test_async_bucket_paces_calls():
+    limiter = RateLimiter({"settings": EndpointLimit(rate=20, burst=2, concurrency=10)})
+
+    async def call():
+        async with limiter.alimit("settings.fields"):
+            pass
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*(call() for _ in range(6)))
+        return time.monotonic() - started
+
+    assert 0.18 <= asyncio.run(run()) < 1
+    assert limiter.stats()["settings"]["queued"] == 4
+
+
+def test_sync_and_async_clients_share_one_budget(zoho, make_client, make_async_client):
+    limiter = RateLimiter({"read": EndpointLimit(rate=1000, burst=1000, concurrency=10)})
+    sync_client = make_client(rate_limiter=limiter)
+    async_client = make_async_client(rate_limiter=limiter)
+
+    sync_client.get_specific_record("Leads", "5725767000000000001")
+
+    async def run():
+        try:
+            await async_client.get_specific_record("Leads", "5725767000000000002")
+        finally:
+            await async_client.aclose()
+
+    asyncio.run(run())
+    assert limiter.stats()["read"]["calls"] == 2
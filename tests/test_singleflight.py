@@ -0,0 +1,51 @@
+import asyncio
+
+from zoho.json_body import response_json
+
+
+def test_concurrent_get_fields_share_one_request(zoho, make_client, concurrently):
+    client = make_client()
+    client.access_token  # fetch the token first so only the fields call races
+    zoho.latency = 0.2
+
+    first, second = concurrently(2, lambda: client.get_fields("Leads", ["ALL"]))
+
+    assert zoho.calls["settings.fields"] == 1
+    assert client.inflight.shared == 1
+    assert first == second
+    assert first is not second and first["data"] is not second["data"]
+
+
+def test_coalesced_callers_decode_independent_bodies(zoho, make_client, concurrently):
+    client = make_client()
+    client.access_token
+    zoho.latency = 0.2
+    url = f"{client.api_domain}/crm/v8/settings/fields?module=Leads"
+
+    responses = concurrently(2, lambda: client._request("GET", url, "settings.fields"))
+    bodies = [response_json(response) for response in responses]
+
+    assert zoho.calls["settings.fields"] == 1
+    assert bodies[0] == bodies[1] and bodies[0] is not bodies[1]
+    bodies[0]["fields"].clear()
+    assert bodies[1]["fields"]
+
+
+def test_async_coalesced_callers_decode_independent_bodies(zoho, make_async_client):
+    client = make_async_client()
+    url = f"{client.api_domain}/crm/v8/settings/fields?module=Leads"
+
+    async def run():
+        try:
+            await client.tokens.get_token()
+            zoho.latency = 0.2
+            return await asyncio.gather(*(client._send("GET", url, "settings.fields") for _ in range(2)))
+        finally:
+            await client.aclose()
+
+    bodies = [response_json(response) for response in asyncio.run(run())]
+
+    assert zoho.calls["settings.fields"] == 1
+    assert bodies[0] == bodies[1] and bodies[0] is not bodies[1]
+    bodies[0]["fields"].clear()
+    assert bodies[1]["fields"]
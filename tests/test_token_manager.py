@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+from zoho.rate_limiter import EndpointLimit, RateLimiter
+from zoho.token_manager import AsyncTokenManager, TokenManager
+
+LEAD_ID = 5725767000000000000
+
+
+def _unthrottled() -> RateLimiter:
+    # 40 reads (20 rejected, 20 replayed) would queue ~2 s on the default read bucket.
+    return RateLimiter({"read": EndpointLimit(rate=1000, burst=1000, concurrency=50)})
+
+
+def test_concurrent_401s_refresh_once(zoho, make_client, concurrently):
+    client = make_client(rate_limiter=_unthrottled())
+    client.access_token
+    zoho.expire_tokens()
+
+    # Distinct records, so neither single-flight nor the record cache merges the calls.
+    pending = iter(range(20))
+    results = concurrently(20, lambda: client.get_specific_record("Leads", str(LEAD_ID + next(pending))))
+
+    assert all(result["success"] for result in results)
+    assert zoho.calls["oauth.token"] == 2
+    assert client.tokens.refresh_count == 2
+
+
+def test_async_concurrent_401s_refresh_once(zoho, make_async_client):
+    client = make_async_client(rate_limiter=_unthrottled())
+
+    async def run():
+        try:
+            await client.tokens.get_token()
+            zoho.expire_tokens()
+            return await asyncio.gather(*(client.get_specific_record("Leads", str(LEAD_ID + index)) for index in range(20)))
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+
+    assert all(result["success"] for result in results)
+    assert zoho.calls["oauth.token"] == 2
+
+
+def test_refresh_inside_margin_runs_in_background(zoho, make_client):
+    client = make_client()
+    first = client.access_token
+    # The fake's tokens live 3600 s, so this margin puts every token inside it.
+    client.tokens.refresh_margin = 7200
+
+    assert client.access_token == first
+    client.tokens._background.join(5)
+
+    assert zoho.calls["oauth.token"] == 2
+    assert client.tokens.token != first
+    assert client.get_specific_record("Leads", str(LEAD_ID))["success"]
+
+
+def test_failed_background_refresh_keeps_current_token():
+    now = [0.0]
+    fetched = threading.Event()
+
+    def fetch():
+        fetched.set()
+        return None
+
+    tokens = TokenManager(fetch, refresh_margin=60, clock=lambda: now[0])
+    tokens.set_token("current", expires_in=100)
+    now[0] = 50
+
+    assert tokens.get_token() == "current"
+    tokens._background.join(5)
+    assert fetched.is_set()
+    assert tokens.get_token() == "current"
+
+
+def test_refresh_is_skipped_when_another_caller_already_replaced_the_token():
+    calls = []
+    tokens = TokenManager(lambda: calls.append(1) or {"access_token": f"t{len(calls)}", "expires_in": 3600})
+
+    assert tokens.get_token() == "t1"
+    assert tokens.refresh("t1") == "t2"
+    # A caller still holding t1 gets t2 without another fetch.
+    assert tokens.refresh("t1") == "t2"
+    assert len(calls) == 2
+
+
+def test_async_manager_coalesces_refreshes():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"access_token": f"t{len(calls)}", "expires_in": 3600}
+
+    async def run():
+        tokens = AsyncTokenManager(fetch)
+        return await asyncio.gather(*(tokens.get_token() for _ in range(10)))
+
+    assert asyncio.run(run()) == ["t1"] * 10
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import threading
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    Build-once, thread-safe holder for an expensive object (API clients,
+    chat models). Nothing is constructed until the first get(), so importing
+    the module that declares it stays free of network I/O.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value = None
+        self._ready = False
+
+    def get(self) -> T:
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self._value = self._factory()
+                    self._ready = True
+        return self._value
+
+    @property
+    def initialized(self) -> bool:
+        return self._ready
+
+    def reset(self):
+        with self._lock:
+            self._value = None
+            self._ready = False
@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "text" (key=value) or "json" (one object per line).
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Request/response bodies can hold customer data: off unless asked for, and
+# then only at DEBUG, truncated and sampled.
+LOG_BODIES = os.getenv("LOG_BODIES", "false").lower() in ("1", "true", "yes")
+LOG_BODY_MAX = int(os.getenv("LOG_BODY_MAX", "2000"))
+LOG_BODY_SAMPLE = float(os.getenv("LOG_BODY_SAMPLE", "1.0"))
+
+# Loggers under these roots get the structured handler.
+_ROOTS = ("zoho", "agent")
+
+_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Attach fields (thread_id, node, ...) to every log line emitted inside
+    the block, including from asyncio tasks and LangChain worker threads
+    started in it.
+    """
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def graph_log_fields(config: dict | None) -> dict:
+    """Correlation fields for a LangGraph node from its RunnableConfig."""
+    config = config or {}
+    configurable = config.get("configurable") or {}
+    metadata = config.get("metadata") or {}
+    return {
+        "thread_id": configurable.get("thread_id") or metadata.get("thread_id"),
+        "node": metadata.get("langgraph_node"),
+    }
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def log_fields(**values) -> dict:
+    """`extra=` for a log call: structured fields rendered after the message (None values dropped)."""
+    return {"fields": {key: value for key, value in values.items() if value is not None}}
+
+
+class Truncated:
+    """Renders a body only when the record is actually formatted, capped at `limit` chars."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int = LOG_BODY_MAX):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str, ensure_ascii=False)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}...(+{len(text) - self.limit} chars)"
+
+
+def log_body(logger: logging.Logger, message: str, body, **values):
+    """
+    DEBUG-log a request/response body if LOG_BODIES is on and this call is
+    sampled. `body` may be a callable, so it is only produced when logged.
+    """
+    if not LOG_BODIES or not logger.isEnabledFor(logging.DEBUG):
+        return
+    if LOG_BODY_SAMPLE < 1 and random.random() >= LOG_BODY_SAMPLE:
+        return
+    if callable(body):
+        body = body()
+    logger.debug(message, extra=log_fields(body=Truncated(body), **values))
+
+
+class StructuredFormatter(logging.Formatter):
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        values = {**getattr(record, "context", {}), **getattr(record, "fields", {})}
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+        timestamp = f"{timestamp}.{int(record.msecs):03d}Z"
+
+        if self.json_lines:
+            entry = {
+                "ts": timestamp,
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **values,
+            }
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str, ensure_ascii=False)
+
+        line = f"{timestamp} {record.levelname:<7} {record.name} {record.getMessage()}"
+        if values:
+            line += " " + " ".join(f"{key}={_text_value(value)}" for key, value in values.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def _text_value(value) -> str:
+    if isinstance(value, (dict, list, tuple)):
+        value = json.dumps(value, default=str, ensure_ascii=False)
+    text = str(value)
+    if not text or any(char in text for char in ' ="\n'):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, stream=None):
+    """
+    Send the zoho.* and agent.* loggers to one structured stderr handler.
+    Called by get_logger(); calling it again replaces the handler.
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(StructuredFormatter(json_lines=fmt == "json"))
+    handler.addFilter(_ContextFilter())
+    for root in _ROOTS:
+        logger = logging.getLogger(root)
+        for old in [h for h in logger.handlers if getattr(h, "_structured", False)]:
+            logger.removeHandler(old)
+        handler._structured = True
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+
+
+_configured = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    global _configured
+    if not _configured:
+        _configured = True
+        configure_logging()
+    return logging.getLogger(name)
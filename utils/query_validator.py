@@ -106,3 +106,44 @@ def validate_and_format_coql(query: str) -> Dict[str, Any]:
         "errors": errors,
         "warnings": warnings
     }
+
+
+_LITERAL_RE = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")""")
+_KEYWORD_RE = re.compile(
+    r"\b(select|from|where|and|or|in|not|is|null|like|between|order|by|asc|desc|limit|offset)\b",
+    re.IGNORECASE,
+)
+
+
+def canonical_coql(query: str) -> str:
+    """
+    Canonical form of a COQL query, for use as a cache key.
+
+    Applies validate_and_format_coql's normalizations (keyword/operator
+    case, single-quoted literals, `= null` -> `is null`, the default
+    `WHERE id is not null`) plus whitespace collapsing, but only outside
+    string literals: two queries map to the same key only if Zoho would see
+    the same filter values.
+    """
+    parts = _LITERAL_RE.split(query.strip().rstrip(";").strip())
+
+    canonical = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            canonical.append("'" + part[1:-1] + "'" if part.startswith('"') else part)
+            continue
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r"\s*([,()=<>!])\s*", r"\1", part)
+        part = _KEYWORD_RE.sub(lambda match: match.group(0).lower(), part)
+        part = re.sub(r"(!=|<>)null\b", " is not null", part)
+        part = re.sub(r"=null\b", " is null", part)
+        canonical.append(part)
+
+    query = "".join(canonical).strip()
+    if not _has_keyword(parts, "where"):
+        query = re.sub(r"\bfrom (\w+)", r"from \1 where id is not null", query, count=1)
+    return query
+
+
+def _has_keyword(parts: list, keyword: str) -> bool:
+    return any(re.search(rf"\b{keyword}\b", part, re.IGNORECASE) for part in parts[::2])
@@ -0,0 +1,1043 @@
+import asyncio
+import json
+import time
+from typing import IO, AsyncIterator
+
+import httpx
+
+from zoho.bulk import (
+    BULK_WRITE_MAX_RECORDS,
+    BULK_BATCH_SIZE,
+    BULK_DOWNLOAD_CHUNK,
+    BULK_JOB_TIMEOUT,
+    BULK_TOOL_TIMEOUT,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    WRITE_JOB_FAILED,
+    BulkJobError,
+    BulkJobTimeout,
+    iter_csv_batches,
+    iter_csv_rows,
+    next_read_page,
+    pending_write_result,
+    poll_delays,
+    read_job_body,
+    records_to_zip,
+    spool,
+    write_job_body,
+    write_job_summary,
+)
+from zoho.cache import TTLCache
+from zoho.composite import (
+    BATCHABLE_ENDPOINTS,
+    AsyncCompositeBatcher,
+    composite_body,
+    current_window,
+    split_composite_response,
+    sub_request,
+    sub_response_headers,
+)
+from zoho.coql import (
+    COQL_CACHE_SIZE,
+    COQL_CACHE_TTL,
+    COQL_MAX_OFFSET,
+    COQL_MAX_PAGE_SIZE,
+    PageBudget,
+    query_cache_key,
+    split_limit,
+    with_limit,
+)
+from zoho.crm_client import (
+    FIELDS_CACHE_TTL,
+    MODULES_CACHE_TTL,
+    MODULES_FAILURE_TTL,
+    ZOHO_ACCOUNTS_DOMAIN,
+    ZOHO_CONTENT_DOMAIN,
+    ZOHO_ORG_ID,
+    ZOHO_API_DOMAIN,
+    ZohoAPIError,
+    ZohoCRMClient,
+    filter_fields,
+    format_modules,
+    log_response,
+    tool_error,
+)
+from zoho.json_body import detached, response_json, with_json
+from zoho.metrics import MetricsSink, default_metrics, observe_response
+from zoho.module_catalog import MODULE_CATALOG_FAILED_KEY, MODULE_CATALOG_KEY, ModuleCatalog
+from zoho.rate_limiter import RateLimiter
+from zoho.records import (
+    RECORDS_CACHE_SIZE,
+    RECORDS_CACHE_TTL,
+    RECORDS_MAX_PER_PAGE,
+    WRITE_CONCURRENCY,
+    chunk_payload,
+    list_params,
+    merge_write_results,
+    needs_chunking,
+    next_page,
+    written_record_ids,
+)
+from zoho.retry import RetryPolicy, RetryStats
+from zoho.singleflight import AsyncSingleFlight, request_key
+from zoho.token_manager import AsyncTokenManager, TokenState
+from zoho.users_directory import USERS_PAGE_SIZE, UsersDirectory
+from zoho.session import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+)
+from utils.log import get_logger, log_body, log_fields, new_request_id
+
+log = get_logger(__name__)
+
+
+def _release_http(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """
+    Let go of a client opened on another event loop. aclose() has to run on
+    that loop, so it is scheduled there while the loop is still running;
+    once the loop has ended the client can no longer be closed and is only
+    dropped. Code that runs the client under short-lived loops must
+    `await client.aclose()` before each loop ends (see
+    AsyncZohoCRMClient.aclose).
+    """
+    if loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        log.debug("dropping httpx client of a finished event loop")
+
+
+class AsyncZohoCRMClient:
+    """
+    asyncio counterpart of ZohoCRMClient backed by a pooled httpx.AsyncClient.
+
+    Methods mirror the synchronous client and return the same
+    {"success": True, "data": ...} / tool_error(...) shapes, so async tools
+    can be swapped in without touching the prompts. No network I/O happens
+    in the constructor: the access token and the HTTP pool are created on
+    the first request, inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        refresh_token,
+        client_id,
+        client_secret,
+        zapikey,
+        http_client: httpx.AsyncClient = None,
+        api_domain: str = ZOHO_API_DOMAIN,
+        accounts_domain: str = ZOHO_ACCOUNTS_DOMAIN,
+        content_domain: str = ZOHO_CONTENT_DOMAIN,
+        org_id: str = ZOHO_ORG_ID,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        timeout: tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        token_state: TokenState = None,
+        field_cache: TTLCache = None,
+        module_cache: TTLCache = None,
+        record_cache: TTLCache = None,
+        query_cache: TTLCache = None,
+        users: UsersDirectory = None,
+        write_concurrency: int = WRITE_CONCURRENCY,
+        metrics: MetricsSink | None = None,
+    ):
+        self.refresh_token = refresh_token
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.zapikey = zapikey
+        self.api_domain = api_domain.rstrip("/")
+        self.accounts_domain = accounts_domain.rstrip("/")
+        self.content_domain = content_domain.rstrip("/")
+        self.org_id = org_id
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        # Per-endpoint latency/size/status metrics; None (ZOHO_METRICS unset) records nothing.
+        self.metrics = metrics if metrics is not None else default_metrics()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.field_cache = field_cache if field_cache is not None else TTLCache(ttl=FIELDS_CACHE_TTL)
+        self.module_cache = module_cache if module_cache is not None else TTLCache(ttl=MODULES_CACHE_TTL)
+        self.record_cache = (
+            record_cache if record_cache is not None
+            else TTLCache(ttl=RECORDS_CACHE_TTL, maxsize=RECORDS_CACHE_SIZE)
+        )
+        self.query_cache = (
+            query_cache if query_cache is not None
+            else TTLCache(ttl=COQL_CACHE_TTL, maxsize=COQL_CACHE_SIZE)
+        )
+        self.users = users if users is not None else UsersDirectory()
+        # How many 100-record chunks of a bulk create/update are sent at once.
+        self.write_concurrency = write_concurrency
+        self._users_lock = None
+        self._users_lock_loop = None
+        self.tokens = AsyncTokenManager(self._request_token, state=token_state)
+        self.composite = AsyncCompositeBatcher(self._send_composite)
+        self.inflight = AsyncSingleFlight(share=detached)
+
+        self._http = http_client
+        self._http_loop = None
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # httpx pools are bound to the loop that opened them; rebuild the
+        # pool when called from a different loop (e.g. successive asyncio.run).
+        loop = asyncio.get_running_loop()
+        if self._http is None or (self._http_loop is not None and self._http_loop is not loop):
+            if self._http is not None:
+                _release_http(self._http, self._http_loop)
+            self._http = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self):
+        """
+        Close the HTTP pool. Await it before the event loop that made the
+        requests ends (e.g. at the end of the coroutine given to
+        asyncio.run): a pool left open on a finished loop can't be closed
+        any more and its sockets stay open until garbage collection. The
+        next request opens a new pool.
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    @property
+    def access_token(self):
+        return self.tokens.token
+
+    async def _request_token(self):
+        url = f"{self.accounts_domain}/oauth/v2/token"
+        params = {
+            "refresh_token": self.refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "refresh_token",
+        }
+        response = await self._send("POST", url, "oauth.token", idempotent=True, auth=False, params=params)
+        if response.status_code == 200:
+            data = response_json(response)
+            if self.metrics is not None:
+                self.metrics.token_refresh(True)
+            log.info("access token refreshed", extra=log_fields(expires_in=data.get("expires_in")))
+            return data
+
+        body = response_json(response, None)
+        if self.metrics is not None:
+            self.metrics.token_refresh(False)
+        log.error(
+            "access token refresh failed",
+            extra=log_fields(status=response.status_code, error=body.get("error") if isinstance(body, dict) else None),
+        )
+        return None
+
+    async def refresh_access_token(self, stale_token: str = None):
+        return await self.tokens.refresh(stale_token or self.tokens.token)
+
+    @staticmethod
+    def _headers(token):
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Zoho-oauthtoken {token}",
+        }
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        idempotent: bool = None,
+        auth: bool = True,
+        batch: bool = True,
+        coalesce: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Async twin of ZohoCRMClient._request: rate limit, one 401 refresh, then self.retry_policy.
+
+        With stream=True the body is left unread; the caller must close the
+        returned response (e.g. `async with` or aclose()).
+        """
+        key = request_key(method, url, kwargs) if coalesce and self._coalescable(method, endpoint) else None
+        if key is not None:
+            return await self.inflight.do(key, lambda: self._send(
+                method, url, endpoint, idempotent, auth, batch, coalesce=False, **kwargs
+            ))
+
+        window = current_window()
+        if window and batch and self._batchable(method, url, endpoint, kwargs):
+            return await self._send_batched(url, endpoint, window, kwargs)
+
+        idempotent = self.retry_policy.is_idempotent(method, idempotent)
+        extra_headers = kwargs.pop("headers", None) or {}
+        stream = kwargs.pop("stream", False)
+        refreshed = False
+        attempt = 1
+        request_id = new_request_id()
+        if "json" in kwargs:
+            log_body(log, "zoho request body", kwargs["json"], request_id=request_id, endpoint=endpoint)
+        token = await self.tokens.get_token() if auth else None
+
+        while True:
+            headers = {**self._headers(token), **extra_headers} if auth else dict(extra_headers)
+            # A None value drops a default header (requests does this natively, httpx does not).
+            headers = {name: value for name, value in headers.items() if value is not None}
+
+            try:
+                async with self.rate_limiter.alimit(endpoint):
+                    start = time.perf_counter()
+                    request = self.http.build_request(method, url, headers=headers, **kwargs)
+                    response = await self.http.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                # A failed connect never reached Zoho, so it is safe to replay anything.
+                retryable = idempotent or isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                log.warning(
+                    "zoho %s %s failed: %s", method, endpoint, type(exc).__name__,
+                    extra=log_fields(request_id=request_id, attempt=attempt, retrying=retryable and attempt < self.retry_policy.max_attempts),
+                )
+                if self.metrics is not None:
+                    self.metrics.request(endpoint, method, type(exc).__name__, time.perf_counter() - start, 0, 0)
+                if not retryable or attempt >= self.retry_policy.max_attempts:
+                    raise
+                self._retried(endpoint, type(exc).__name__)
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
+
+            elapsed = time.perf_counter() - start
+            log_response(log, request_id, method, url, endpoint, attempt, elapsed, response, stream)
+            if self.metrics is not None:
+                observe_response(self.metrics, method, endpoint, elapsed, response, stream)
+
+            if auth and response.status_code == 401 and not refreshed:
+                log.info("access token rejected, refreshing", extra=log_fields(request_id=request_id))
+                refreshed = True
+                self._retried(endpoint, "401")
+                token = await self.refresh_access_token(token)
+                if token:
+                    await response.aclose()
+                    continue
+                return response
+
+            if (
+                attempt < self.retry_policy.max_attempts
+                and self.retry_policy.should_retry_status(response.status_code, idempotent)
+            ):
+                await response.aclose()
+                self._retried(endpoint, str(response.status_code))
+                await asyncio.sleep(self.retry_policy.delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            return response
+
+    _retried = ZohoCRMClient._retried
+    _coalescable = staticmethod(ZohoCRMClient._coalescable)
+
+    def _batchable(self, method: str, url: str, endpoint: str, kwargs: dict) -> bool:
+        return (
+            method == "GET"
+            and endpoint in BATCHABLE_ENDPOINTS
+            and url.startswith(self.api_domain)
+            and not kwargs.get("stream")
+        )
+
+    async def _send_batched(self, url: str, endpoint: str, window: float, kwargs: dict) -> httpx.Response:
+        result = await self.composite.submit((url, endpoint, kwargs), window)
+        if isinstance(result, httpx.Response):
+            return result
+
+        status_code, body, headers = result
+        content = json.dumps(body).encode() if body is not None else b""
+        response = httpx.Response(
+            status_code,
+            headers=sub_response_headers(headers),
+            content=content,
+            request=httpx.Request("GET", url),
+        )
+        return with_json(response, body) if body is not None else response
+
+    async def _send_composite(self, items: list) -> list:
+        """Async twin of ZohoCRMClient._send_composite."""
+        async def direct(item):
+            url, endpoint, kwargs = item
+            return await self._send("GET", url, endpoint, batch=False, coalesce=False, **kwargs)
+
+        if len(items) == 1:
+            return [await direct(items[0])]
+
+        subs = [sub_request("GET", url, kwargs.get("params"), kwargs.get("headers")) for url, _, kwargs in items]
+        response = await self._send(
+            "POST",
+            f"{self.api_domain}/crm/v8/__composite_requests",
+            "composite",
+            idempotent=True,
+            batch=False,
+            json=composite_body(subs),
+        )
+        if response.status_code not in (200, 207):
+            return list(await asyncio.gather(*(direct(item) for item in items)))
+
+        results = split_composite_response(response_json(response), len(items))
+        retry = [index for index, result in enumerate(results) if result[0] in self.retry_policy.retry_statuses]
+        for index, retried in zip(retry, await asyncio.gather(*(direct(items[index]) for index in retry))):
+            results[index] = retried
+        return results
+
+    @staticmethod
+    def _error(tool: str, response: httpx.Response):
+        return tool_error(
+            tool=tool,
+            error_type="API_ERROR",
+            message="Zoho CRM rejected the request",
+            status_code=response.status_code,
+            details=response_json(response, {})
+        )
+
+    def _result(self, tool: str, response: httpx.Response):
+        if response.status_code not in (200, 201):
+            return self._error(tool, response)
+
+        return {
+            "success": True,
+            "data": response_json(response)
+        }
+
+    async def get_records(self, module: str, fields: list = None):
+        url = f"{self.api_domain}/crm/v8/{module}"
+        response = await self._send("GET", url, "records.list", params={"fields": ",".join(fields or [])})
+        return self._result("get_records_tool", response)
+
+    async def iter_record_pages(
+        self,
+        module: str,
+        fields: list,
+        per_page: int = RECORDS_MAX_PER_PAGE,
+        sort_by: str = None,
+        sort_order: str = None,
+        cvid: str = None,
+        max_records: int = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Async generator twin of ZohoCRMClient.iter_record_pages."""
+        url = f"{self.api_domain}/crm/v8/{module}"
+        params = list_params(fields, per_page, sort_by, sort_order, cvid)
+        paging = {"page": 1}
+        page = 1
+        remaining = max_records
+
+        while paging is not None and (remaining is None or remaining > 0):
+            response = await self._send("GET", url, "records.list", params={**params, **paging})
+
+            if response.status_code == 204:
+                return
+            if response.status_code not in (200, 201):
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+
+            body = response_json(response)
+            records = body.get("data", [])
+            if remaining is not None:
+                records = records[:remaining]
+                remaining -= len(records)
+            if records:
+                yield records
+
+            paging = next_page(body.get("info", {}), page)
+            page += 1
+
+    async def iter_records(self, module: str, fields: list, **kwargs) -> AsyncIterator[dict]:
+        async for records in self.iter_record_pages(module, fields, **kwargs):
+            for record in records:
+                yield record
+
+    # Cache bookkeeping is identical for both clients.
+    _records_written = ZohoCRMClient._records_written
+    _lead_converted = ZohoCRMClient._lead_converted
+
+    async def get_specific_record(self, module: str, record_id: str):
+        cached = self.record_cache.get((module, str(record_id)))
+        if cached is not None:
+            return {"success": True, "data": cached}
+
+        url = f"{self.api_domain}/crm/v8/{module}/{record_id}"
+        response = await self._send("GET", url, "records.get")
+        result = self._result("get_records_tool", response)
+        if result["success"]:
+            self.record_cache.set((module, str(record_id)), result["data"])
+        return result
+
+    async def get_fields(self, module: str, datatypes: list):
+        data = self.field_cache.get(module)
+
+        if data is None:
+            url = f"{self.api_domain}/crm/v8/settings/fields"
+            response = await self._send("GET", url, "settings.fields", params={"module": module})
+
+            if response.status_code not in (200, 201):
+                return self._error("get_fields_tool", response)
+
+            data = response_json(response)
+            self.field_cache.set(module, data)
+
+        return {
+            "success": True,
+            "data": filter_fields(data, datatypes)
+        }
+
+    def invalidate_fields(self, module: str = None):
+        if module is None:
+            self.field_cache.clear()
+        else:
+            self.field_cache.invalidate(module)
+
+    async def query_records(self, query: str):
+        key = query_cache_key(query)
+        cached = self.query_cache.get(key) if key else None
+        if cached is not None:
+            return {"success": True, "data": cached}
+
+        url = f"{self.api_domain}/crm/v8/coql"
+        # COQL is a read, so the POST is safe to replay.
+        response = await self._send("POST", url, "coql", idempotent=True, json={"select_query": query})
+
+        if response.status_code == 401 and not self.tokens.token:
+            raise Exception("Token refresh failed")
+
+        if response.status_code == 204:
+            return {"data": []}
+
+        result = self._result("query_records_tools", response)
+        if key and result["success"]:
+            self.query_cache.set(key, result["data"])
+        return result
+
+    async def iter_query(
+        self,
+        query: str,
+        page_size: int = COQL_MAX_PAGE_SIZE,
+        max_rows: int = None,
+        max_bytes: int = None,
+        budget: PageBudget = None,
+    ) -> AsyncIterator[dict]:
+        """Async generator twin of ZohoCRMClient.iter_query."""
+        query, offset, limit = split_limit(query)
+        budget = budget or PageBudget(max_rows, max_bytes)
+        if limit is not None:
+            budget.max_rows = limit if budget.max_rows is None else min(budget.max_rows, limit)
+
+        url = f"{self.api_domain}/crm/v8/coql"
+        page_size = min(page_size, COQL_MAX_PAGE_SIZE)
+        more_records = True
+
+        while not budget.exhausted:
+            size = min(page_size, COQL_MAX_OFFSET - offset)
+            if budget.max_rows is not None:
+                size = min(size, budget.max_rows - budget.rows)
+            if size <= 0:
+                break
+
+            payload = {"select_query": with_limit(query, size, offset)}
+            response = await self._send("POST", url, "coql", idempotent=True, json=payload)
+
+            if response.status_code == 204:
+                return
+            if response.status_code not in (200, 201):
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+
+            body = response_json(response)
+            rows = body.get("data", [])
+            for row in budget.take(rows, len(response.content)):
+                yield row
+
+            more_records = bool(body.get("info", {}).get("more_records")) and len(rows) == size
+            if not more_records:
+                return
+            offset += len(rows)
+
+        budget.truncated = budget.truncated or more_records
+
+    async def query_all_records(self, query: str, max_rows: int = None, max_bytes: int = None):
+        key = query_cache_key(query, "all", max_rows, max_bytes)
+        cached = self.query_cache.get(key) if key else None
+        if cached is not None:
+            return {"success": True, "data": cached}
+
+        budget = PageBudget(max_rows, max_bytes)
+        try:
+            rows = [row async for row in self.iter_query(query, budget=budget)]
+        except ZohoAPIError as exc:
+            return tool_error(
+                tool="query_records_tools",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=exc.status_code,
+                details=exc.details
+            )
+
+        data = {
+            "data": rows,
+            "info": {"count": len(rows), "more_records": budget.truncated}
+        }
+        if key:
+            self.query_cache.set(key, data)
+        return {
+            "success": True,
+            "data": data
+        }
+
+    async def create_bulk_read(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        page: int = 1,
+        page_token: str = None,
+        cvid: str = None,
+    ) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/read"
+        body = read_job_body(module, fields, criteria, page, page_token, cvid)
+        response = await self._send("POST", url, "bulk.read.create", json=body)
+
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["data"][0]["details"]
+
+    async def get_bulk_read(self, job_id: str) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/read/{job_id}"
+        response = await self._send("GET", url, "bulk.read.status")
+
+        if response.status_code != 200:
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["data"][0]
+
+    async def wait_for_bulk_read(self, job_id: str, timeout: float = BULK_JOB_TIMEOUT) -> dict:
+        deadline = time.monotonic() + timeout
+        for delay in poll_delays():
+            job = await self.get_bulk_read(job_id)
+            if job.get("state") == JOB_COMPLETED:
+                return job
+            if job.get("state") == JOB_FAILED:
+                raise BulkJobError(job)
+            if time.monotonic() + delay > deadline:
+                raise BulkJobTimeout(job, f"Bulk job {job_id} not finished after {timeout:g}s")
+            await asyncio.sleep(delay)
+
+    async def download_bulk_read(self, job_id: str, file: IO[bytes] = None) -> IO[bytes]:
+        url = f"{self.api_domain}/crm/bulk/v8/read/{job_id}/result"
+        return await self._download(url, "bulk.read.download", file)
+
+    async def _download(self, url: str, endpoint: str, file: IO[bytes] = None) -> IO[bytes]:
+        file = file if file is not None else spool()
+
+        response = await self._send("GET", url, endpoint, stream=True)
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+            async for chunk in response.aiter_bytes(BULK_DOWNLOAD_CHUNK):
+                file.write(chunk)
+        finally:
+            await response.aclose()
+
+        file.seek(0)
+        return file
+
+    async def _bulk_read_files(self, module: str, fields: list, criteria: dict, cvid: str, timeout: float):
+        paging = {"page": 1}
+        while paging is not None:
+            job = await self.create_bulk_read(module, fields, criteria, cvid=cvid, **paging)
+            job = await self.wait_for_bulk_read(job["id"], timeout)
+            with await self.download_bulk_read(job["id"]) as file:
+                yield file
+            paging = next_read_page(job)
+
+    async def iter_bulk_read(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        cvid: str = None,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> AsyncIterator[dict]:
+        """Async twin of ZohoCRMClient.iter_bulk_read; CSV parsing itself reads the local spool file."""
+        async for file in self._bulk_read_files(module, fields, criteria, cvid, timeout):
+            for row in iter_csv_rows(file):
+                yield row
+
+    async def iter_bulk_read_batches(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        cvid: str = None,
+        batch_size: int = BULK_BATCH_SIZE,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> AsyncIterator[dict[str, list]]:
+        async for file in self._bulk_read_files(module, fields, criteria, cvid, timeout):
+            for batch in iter_csv_batches(file, batch_size):
+                yield batch
+
+    async def get_org_id(self) -> str:
+        if self.org_id is None:
+            response = await self._send("GET", f"{self.api_domain}/crm/v8/org", "settings.org")
+            if response.status_code != 200:
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+            self.org_id = str(response_json(response)["org"][0]["zgid"])
+        return self.org_id
+
+    async def upload_bulk_file(self, file: IO[bytes], name: str = "records.zip") -> str:
+        url = f"{self.content_domain}/crm/v8/upload"
+        headers = {
+            "Content-Type": None,
+            "feature": "bulk-write",
+            "X-CRM-ORG": await self.get_org_id(),
+        }
+        files = {"file": (name, file.read(), "application/zip")}
+        response = await self._send("POST", url, "bulk.write.upload", headers=headers, files=files)
+
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["details"]["file_id"]
+
+    async def create_bulk_write(
+        self,
+        module: str,
+        file_id: str,
+        columns: list,
+        operation: str = "upsert",
+        find_by: str = None,
+        ignore_empty: bool = True,
+    ) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/write"
+        body = write_job_body(module, file_id, columns, operation, find_by, ignore_empty)
+        response = await self._send("POST", url, "bulk.write.create", json=body)
+
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["details"]
+
+    async def get_bulk_write(self, job_id: str) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/write/{job_id}"
+        response = await self._send("GET", url, "bulk.write.status")
+
+        if response.status_code != 200:
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)
+
+    async def wait_for_bulk_write(self, job_id: str, timeout: float = BULK_JOB_TIMEOUT) -> dict:
+        deadline = time.monotonic() + timeout
+        for delay in poll_delays():
+            job = await self.get_bulk_write(job_id)
+            if job.get("status") == JOB_COMPLETED:
+                return job
+            if job.get("status") == WRITE_JOB_FAILED:
+                raise BulkJobError(job)
+            if time.monotonic() + delay > deadline:
+                raise BulkJobTimeout(job, f"Bulk job {job_id} not finished after {timeout:g}s")
+            await asyncio.sleep(delay)
+
+    async def iter_bulk_write_report(self, job: dict) -> AsyncIterator[dict]:
+        url = (job.get("result") or {}).get("download_url")
+        if not url:
+            return
+        if url.startswith("/"):
+            url = f"{self.api_domain}{url}"
+        with await self._download(url, "bulk.write.download") as file:
+            for row in iter_csv_rows(file):
+                yield row
+
+    async def bulk_write(
+        self,
+        module: str,
+        records: list[dict],
+        operation: str = "upsert",
+        find_by: str = None,
+        columns: list = None,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> list[dict]:
+        """Async twin of ZohoCRMClient.bulk_write."""
+        summaries = []
+        for start in range(0, len(records), BULK_WRITE_MAX_RECORDS):
+            # CSV writing and deflate of up to 25k rows would stall the event loop.
+            file, job_columns = await asyncio.to_thread(
+                records_to_zip, records[start:start + BULK_WRITE_MAX_RECORDS], columns
+            )
+            with file:
+                file_id = await self.upload_bulk_file(file)
+            job = await self.create_bulk_write(module, file_id, job_columns, operation, find_by)
+            try:
+                job = await self.wait_for_bulk_write(job["id"], timeout)
+            except BulkJobTimeout as exc:
+                exc.completed = summaries
+                exc.unsubmitted = max(0, len(records) - start - BULK_WRITE_MAX_RECORDS)
+                raise
+            self._records_written(module)
+            report = [row async for row in self.iter_bulk_write_report(job)]
+            summaries.append(write_job_summary(job, report))
+        return summaries
+
+    async def bulk_write_records(
+        self,
+        module: str,
+        records: list[dict],
+        operation: str = "upsert",
+        find_by: str = None,
+        timeout: float = BULK_TOOL_TIMEOUT,
+    ):
+        try:
+            jobs = await self.bulk_write(module, records, operation, find_by, timeout=timeout)
+        except BulkJobTimeout as exc:
+            return {"success": True, "data": pending_write_result(exc)}
+        except ZohoAPIError as exc:
+            return tool_error(
+                tool="bulk_write_records_tool",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=exc.status_code,
+                details=exc.details,
+            )
+        except BulkJobError as exc:
+            return tool_error(
+                tool="bulk_write_records_tool",
+                error_type="BULK_JOB_ERROR",
+                message=str(exc),
+                details={"job": exc.job},
+            )
+        except ValueError as exc:
+            return tool_error(tool="bulk_write_records_tool", error_type="INVALID_INPUT", message=str(exc))
+
+        return {
+            "success": True,
+            "data": {"jobs": jobs},
+        }
+
+    async def _write_chunked(self, method: str, url: str, endpoint: str, tool: str, payload: dict):
+        """Async twin of ZohoCRMClient._write_chunked."""
+        chunks = chunk_payload(payload)
+        gate = asyncio.Semaphore(self.write_concurrency)
+
+        async def send(chunk):
+            async with gate:
+                try:
+                    response = await self._send(method, url, endpoint, json=chunk)
+                except httpx.HTTPError as exc:
+                    return None, {"code": "REQUEST_FAILED", "message": str(exc)}
+            return response.status_code, response_json(response, {})
+
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        return merge_write_results(tool, chunks, results)
+
+    async def create_record(self, module: str, payload: dict):
+        url = f"{self.api_domain}/crm/v8/{module}"
+        if needs_chunking(payload):
+            result = await self._write_chunked("POST", url, "records.create", "create_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
+
+        response = await self._send("POST", url, "records.create", json=payload)
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
+        return self._result("create_records_tool", response)
+
+    async def create_Task(self, payload: dict):
+        url = f"{self.api_domain}/crm/v8/Tasks"
+        response = await self._send("POST", url, "records.create", json=payload)
+        self._records_written("Tasks", written_record_ids(payload, response_json(response, None)))
+        return self._result("create_task_tool", response)
+
+    def _get_users_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._users_lock is None or self._users_lock_loop is not loop:
+            self._users_lock = asyncio.Lock()
+            self._users_lock_loop = loop
+        return self._users_lock
+
+    async def _sync_users(self) -> httpx.Response | None:
+        """Async twin of ZohoCRMClient._sync_users."""
+        async with self._get_users_lock():
+            if self.users.is_fresh():
+                return None
+
+            full = self.users.needs_full_reload()
+            started = self.users.now()
+            headers = {} if full else {"If-Modified-Since": self.users.if_modified_since()}
+            collected = []
+            page = 1
+
+            while True:
+                url = f"{self.api_domain}/crm/v8/users"
+                params = {"type": "AllUsers", "page": page, "per_page": USERS_PAGE_SIZE}
+                response = await self._send("GET", url, "users.list", params=params, headers=headers)
+
+                if response.status_code in (204, 304):
+                    break
+                if response.status_code not in (200, 201):
+                    return response
+
+                body = response_json(response)
+                collected.extend(body.get("users", []))
+                if not body.get("info", {}).get("more_records"):
+                    break
+                page += 1
+
+            if full:
+                self.users.replace(collected, started)
+            else:
+                self.users.merge(collected, started)
+            return None
+
+    async def find_user(self, value: str) -> dict | None:
+        if await self._sync_users() is not None:
+            return None
+        return self.users.find(value)
+
+    async def get_all_users(self, user_type: str):
+        if not UsersDirectory.supports(user_type):
+            url = f"{self.api_domain}/crm/v8/users"
+            response = await self._send("GET", url, "users.list", params={"type": user_type})
+            return self._result("get_all_users_tool", response)
+
+        response = await self._sync_users()
+        if response is not None:
+            return self._error("get_all_users_tool", response)
+
+        users = self.users.list(user_type)
+        return {
+            "success": True,
+            "data": {
+                "users": users,
+                "info": {"count": len(users), "more_records": False}
+            }
+        }
+
+    async def get_specific_user(self, userID: str):
+        if await self._sync_users() is None:
+            user = self.users.get(userID)
+            if user is not None:
+                return {
+                    "success": True,
+                    "data": {"users": [user]}
+                }
+
+        url = f"{self.api_domain}/crm/v8/users/{userID}"
+        response = await self._send("GET", url, "users.get")
+
+        if response.status_code not in (200, 201):
+            return self._error("get_specific_user_tool", response)
+
+        data = response_json(response)
+        self.users.merge(data.get("users", []))
+
+        return {
+            "success": True,
+            "data": data
+        }
+
+    async def update_records(self, module: str, payload: dict, record_id: str = None):
+        if needs_chunking(payload):
+            url = f"{self.api_domain}/crm/v8/{module}"
+            result = await self._write_chunked("PUT", url, "records.update", "update_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
+
+        is_single = (
+            "data" in payload and
+            len(payload["data"]) == 1 and
+            "id" in payload["data"][0]
+        )
+
+        if is_single:
+            record_id = payload["data"][0]["id"]
+            url = f"{self.api_domain}/crm/v8/{module}/{record_id}"
+        else:
+            url = f"{self.api_domain}/crm/v8/{module}"
+
+        response = await self._send("PUT", url, "records.update", json=payload)
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
+        return self._result("update_records_tool", response)
+
+    async def upsert_records(self, module: str, payload: dict, duplicate_check_fields: list = None):
+        url = f"{self.api_domain}/crm/v8/{module}/upsert"
+        if duplicate_check_fields:
+            payload = {**payload, "duplicate_check_fields": list(duplicate_check_fields)}
+
+        if needs_chunking(payload):
+            result = await self._write_chunked("POST", url, "records.upsert", "upsert_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
+
+        response = await self._send("POST", url, "records.upsert", json=payload)
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
+        return self._result("upsert_records_tool", response)
+
+    async def convert_lead(self, record_id: str, payload: dict):
+        url = f"{self.api_domain}/crm/v8/Leads/{record_id}/actions/convert"
+        response = await self._send("POST", url, "leads.convert", json=payload)
+        self._lead_converted(record_id, response_json(response, None))
+        return self._result("convert_lead_tool", response)
+
+    async def send_mail(self, to_mail: str, mail_subject: str, mail_content: str):
+        url = f"{self.api_domain}/crm/v7/functions/agentmail/actions/execute"
+
+        params = {
+            "auth_type": "apikey",
+            "zapikey": self.zapikey,
+        }
+        payload = {
+            "toMail": to_mail,
+            "mailSubject": mail_subject,
+            "mailContent": mail_content
+        }
+
+        response = await self._send("POST", url, "functions.mail", auth=False, json=payload, params=params)
+        return self._result("send_mail_tool", response)
+
+    async def get_module_catalog(self) -> ModuleCatalog:
+        """Cached, indexed /settings/modules catalog; raises httpx.HTTPStatusError if Zoho rejects it."""
+        catalog = self.module_cache.get(MODULE_CATALOG_KEY)
+
+        if catalog is None:
+            url = f"{self.api_domain}/crm/v8/settings/modules"
+            response = await self._send("GET", url, "settings.modules")
+
+            if response.status_code not in (200, 201):
+                raise httpx.HTTPStatusError(
+                    f"Zoho CRM rejected the request ({response.status_code})",
+                    request=response.request,
+                    response=response,
+                )
+
+            catalog = ModuleCatalog(response_json(response))
+            self.module_cache.set(MODULE_CATALOG_KEY, catalog)
+            self.module_cache.invalidate(MODULE_CATALOG_FAILED_KEY)
+
+        return catalog
+
+    async def resolve_module(self, name: str) -> str | None:
+        if self.module_cache.get(MODULE_CATALOG_FAILED_KEY):
+            return None
+        try:
+            return (await self.get_module_catalog()).resolve(name)
+        except httpx.HTTPError:
+            self.module_cache.set(MODULE_CATALOG_FAILED_KEY, True, ttl=MODULES_FAILURE_TTL)
+            return None
+
+    async def get_module_api_name(self):
+        try:
+            catalog = await self.get_module_catalog()
+        except httpx.HTTPStatusError as exc:
+            return self._error("get_module_api_name_tool", exc.response)
+
+        return {
+            "success": True,
+            "data": format_modules(catalog.data)
+        }
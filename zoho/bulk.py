@@ -0,0 +1,229 @@
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from typing import IO, Iterator
+
+
+BULK_POLL_INITIAL = float(os.getenv("ZOHO_BULK_POLL_INITIAL", "2"))
+BULK_POLL_MAX = float(os.getenv("ZOHO_BULK_POLL_MAX", "30"))
+BULK_JOB_TIMEOUT = float(os.getenv("ZOHO_BULK_JOB_TIMEOUT", "1800"))
+# bulk_write_records_tool stops waiting after this long and hands back the job id.
+BULK_TOOL_TIMEOUT = float(os.getenv("ZOHO_BULK_TOOL_TIMEOUT", "120"))
+# Downloads stay in memory up to this size, then spill to a temp file.
+BULK_SPOOL_MAX = int(os.getenv("ZOHO_BULK_SPOOL_MAX", str(8 * 1024 * 1024)))
+BULK_DOWNLOAD_CHUNK = 64 * 1024
+BULK_BATCH_SIZE = 5000
+
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILURE"
+WRITE_JOB_FAILED = "FAILED"
+WRITE_OPERATIONS = ("insert", "update", "upsert")
+BULK_WRITE_MAX_RECORDS = 25_000
+# Failed rows kept in a bulk_write() summary; the full report stays downloadable.
+WRITE_REPORT_FAILURES = 50
+
+
+class BulkJobError(Exception):
+    """A bulk job finished in FAILURE or did not finish in time."""
+
+    def __init__(self, job: dict, message: str = None):
+        # Bulk Read jobs report `state`, Bulk Write jobs `status`.
+        state = job.get("state") or job.get("status")
+        super().__init__(message or f"Bulk job {job.get('id')} ended in state {state}")
+        self.job = job
+
+
+class BulkJobTimeout(BulkJobError):
+    """
+    A bulk job was still running at the deadline; it carries on in Zoho.
+    bulk_write() fills in the summaries of the jobs that did finish and how
+    many records were never submitted.
+    """
+
+    def __init__(self, job: dict, message: str = None):
+        super().__init__(job, message)
+        self.completed: list[dict] = []
+        self.unsubmitted = 0
+
+
+def read_job_body(
+    module: str,
+    fields: list = None,
+    criteria: dict = None,
+    page: int = 1,
+    page_token: str = None,
+    cvid: str = None,
+) -> dict:
+    """Request body for POST /crm/bulk/v8/read; `criteria` is Zoho's criteria object, passed as is."""
+    query = {"module": {"api_name": module}}
+    if fields:
+        query["fields"] = list(fields)
+    if criteria:
+        query["criteria"] = criteria
+    if cvid:
+        query["cvid"] = cvid
+    if page_token:
+        query["page_token"] = page_token
+    else:
+        query["page"] = page
+    return {"query": query, "file_type": "csv"}
+
+
+def next_read_page(job: dict) -> dict | None:
+    """Paging keys for the job that fetches the next 200k records, or None when done."""
+    result = job.get("result") or {}
+    if not result.get("more_records"):
+        return None
+    if result.get("next_page_token"):
+        return {"page_token": result["next_page_token"]}
+    return {"page": int(result.get("page") or 1) + 1}
+
+
+def poll_delays(initial: float = BULK_POLL_INITIAL, maximum: float = BULK_POLL_MAX, factor: float = 1.5):
+    """Endless exponential backoff for job status polling."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(maximum, delay * factor)
+
+
+def spool() -> IO[bytes]:
+    return tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_MAX)
+
+
+def _open_csv(archive: zipfile.ZipFile) -> IO[str]:
+    name = next((name for name in archive.namelist() if name.lower().endswith(".csv")), None)
+    if name is None:
+        raise BulkJobError({}, "Bulk result archive contains no CSV file")
+    return io.TextIOWrapper(archive.open(name), encoding="utf-8-sig", newline="")
+
+
+def iter_csv_rows(archive_file: IO[bytes]) -> Iterator[dict]:
+    """
+    Stream the rows of a bulk result zip as dicts.
+
+    The CSV is decompressed and parsed as it is read, so only the current
+    row (plus zipfile's read buffer) is in memory, whatever the file size.
+    """
+    with zipfile.ZipFile(archive_file) as archive, _open_csv(archive) as text:
+        yield from csv.DictReader(text)
+
+
+def iter_csv_batches(archive_file: IO[bytes], batch_size: int = BULK_BATCH_SIZE) -> Iterator[dict[str, list]]:
+    """Stream a bulk result zip as columnar batches: {column: [values, ...]} of up to batch_size rows."""
+    with zipfile.ZipFile(archive_file) as archive, _open_csv(archive) as text:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if not header:
+            return
+
+        columns = [[] for _ in header]
+        count = 0
+        width = len(header)
+        for row in reader:
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            for column, value in zip(columns, row):
+                column.append(value)
+            count += 1
+            if count == batch_size:
+                yield dict(zip(header, columns))
+                columns = [[] for _ in header]
+                count = 0
+
+        if count:
+            yield dict(zip(header, columns))
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        # Lookups ({"id": ...}) are written as the referenced record id.
+        return str(value.get("id", ""))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ";".join(_csv_value(item) for item in value)
+    return str(value)
+
+
+def records_to_zip(records: list[dict], columns: list = None, file: IO[bytes] = None) -> tuple[IO[bytes], list]:
+    """
+    Write records as a zipped CSV for Bulk Write, streaming row by row.
+
+    Columns default to every key seen, in first-seen order. Returns the
+    rewound file and the column list (CSV column i is field columns[i]).
+    """
+    if columns is None:
+        columns = list(dict.fromkeys(key for record in records for key in record))
+    file = file if file is not None else spool()
+
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("records.csv", "w") as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+            writer = csv.writer(text)
+            writer.writerow(columns)
+            for record in records:
+                writer.writerow([_csv_value(record.get(column)) for column in columns])
+
+    file.seek(0)
+    return file, columns
+
+
+def write_job_body(
+    module: str,
+    file_id: str,
+    columns: list,
+    operation: str = "upsert",
+    find_by: str = None,
+    ignore_empty: bool = True,
+) -> dict:
+    """Request body for POST /crm/bulk/v8/write mapping CSV column i to field columns[i]."""
+    if operation not in WRITE_OPERATIONS:
+        raise ValueError(f"operation must be one of {', '.join(WRITE_OPERATIONS)}")
+    if operation != "insert" and not find_by:
+        raise ValueError(f"find_by is required for {operation}")
+
+    resource = {
+        "type": "data",
+        "module": {"api_name": module},
+        "file_id": file_id,
+        "field_mappings": [{"api_name": column, "index": index} for index, column in enumerate(columns)],
+    }
+    if find_by:
+        resource["find_by"] = find_by
+    return {"operation": operation, "ignore_empty": ignore_empty, "resource": [resource]}
+
+
+def pending_write_result(exc: BulkJobTimeout) -> dict:
+    """Tool result for a bulk write that was still running when the tool stopped waiting."""
+    message = f"Bulk write job {exc.job.get('id')} is still running in Zoho and will finish on its own; its results are not included."
+    if exc.unsubmitted:
+        message += f" {exc.unsubmitted} records after it were not submitted; send them in a new call."
+    return {
+        "jobs": exc.completed,
+        "pending_job": {"id": exc.job.get("id"), "status": exc.job.get("status")},
+        "unsubmitted_records": exc.unsubmitted,
+        "message": message,
+    }
+
+
+def write_job_summary(job: dict, report: Iterator[dict] = ()) -> dict:
+    """Counts from a finished Bulk Write job plus the first failed rows of its result report."""
+    counts = {}
+    for resource in job.get("resource") or []:
+        for key, value in (resource.get("file") or {}).items():
+            if key.endswith("_count"):
+                counts[key] = counts.get(key, 0) + value
+
+    failures = []
+    for row in report:
+        status = (row.get("STATUS") or "").upper()
+        if status and status not in ("ADDED", "UPDATED"):
+            failures.append(row)
+            if len(failures) >= WRITE_REPORT_FAILURES:
+                break
+
+    return {"job_id": job.get("id"), "status": job.get("status"), "counts": counts, "failures": failures}
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Callable
+from urllib.parse import parse_qsl, urlsplit
+
+
+COMPOSITE_MAX_REQUESTS = 5
+COMPOSITE_WINDOW = float(os.getenv("ZOHO_COMPOSITE_WINDOW", "0.005"))
+
+# Reads that are safe to run as independent composite sub-requests.
+BATCHABLE_ENDPOINTS = frozenset({
+    "records.get",
+    "records.list",
+    "settings.fields",
+    "settings.modules",
+    "users.get",
+})
+
+_window: ContextVar[float | None] = ContextVar("zoho_composite_window", default=None)
+
+
+@contextmanager
+def batching(window: float = COMPOSITE_WINDOW):
+    """
+    Coalesce batchable GETs issued inside this block into composite requests.
+
+    Calls that arrive within `window` seconds of the first pending one (up
+    to 5) go out as a single /__composite_requests call. The setting is a
+    context variable, so it follows asyncio tasks and LangChain's worker
+    threads started inside the block, e.g. a ToolNode running several tool
+    calls at once. Calls made alone still wait out the window, so only
+    enable it where requests are expected to overlap.
+    """
+    token = _window.set(window if window > 0 else None)
+    try:
+        yield
+    finally:
+        _window.reset(token)
+
+
+def current_window() -> float | None:
+    return _window.get()
+
+
+def sub_request(method: str, url: str, params: dict = None, headers: dict = None) -> dict:
+    """Composite sub-request for an absolute Zoho API URL."""
+    parts = urlsplit(url)
+    sub = {"method": method, "uri": parts.path}
+    params = {**dict(parse_qsl(parts.query)), **(params or {})}
+    if params:
+        sub["params"] = {key: value for key, value in params.items() if value is not None}
+    if headers:
+        sub["headers"] = headers
+    return sub
+
+
+# Framing headers of a sub-response no longer describe the re-encoded body.
+_FRAMING_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding"})
+
+
+def sub_response_headers(headers: dict) -> dict:
+    return {name: value for name, value in headers.items() if name.lower() not in _FRAMING_HEADERS}
+
+
+def composite_body(subs: list[dict]) -> dict:
+    return {
+        "parallel_execution": True,
+        "rollback_on_fail": False,
+        "__composite_requests": [
+            {"sub_request_id": str(index), **sub} for index, sub in enumerate(subs)
+        ],
+    }
+
+
+def split_composite_response(body: dict, count: int) -> list[tuple[int, dict | None, dict]]:
+    """(status_code, body, headers) per sub-request, in submission order."""
+    results = [(500, {"code": "MISSING_SUB_RESPONSE"}, {})] * count
+    for item in body.get("__composite_requests", []):
+        index = int(item.get("sub_request_id", -1))
+        if not 0 <= index < count:
+            continue
+        response = (item.get("details") or {}).get("response") or {}
+        results[index] = (
+            int(response.get("status_code", 500)),
+            response.get("body"),
+            response.get("headers") or {},
+        )
+    return results
+
+
+class CompositeBatcher:
+    """
+    Collects sub-requests from concurrent threads and hands them to `send`
+    in groups of up to max_size, either when a group fills up or when the
+    window of its first request runs out. Each caller blocks on its own
+    result.
+    """
+
+    def __init__(self, send: Callable[[list], list], max_size: int = COMPOSITE_MAX_REQUESTS):
+        self._send = send
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+        self.batches = 0
+        self.batched_requests = 0
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "batched_requests": self.batched_requests,
+            "saved_calls": self.batched_requests - self.batches,
+        }
+
+    def submit(self, item, window: float):
+        future = Future()
+        with self._lock:
+            self._pending.append((item, future))
+            batch = self._take() if len(self._pending) >= self.max_size else None
+            if batch is None and self._timer is None:
+                # Flush in the first caller's context, so its log fields follow the batch.
+                self._timer = threading.Timer(window, copy_context().run, (self._flush,))
+                self._timer.daemon = True
+                self._timer.start()
+
+        if batch:
+            self._dispatch(batch)
+        return future.result()
+
+    def _take(self) -> list:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list):
+        self.batches += 1
+        self.batched_requests += len(batch)
+        try:
+            results = self._send([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+class AsyncCompositeBatcher:
+    """CompositeBatcher for coroutines on one event loop; `send` is awaited."""
+
+    def __init__(self, send, max_size: int = COMPOSITE_MAX_REQUESTS):
+        self._send = send
+        self.max_size = max_size
+        self._pending = []
+        self._timer = None
+        self._loop = None
+        self._tasks = set()
+
+        self.batches = 0
+        self.batched_requests = 0
+
+    stats = CompositeBatcher.stats
+
+    async def submit(self, item, window: float):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._pending, self._timer, self._loop = [], None, loop
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._start(self._take())
+        elif self._timer is None:
+            self._timer = loop.call_later(window, self._flush)
+        return await future
+
+    def _take(self) -> list:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush(self):
+        batch = self._take()
+        if batch:
+            self._start(batch)
+
+    def _start(self, batch: list):
+        task = self._loop.create_task(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list):
+        self.batches += 1
+        self.batched_requests += len(batch)
+        try:
+            results = await self._send([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,84 @@
+import os
+import re
+
+from utils.query_validator import canonical_coql
+
+
+COQL_MAX_PAGE_SIZE = 2000
+COQL_MAX_OFFSET = 100_000
+COQL_CACHE_TTL = float(os.getenv("ZOHO_COQL_CACHE_TTL", "30"))
+COQL_CACHE_SIZE = int(os.getenv("ZOHO_COQL_CACHE_SIZE", "256"))
+
+_FROM_RE = re.compile(r"\bfrom (\w+)")
+
+_LIMIT_RE = re.compile(
+    r"\s+LIMIT\s+(\d+)(?:\s*,\s*(\d+))?(?:\s+OFFSET\s+(\d+))?\s*;?\s*$",
+    re.IGNORECASE,
+)
+
+
+def split_limit(query: str) -> tuple[str, int, int | None]:
+    """
+    Separate a trailing LIMIT clause from a COQL query.
+
+    Returns (query without LIMIT, offset, limit). Handles "LIMIT n",
+    "LIMIT offset, n" and "LIMIT n OFFSET offset"; limit is None when the
+    query had no LIMIT.
+    """
+    match = _LIMIT_RE.search(query)
+    if not match:
+        return query.strip().rstrip(";"), 0, None
+
+    first, second, offset = match.groups()
+    if second is not None:
+        return query[:match.start()], int(first), int(second)
+    return query[:match.start()], int(offset or 0), int(first)
+
+
+def with_limit(query: str, limit: int, offset: int) -> str:
+    return f"{query} LIMIT {limit} OFFSET {offset}"
+
+
+class PageBudget:
+    """
+    Row / byte caps for a streamed query.
+
+    Bytes are accounted per page from the response body size and spread
+    evenly over that page's rows, so a cap stops mid-page rather than one
+    whole 2000-row page late.
+    """
+
+    def __init__(self, max_rows: int | None = None, max_bytes: int | None = None):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.rows = 0
+        self.bytes = 0.0
+        self.truncated = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.truncated or (self.max_rows is not None and self.rows >= self.max_rows)
+
+    def take(self, rows: list, page_bytes: int):
+        per_row = page_bytes / len(rows) if rows else 0
+        for row in rows:
+            if self.exhausted or (self.max_bytes is not None and self.bytes + per_row > self.max_bytes):
+                self.truncated = True
+                return
+            self.rows += 1
+            self.bytes += per_row
+            yield row
+
+
+def query_cache_key(query: str, *variant) -> tuple | None:
+    """
+    Result-cache key for a COQL query: (module, canonical query, *variant).
+
+    The module comes first so writes can drop every cached query on it.
+    Returns None when no FROM module can be found (not cacheable).
+    """
+    canonical = canonical_coql(query)
+    match = _FROM_RE.search(canonical)
+    if not match:
+        return None
+    return (match.group(1).casefold(), canonical, *variant)
@@ -1,10 +1,101 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import IO, Iterator
+from urllib.parse import urlsplit
 import requests
-from langsmith import Client
+from zoho.bulk import (
+    BULK_WRITE_MAX_RECORDS,
+    BULK_BATCH_SIZE,
+    BULK_DOWNLOAD_CHUNK,
+    BULK_JOB_TIMEOUT,
+    BULK_TOOL_TIMEOUT,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    WRITE_JOB_FAILED,
+    BulkJobError,
+    BulkJobTimeout,
+    iter_csv_batches,
+    iter_csv_rows,
+    next_read_page,
+    pending_write_result,
+    poll_delays,
+    read_job_body,
+    records_to_zip,
+    spool,
+    write_job_body,
+    write_job_summary,
+)
+from zoho.cache import TTLCache
+from zoho.composite import (
+    BATCHABLE_ENDPOINTS,
+    CompositeBatcher,
+    composite_body,
+    current_window,
+    split_composite_response,
+    sub_request,
+    sub_response_headers,
+)
+from zoho.coql import (
+    COQL_CACHE_SIZE,
+    COQL_CACHE_TTL,
+    COQL_MAX_OFFSET,
+    COQL_MAX_PAGE_SIZE,
+    PageBudget,
+    query_cache_key,
+    split_limit,
+    with_limit,
+)
+from zoho.json_body import detached, response_json, with_json
+from zoho.metrics import MetricsSink, default_metrics, observe_response
+from zoho.module_catalog import MODULE_CATALOG_FAILED_KEY, MODULE_CATALOG_KEY, ModuleCatalog
+from zoho.rate_limiter import RateLimiter
+from zoho.records import (
+    RECORDS_CACHE_SIZE,
+    RECORDS_CACHE_TTL,
+    RECORDS_MAX_PER_PAGE,
+    WRITE_CONCURRENCY,
+    chunk_payload,
+    list_params,
+    merge_write_results,
+    needs_chunking,
+    next_page,
+    written_record_ids,
+)
+from zoho.retry import RetryPolicy, RetryStats
+from zoho.session import PooledSession
+from zoho.singleflight import SingleFlight, request_key
+from zoho.token_manager import TokenManager, TokenState
+from zoho.users_directory import USERS_PAGE_SIZE, UsersDirectory
+from utils.log import get_logger, log_body, log_fields, new_request_id
 from dotenv import load_dotenv
 load_dotenv()
 import os
 
-client = Client() 
+
+log = get_logger(__name__)
+
+ZOHO_API_DOMAIN = os.getenv("ZOHO_API_DOMAIN", "https://www.zohoapis.com")
+ZOHO_ACCOUNTS_DOMAIN = os.getenv("ZOHO_ACCOUNTS_DOMAIN", "https://accounts.zoho.com")
+# File uploads (Bulk Write) go to the content domain, not the API domain.
+ZOHO_CONTENT_DOMAIN = os.getenv("ZOHO_CONTENT_DOMAIN", "https://content.zohoapis.com")
+ZOHO_ORG_ID = os.getenv("ZOHO_ORG_ID")
+FIELDS_CACHE_TTL = float(os.getenv("ZOHO_FIELDS_CACHE_TTL", "3600"))
+MODULES_CACHE_TTL = float(os.getenv("ZOHO_MODULES_CACHE_TTL", "3600"))
+# After a failed /settings/modules fetch, resolve_module passes names through for this long.
+MODULES_FAILURE_TTL = float(os.getenv("ZOHO_MODULES_FAILURE_TTL", "30"))
+
+
+class ZohoAPIError(Exception):
+    """Zoho rejected a request made from a streaming API that cannot return tool_error()."""
+
+    def __init__(self, status_code: int, details: dict | None = None):
+        super().__init__(f"Zoho CRM rejected the request ({status_code})")
+        self.status_code = status_code
+        self.details = details or {}
 
 
 def tool_error(
@@ -27,92 +118,332 @@ def tool_error(
     }
 
 
+def log_response(logger, request_id: str, method: str, url: str, endpoint: str, attempt: int, elapsed: float, response, stream: bool = False):
+    """One line per HTTP attempt: DEBUG normally, WARNING for 4xx/5xx; the body only with LOG_BODIES."""
+    level = logging.WARNING if response.status_code >= 400 else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(
+        level,
+        "zoho %s %s -> %s",
+        method,
+        endpoint,
+        response.status_code,
+        extra=log_fields(
+            request_id=request_id,
+            path=urlsplit(url).path,
+            attempt=attempt,
+            elapsed_ms=round(elapsed * 1000, 1),
+        ),
+    )
+    if not stream:
+        log_body(logger, "zoho response body", lambda: response_json(response, None), request_id=request_id)
+
+
+def filter_fields(data: dict, datatypes: list) -> list:
+    """Reshape a /settings/fields payload, keeping only the requested data types."""
+    fetch_all = ("ALL" in datatypes or "all" in datatypes) if datatypes else False
+
+
+    fields = []
+    for field in data.get("fields", []):
+        data_type = field.get("data_type", "")
+
+        if not fetch_all and datatypes and data_type not in datatypes:
+            continue
+
+        pick_list_values = field.get("pick_list_values", [])
+
+        fields.append({
+            "api_name": field.get("api_name", ""),
+            "data_type": data_type,
+            "mandatory": field.get("system_mandatory", False),
+            "values": [item.get("display_value") for item in pick_list_values]
+        })
+
+    return fields
+
+
+def format_modules(data: dict) -> list:
+    """Reshape a /settings/modules payload into label / api_name pairs."""
+    res_data = []
+    for module in data.get('modules',[]):
+
+      res_data.append({
+          'label': module.get('actual_plural_label', ''),
+          'api_name': module.get('api_name', '')
+      })
+
+    return res_data
+
+
 class ZohoCRMClient:
-    def __init__(self, refresh_token, client_id, client_secret, zapikey):
+    def __init__(
+        self,
+        refresh_token,
+        client_id,
+        client_secret,
+        zapikey,
+        session: requests.Session = None,
+        api_domain: str = ZOHO_API_DOMAIN,
+        accounts_domain: str = ZOHO_ACCOUNTS_DOMAIN,
+        content_domain: str = ZOHO_CONTENT_DOMAIN,
+        org_id: str = ZOHO_ORG_ID,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        token_state: TokenState = None,
+        field_cache: TTLCache = None,
+        module_cache: TTLCache = None,
+        record_cache: TTLCache = None,
+        query_cache: TTLCache = None,
+        users: UsersDirectory = None,
+        write_concurrency: int = WRITE_CONCURRENCY,
+        metrics: MetricsSink | None = None,
+    ):
         self.refresh_token = refresh_token
         self.client_id = client_id
         self.client_secret = client_secret
-        self.access_token = self.refresh_access_token()
+        self.session = session or PooledSession()
+        self.api_domain = api_domain.rstrip("/")
+        self.accounts_domain = accounts_domain.rstrip("/")
+        self.content_domain = content_domain.rstrip("/")
+        self.org_id = org_id
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        # Per-endpoint latency/size/status metrics; None (ZOHO_METRICS unset) records nothing.
+        self.metrics = metrics if metrics is not None else default_metrics()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Raw /settings/fields payloads by module, shared by every conversation.
+        self.field_cache = field_cache if field_cache is not None else TTLCache(ttl=FIELDS_CACHE_TTL)
+        self.module_cache = module_cache if module_cache is not None else TTLCache(ttl=MODULES_CACHE_TTL)
+        # Full records by (module, id); writes through this client invalidate their entries.
+        self.record_cache = (
+            record_cache if record_cache is not None
+            else TTLCache(ttl=RECORDS_CACHE_TTL, maxsize=RECORDS_CACHE_SIZE)
+        )
+        # COQL results by (module, canonical query); any write to the module drops them.
+        self.query_cache = (
+            query_cache if query_cache is not None
+            else TTLCache(ttl=COQL_CACHE_TTL, maxsize=COQL_CACHE_SIZE)
+        )
+        self.users = users if users is not None else UsersDirectory()
+        # How many 100-record chunks of a bulk create/update are sent at once.
+        self.write_concurrency = write_concurrency
+        self._users_lock = threading.Lock()
+        # The first request fetches the token; construction does no network I/O.
+        self.tokens = TokenManager(self._request_token, state=token_state)
+        # Batchable GETs made inside zoho.composite.batching() share composite calls.
+        self.composite = CompositeBatcher(self._send_composite)
+        # Identical GET/COQL requests in flight at the same time share one call;
+        # each waiting caller gets its own copy of the response to decode.
+        self.inflight = SingleFlight(share=detached)
         self.zapikey = zapikey
 
-    def refresh_access_token(self):
-        url = (
-            f"https://accounts.zoho.com/oauth/v2/token?refresh_token={self.refresh_token}"
-            f"&client_id={self.client_id}"
-            f"&client_secret={self.client_secret}"
-            f"&grant_type=refresh_token"
-        )
-        response = requests.post(url)
+    @property
+    def access_token(self):
+        return self.tokens.get_token()
+
+    @access_token.setter
+    def access_token(self, token):
+        self.tokens.set_token(token)
+
+    def _request_token(self):
+        url = f"{self.accounts_domain}/oauth/v2/token"
+        params = {
+            "refresh_token": self.refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "refresh_token",
+        }
+        response = self._request("POST", url, "oauth.token", idempotent=True, auth=False, params=params)
         if response.status_code == 200:
-            access_token = response.json().get("access_token")
-            print("New Access Token:", access_token)
-            return access_token
+            data = response_json(response)
+            if self.metrics is not None:
+                self.metrics.token_refresh(True)
+            log.info("access token refreshed", extra=log_fields(expires_in=data.get("expires_in")))
+            return data
         else:
-            print("Failed to refresh token:", response.json())
+            body = response_json(response, None)
+            if self.metrics is not None:
+                self.metrics.token_refresh(False)
+            log.error(
+                "access token refresh failed",
+                extra=log_fields(status=response.status_code, error=body.get("error") if isinstance(body, dict) else None),
+            )
             return None
 
-    def get_records(self, module: str, fields: list = None):
-
-        print("modules",module)
-        print("fields",fields)
-
-        if not self.access_token:
-            self.access_token = self.refresh_access_token()
+    def refresh_access_token(self, stale_token: str = None):
+        """Force a refresh; concurrent callers holding the same stale token share one request."""
+        return self.tokens.refresh(stale_token or self.tokens.token)
 
-        url = f"https://www.zohoapis.com/crm/v8/{module}?fields="+",".join(fields)
-
-        print(url)
-
-        headers = {
+    def _auth_headers(self):
+        return {
             "Content-Type": "application/json",
             "Authorization": f"Zoho-oauthtoken {self.access_token}",
         }
 
-        response = requests.get(url, headers=headers)
-        print(response.json())
-        if response.status_code == 401:  
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_records(module, fields)  
-
-        if response.status_code not in (200, 201):
-            return tool_error(
-                tool="get_records_tool",
-                error_type="API_ERROR",
-                message="Zoho CRM rejected the request",
-                status_code=response.status_code,
-                details=response.json() if response.text else {}
-            )
+    def _handle_unauthorized(self, headers):
+        return self.refresh_access_token(headers["Authorization"].removeprefix("Zoho-oauthtoken "))
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        idempotent: bool = None,
+        auth: bool = True,
+        batch: bool = True,
+        coalesce: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send one logical request through the pooled session.
+
+        Each attempt first queues on self.rate_limiter for the endpoint's
+        class. A 401 refreshes the token and is replayed once. 429, 5xx and
+        network errors go through self.retry_policy; every retry is counted
+        in self.retry_stats under `endpoint`. Each attempt's latency, sizes
+        and status go to self.metrics when it is set. Returns the last
+        response, or re-raises the network error once attempts are exhausted.
+        Inside zoho.composite.batching(), batchable GETs are handed to
+        self.composite instead (unless batch=False). Concurrent identical
+        GET/COQL requests are coalesced through self.inflight (unless
+        coalesce=False) and all callers get the same response.
+        """
+        key = request_key(method, url, kwargs) if coalesce and self._coalescable(method, endpoint) else None
+        if key is not None:
+            return self.inflight.do(key, lambda: self._request(
+                method, url, endpoint, idempotent, auth, batch, coalesce=False, **kwargs
+            ))
+
+        window = current_window()
+        if window and batch and self._batchable(method, url, endpoint, kwargs):
+            return self._request_batched(url, endpoint, window, kwargs)
+
+        idempotent = self.retry_policy.is_idempotent(method, idempotent)
+        extra_headers = kwargs.pop("headers", None) or {}
+        refreshed = False
+        attempt = 1
+        request_id = new_request_id()
+        if "json" in kwargs:
+            log_body(log, "zoho request body", kwargs["json"], request_id=request_id, endpoint=endpoint)
+
+        while True:
+            headers = {**self._auth_headers(), **extra_headers} if auth else extra_headers
+
+            try:
+                with self.rate_limiter.limit(endpoint):
+                    start = time.perf_counter()
+                    response = self.session.request(method, url, headers=headers, **kwargs)
+            except requests.RequestException as exc:
+                # A connect timeout never reached Zoho, so it is safe to replay anything.
+                retryable = idempotent or isinstance(exc, requests.ConnectTimeout)
+                log.warning(
+                    "zoho %s %s failed: %s", method, endpoint, type(exc).__name__,
+                    extra=log_fields(request_id=request_id, attempt=attempt, retrying=retryable and attempt < self.retry_policy.max_attempts),
+                )
+                if self.metrics is not None:
+                    self.metrics.request(endpoint, method, type(exc).__name__, time.perf_counter() - start, 0, 0)
+                if not retryable or attempt >= self.retry_policy.max_attempts:
+                    raise
+                self._retried(endpoint, type(exc).__name__)
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                continue
 
-        return {
-            "success": True,
-            "data": response.json()
-        }
+            elapsed = time.perf_counter() - start
+            log_response(log, request_id, method, url, endpoint, attempt, elapsed, response, kwargs.get("stream", False))
+            if self.metrics is not None:
+                observe_response(self.metrics, method, endpoint, elapsed, response, kwargs.get("stream", False))
+
+            if auth and response.status_code == 401 and not refreshed:
+                log.info("access token rejected, refreshing", extra=log_fields(request_id=request_id))
+                refreshed = True
+                self._retried(endpoint, "401")
+                if self._handle_unauthorized(headers):
+                    continue
+                return response
+
+            if (
+                attempt < self.retry_policy.max_attempts
+                and self.retry_policy.should_retry_status(response.status_code, idempotent)
+            ):
+                self._retried(endpoint, str(response.status_code))
+                time.sleep(self.retry_policy.delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
 
+            return response
 
+    def _retried(self, endpoint: str, reason: str):
+        self.retry_stats.record(endpoint, reason)
+        if self.metrics is not None:
+            self.metrics.retry(endpoint, reason)
 
-    def get_specific_record(self, module: str, record_id:str):
+    @staticmethod
+    def _coalescable(method: str, endpoint: str) -> bool:
+        return (method == "GET" or endpoint == "coql") and endpoint != "oauth.token"
 
-        print("modules",module)
-
-        if not self.access_token:
-            self.access_token = self.refresh_access_token()
+    def _batchable(self, method: str, url: str, endpoint: str, kwargs: dict) -> bool:
+        return (
+            method == "GET"
+            and endpoint in BATCHABLE_ENDPOINTS
+            and url.startswith(self.api_domain)
+            and not kwargs.get("stream")
+        )
 
-        url = f"https://www.zohoapis.com/crm/v8/{module}/{record_id}"
+    def _request_batched(self, url: str, endpoint: str, window: float, kwargs: dict) -> requests.Response:
+        result = self.composite.submit((url, endpoint, kwargs), window)
+        if isinstance(result, requests.Response):
+            return result
+
+        status_code, body, headers = result
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(body).encode() if body is not None else b""
+        response.headers.update(sub_response_headers(headers))
+        response.encoding = "utf-8"
+        response.url = url
+        # The composite response was already decoded; don't parse this part again.
+        return with_json(response, body) if body is not None else response
+
+    def _send_composite(self, items: list) -> list:
+        """
+        Run queued GETs as one /__composite_requests call.
+
+        A lone request, a composite call Zoho rejects as a whole, and
+        sub-requests that came back retryable (429/5xx) are sent on their
+        own, so they still get the normal retry policy.
+        """
+        def direct(item):
+            url, endpoint, kwargs = item
+            return self._request("GET", url, endpoint, batch=False, coalesce=False, **kwargs)
+
+        if len(items) == 1:
+            return [direct(items[0])]
+
+        subs = [sub_request("GET", url, kwargs.get("params"), kwargs.get("headers")) for url, _, kwargs in items]
+        response = self._request(
+            "POST",
+            f"{self.api_domain}/crm/v8/__composite_requests",
+            "composite",
+            idempotent=True,
+            batch=False,
+            json=composite_body(subs),
+        )
+        if response.status_code not in (200, 207):
+            return [direct(item) for item in items]
 
-        print(url)
+        results = split_composite_response(response_json(response), len(items))
+        return [
+            direct(item) if result[0] in self.retry_policy.retry_statuses else result
+            for item, result in zip(items, results)
+        ]
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
+    def get_records(self, module: str, fields: list = None):
+        url = f"{self.api_domain}/crm/v8/{module}?fields="+",".join(fields)
 
-        response = requests.get(url, headers=headers)
-        print(response.json())
-        if response.status_code == 401: 
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_specific_record(module, record_id) 
+        response = self._request("GET", url, "records.list")
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -120,90 +451,170 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
 
-    def get_fields(self, module: str, datatypes: list):
-        url = f"https://www.zohoapis.com/crm/v8/settings/fields?module={module}"
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
+    def iter_record_pages(
+        self,
+        module: str,
+        fields: list,
+        per_page: int = RECORDS_MAX_PER_PAGE,
+        sort_by: str = None,
+        sort_order: str = None,
+        cvid: str = None,
+        max_records: int = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Stream a module listing one page (up to 200 records) at a time.
+
+        Follows `page` within the first 2000 records and `page_token`
+        beyond that, so full-module scans never hold more than one page.
+        `sort_by` is one of id / Created_Time / Modified_Time and `cvid`
+        restricts the listing to a custom view. Raises ZohoAPIError if Zoho
+        rejects a page.
+        """
+        url = f"{self.api_domain}/crm/v8/{module}"
+        params = list_params(fields, per_page, sort_by, sort_order, cvid)
+        paging = {"page": 1}
+        page = 1
+        remaining = max_records
+
+        while paging is not None and (remaining is None or remaining > 0):
+            response = self._request("GET", url, "records.list", params={**params, **paging})
+
+            if response.status_code == 204:
+                return
+            if response.status_code not in (200, 201):
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+
+            body = response_json(response)
+            records = body.get("data", [])
+            if remaining is not None:
+                records = records[:remaining]
+                remaining -= len(records)
+            if records:
+                yield records
+
+            paging = next_page(body.get("info", {}), page)
+            page += 1
+
+    def iter_records(self, module: str, fields: list, **kwargs) -> Iterator[dict]:
+        """iter_record_pages flattened to one record at a time."""
+        for records in self.iter_record_pages(module, fields, **kwargs):
+            yield from records
+
+    def _records_written(self, module: str, record_ids: set = None):
+        """
+        Drop cached state a write made stale: every cached COQL result on
+        the module, and the given records (or all of the module's records
+        when the ids are unknown).
+        """
+        module_key = module.casefold()
+        self.query_cache.invalidate_where(lambda key: key[0] == module_key)
+        if record_ids is None:
+            self.record_cache.invalidate_where(lambda key: key[0] == module)
+            return
+        for record_id in record_ids:
+            self.record_cache.invalidate((module, record_id))
+
+    def _lead_converted(self, lead_id: str, body: dict = None):
+        self._records_written("Leads", {str(lead_id)})
+        for entry in (body or {}).get("data") or []:
+            details = entry.get("details") or entry
+            for module, record in details.items():
+                if isinstance(record, dict) and record.get("id"):
+                    self._records_written(module, {str(record["id"])})
+
+    def get_specific_record(self, module: str, record_id:str):
+        cached = self.record_cache.get((module, str(record_id)))
+        if cached is not None:
+            return {
+                "success": True,
+                "data": cached
+            }
 
-        response = requests.get(url, headers=headers)
+        url = f"{self.api_domain}/crm/v8/{module}/{record_id}"
 
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_fields(module, datatypes)
+        response = self._request("GET", url, "records.get")
 
         if response.status_code not in (200, 201):
             return tool_error(
-                tool="get_fields_tool",
+                tool="get_records_tool",
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
-        data = response.json()
-
+        data = response_json(response)
+        self.record_cache.set((module, str(record_id)), data)
+        return {
+            "success": True,
+            "data": data
+        }
 
-        fetch_all = ("ALL" in datatypes or "all" in datatypes) if datatypes else False
 
+    def get_fields(self, module: str, datatypes: list):
+        data = self.field_cache.get(module)
 
-        fields = []
-        for field in data.get("fields", []):
-            data_type = field.get("data_type", "")
+        if data is None:
+            url = f"{self.api_domain}/crm/v8/settings/fields?module={module}"
 
-            if not fetch_all and datatypes and data_type not in datatypes:
-                continue
+            response = self._request("GET", url, "settings.fields")
 
-            pick_list_values = field.get("pick_list_values", [])
+            if response.status_code not in (200, 201):
+                return tool_error(
+                    tool="get_fields_tool",
+                    error_type="API_ERROR",
+                    message="Zoho CRM rejected the request",
+                    status_code=response.status_code,
+                    details=response_json(response, {})
+                )
 
-            fields.append({
-                "api_name": field.get("api_name", ""),
-                "data_type": data_type,
-                "mandatory": field.get("system_mandatory", False),
-                "values": [item.get("display_value") for item in pick_list_values]
-            })
+            data = response_json(response)
+            self.field_cache.set(module, data)
 
         return {
             "success": True,
-            "data": fields
+            "data": filter_fields(data, datatypes)
         }
 
+    def invalidate_fields(self, module: str = None):
+        """Drop cached field metadata for one module, or for all modules."""
+        if module is None:
+            self.field_cache.clear()
+        else:
+            self.field_cache.invalidate(module)
+
 
  
 
     def query_records(self, query: str):
-      url = "https://www.zohoapis.com/crm/v8/coql"
+      key = query_cache_key(query)
+      cached = self.query_cache.get(key) if key else None
+      if cached is not None:
+          return {
+              "success": True,
+              "data": cached
+          }
 
-      headers = {
-          "Content-Type": "application/json",
-          "Authorization": f"Zoho-oauthtoken {self.access_token}"
-      }
+      url = f"{self.api_domain}/crm/v8/coql"
 
       payload = {
           "select_query": query
       }
 
-      response = requests.post(url, headers=headers, json=payload)
-      print(response)
-      if response.status_code == 401:
-        print("⛔ Token expired — refreshing...")
-        self.access_token = self.refresh_access_token()
-        if self.access_token:
-            return self.query_records(query) 
-        else:
-            raise Exception("Token refresh failed")
+      # COQL is a read, so the POST is safe to replay.
+      response = self._request("POST", url, "coql", idempotent=True, json=payload)
+      if response.status_code == 401 and not self.tokens.token:
+          raise Exception("Token refresh failed")
 
       if response.status_code == 204:
           return {"data":[]} 
@@ -214,36 +625,394 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
+      data = response_json(response)
+      if key:
+          self.query_cache.set(key, data)
       return {
             "success": True,
-            "data": response.json()
+            "data": data
         }
 
 
 
-    def create_record(self, module: str, payload: dict):
-        url = f"https://www.zohoapis.com/crm/v8/{module}"
+    def iter_query(
+        self,
+        query: str,
+        page_size: int = COQL_MAX_PAGE_SIZE,
+        max_rows: int = None,
+        max_bytes: int = None,
+        budget: PageBudget = None,
+    ) -> Iterator[dict]:
+        """
+        Stream every row of a COQL query, one LIMIT/OFFSET page at a time.
+
+        A trailing LIMIT/OFFSET in `query` sets the starting offset and an
+        upper bound on rows. Pages are at most 2000 rows and stop at Zoho's
+        100k offset ceiling; `max_rows` / `max_bytes` cap the stream. Pass a
+        PageBudget to inspect rows, bytes and truncation afterwards.
+        Raises ZohoAPIError if Zoho rejects a page.
+        """
+        query, offset, limit = split_limit(query)
+        budget = budget or PageBudget(max_rows, max_bytes)
+        if limit is not None:
+            budget.max_rows = limit if budget.max_rows is None else min(budget.max_rows, limit)
+
+        url = f"{self.api_domain}/crm/v8/coql"
+        page_size = min(page_size, COQL_MAX_PAGE_SIZE)
+        more_records = True
+
+        while not budget.exhausted:
+            size = min(page_size, COQL_MAX_OFFSET - offset)
+            if budget.max_rows is not None:
+                size = min(size, budget.max_rows - budget.rows)
+            if size <= 0:
+                break
+
+            payload = {"select_query": with_limit(query, size, offset)}
+            response = self._request("POST", url, "coql", idempotent=True, json=payload)
+
+            if response.status_code == 204:
+                return
+            if response.status_code not in (200, 201):
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+
+            body = response_json(response)
+            rows = body.get("data", [])
+            yield from budget.take(rows, len(response.content))
+
+            more_records = bool(body.get("info", {}).get("more_records")) and len(rows) == size
+            if not more_records:
+                return
+            offset += len(rows)
+
+        budget.truncated = budget.truncated or more_records
+
+    def query_all_records(self, query: str, max_rows: int = None, max_bytes: int = None):
+        """query_records across pages, collected into the same response shape."""
+        key = query_cache_key(query, "all", max_rows, max_bytes)
+        cached = self.query_cache.get(key) if key else None
+        if cached is not None:
+            return {
+                "success": True,
+                "data": cached
+            }
+
+        budget = PageBudget(max_rows, max_bytes)
+        try:
+            rows = list(self.iter_query(query, budget=budget))
+        except ZohoAPIError as exc:
+            return tool_error(
+                tool="query_records_tools",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=exc.status_code,
+                details=exc.details
+            )
 
+        data = {
+            "data": rows,
+            "info": {"count": len(rows), "more_records": budget.truncated}
+        }
+        if key:
+            self.query_cache.set(key, data)
+        return {
+            "success": True,
+            "data": data
+        }
+
+
+    def create_bulk_read(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        page: int = 1,
+        page_token: str = None,
+        cvid: str = None,
+    ) -> dict:
+        """Submit a Bulk Read job (up to 200k records per page) and return its job details."""
+        url = f"{self.api_domain}/crm/bulk/v8/read"
+        body = read_job_body(module, fields, criteria, page, page_token, cvid)
+        response = self._request("POST", url, "bulk.read.create", json=body)
+
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["data"][0]["details"]
+
+    def get_bulk_read(self, job_id: str) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/read/{job_id}"
+        response = self._request("GET", url, "bulk.read.status")
+
+        if response.status_code != 200:
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["data"][0]
+
+    def wait_for_bulk_read(self, job_id: str, timeout: float = BULK_JOB_TIMEOUT) -> dict:
+        """
+        Poll a Bulk Read job with exponential backoff until it completes.
+
+        Returns the completed job; raises BulkJobError if it fails or is
+        still running after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        for delay in poll_delays():
+            job = self.get_bulk_read(job_id)
+            if job.get("state") == JOB_COMPLETED:
+                return job
+            if job.get("state") == JOB_FAILED:
+                raise BulkJobError(job)
+            if time.monotonic() + delay > deadline:
+                raise BulkJobTimeout(job, f"Bulk job {job_id} not finished after {timeout:g}s")
+            time.sleep(delay)
+
+    def download_bulk_read(self, job_id: str, file: IO[bytes] = None) -> IO[bytes]:
+        """
+        Stream a completed job's zipped CSV into `file` (a spooled temp file
+        by default) without holding the whole download in memory, and
+        return it rewound.
+        """
+        url = f"{self.api_domain}/crm/bulk/v8/read/{job_id}/result"
+        return self._download(url, "bulk.read.download", file)
+
+    def _download(self, url: str, endpoint: str, file: IO[bytes] = None) -> IO[bytes]:
+        file = file if file is not None else spool()
+
+        with self._request("GET", url, endpoint, stream=True) as response:
+            if response.status_code != 200:
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+            for chunk in response.iter_content(BULK_DOWNLOAD_CHUNK):
+                file.write(chunk)
+
+        file.seek(0)
+        return file
+
+    def _bulk_read_files(self, module: str, fields: list, criteria: dict, cvid: str, timeout: float):
+        paging = {"page": 1}
+        while paging is not None:
+            job = self.create_bulk_read(module, fields, criteria, cvid=cvid, **paging)
+            job = self.wait_for_bulk_read(job["id"], timeout)
+            with self.download_bulk_read(job["id"]) as file:
+                yield file
+            paging = next_read_page(job)
+
+    def iter_bulk_read(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        cvid: str = None,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> Iterator[dict]:
+        """
+        Export a module through Bulk Read and stream the rows as dicts.
+
+        Runs one job per 200k-record page (following page / page_token),
+        polling each with backoff and parsing its CSV as it is read. All
+        values are strings, as in Zoho's CSV export.
+        """
+        for file in self._bulk_read_files(module, fields, criteria, cvid, timeout):
+            yield from iter_csv_rows(file)
+
+    def iter_bulk_read_batches(
+        self,
+        module: str,
+        fields: list = None,
+        criteria: dict = None,
+        cvid: str = None,
+        batch_size: int = BULK_BATCH_SIZE,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> Iterator[dict[str, list]]:
+        """iter_bulk_read as columnar batches: {column: [values, ...]} of up to batch_size rows."""
+        for file in self._bulk_read_files(module, fields, criteria, cvid, timeout):
+            yield from iter_csv_batches(file, batch_size)
+
+    def get_org_id(self) -> str:
+        """The org's zgid (X-CRM-ORG header for uploads), from ZOHO_ORG_ID or fetched once from /org."""
+        if self.org_id is None:
+            response = self._request("GET", f"{self.api_domain}/crm/v8/org", "settings.org")
+            if response.status_code != 200:
+                raise ZohoAPIError(response.status_code, response_json(response, {}))
+            self.org_id = str(response_json(response)["org"][0]["zgid"])
+        return self.org_id
+
+    def upload_bulk_file(self, file: IO[bytes], name: str = "records.zip") -> str:
+        """Upload a zipped CSV for Bulk Write and return its file_id."""
+        url = f"{self.content_domain}/crm/v8/upload"
         headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
+            # Let requests set the multipart boundary instead of the JSON default.
+            "Content-Type": None,
+            "feature": "bulk-write",
+            "X-CRM-ORG": self.get_org_id(),
         }
+        # Read once so a 401/429 replay re-sends the whole file.
+        files = {"file": (name, file.read(), "application/zip")}
+        response = self._request("POST", url, "bulk.write.upload", headers=headers, files=files)
 
-        print("POST URL:", url)
-        print("PAYLOAD:", payload)
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["details"]["file_id"]
+
+    def create_bulk_write(
+        self,
+        module: str,
+        file_id: str,
+        columns: list,
+        operation: str = "upsert",
+        find_by: str = None,
+        ignore_empty: bool = True,
+    ) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/write"
+        body = write_job_body(module, file_id, columns, operation, find_by, ignore_empty)
+        response = self._request("POST", url, "bulk.write.create", json=body)
 
-        response = requests.post(url, headers=headers, json=payload)
+        if response.status_code not in (200, 201):
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)["details"]
+
+    def get_bulk_write(self, job_id: str) -> dict:
+        url = f"{self.api_domain}/crm/bulk/v8/write/{job_id}"
+        response = self._request("GET", url, "bulk.write.status")
+
+        if response.status_code != 200:
+            raise ZohoAPIError(response.status_code, response_json(response, {}))
+        return response_json(response)
+
+    def wait_for_bulk_write(self, job_id: str, timeout: float = BULK_JOB_TIMEOUT) -> dict:
+        """wait_for_bulk_read for Bulk Write jobs (which report `status`, not `state`)."""
+        deadline = time.monotonic() + timeout
+        for delay in poll_delays():
+            job = self.get_bulk_write(job_id)
+            if job.get("status") == JOB_COMPLETED:
+                return job
+            if job.get("status") == WRITE_JOB_FAILED:
+                raise BulkJobError(job)
+            if time.monotonic() + delay > deadline:
+                raise BulkJobTimeout(job, f"Bulk job {job_id} not finished after {timeout:g}s")
+            time.sleep(delay)
+
+    def iter_bulk_write_report(self, job: dict) -> Iterator[dict]:
+        """Stream a finished Bulk Write job's result report (one row per input row, with STATUS and ERRORS)."""
+        url = (job.get("result") or {}).get("download_url")
+        if not url:
+            return
+        if url.startswith("/"):
+            url = f"{self.api_domain}{url}"
+        with self._download(url, "bulk.write.download") as file:
+            yield from iter_csv_rows(file)
+
+    def bulk_write(
+        self,
+        module: str,
+        records: list[dict],
+        operation: str = "upsert",
+        find_by: str = None,
+        columns: list = None,
+        timeout: float = BULK_JOB_TIMEOUT,
+    ) -> list[dict]:
+        """
+        Insert, update or upsert records through Bulk Write jobs.
+
+        Records are zipped into CSVs of up to 25,000 rows (one job each),
+        uploaded, and each job is polled to completion. Returns one summary
+        per job: counts plus the first failed rows of its result report.
+        Raises ZohoAPIError / BulkJobError (BulkJobTimeout when a job outlives
+        `timeout`).
+        """
+        summaries = []
+        for start in range(0, len(records), BULK_WRITE_MAX_RECORDS):
+            file, job_columns = records_to_zip(records[start:start + BULK_WRITE_MAX_RECORDS], columns)
+            with file:
+                file_id = self.upload_bulk_file(file)
+            job = self.create_bulk_write(module, file_id, job_columns, operation, find_by)
+            try:
+                job = self.wait_for_bulk_write(job["id"], timeout)
+            except BulkJobTimeout as exc:
+                exc.completed = summaries
+                exc.unsubmitted = max(0, len(records) - start - BULK_WRITE_MAX_RECORDS)
+                raise
+            self._records_written(module)
+            summaries.append(write_job_summary(job, self.iter_bulk_write_report(job)))
+        return summaries
+
+    def bulk_write_records(
+        self,
+        module: str,
+        records: list[dict],
+        operation: str = "upsert",
+        find_by: str = None,
+        timeout: float = BULK_TOOL_TIMEOUT,
+    ):
+        """
+        bulk_write wrapped in the tool response shape. A job still running
+        after `timeout` is reported with its id instead of holding the tool
+        call open.
+        """
+        try:
+            jobs = self.bulk_write(module, records, operation, find_by, timeout=timeout)
+        except BulkJobTimeout as exc:
+            return {"success": True, "data": pending_write_result(exc)}
+        except ZohoAPIError as exc:
+            return tool_error(
+                tool="bulk_write_records_tool",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=exc.status_code,
+                details=exc.details,
+            )
+        except BulkJobError as exc:
+            return tool_error(
+                tool="bulk_write_records_tool",
+                error_type="BULK_JOB_ERROR",
+                message=str(exc),
+                details={"job": exc.job},
+            )
+        except ValueError as exc:
+            return tool_error(tool="bulk_write_records_tool", error_type="INVALID_INPUT", message=str(exc))
+
+        return {
+            "success": True,
+            "data": {"jobs": jobs},
+        }
+
+    def _write_chunked(self, method: str, url: str, endpoint: str, tool: str, payload: dict):
+        """
+        Send a >100-record write as 100-record chunks in parallel.
+
+        The rate limiter still bounds how many chunks are in flight; results
+        come back merged in input order (see merge_write_results).
+        """
+        chunks = chunk_payload(payload)
+
+        def send(chunk):
+            try:
+                response = self._request(method, url, endpoint, json=chunk)
+            except requests.RequestException as exc:
+                return None, {"code": "REQUEST_FAILED", "message": str(exc)}
+            return response.status_code, response_json(response, {})
+
+        # Each chunk runs in its own copy of this context (one Context can't be
+        # entered by two threads at once) so log_context fields reach the
+        # worker threads' log lines, as in the composite flush.
+        with ThreadPoolExecutor(max_workers=min(self.write_concurrency, len(chunks))) as pool:
+            futures = [pool.submit(copy_context().run, send, chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+
+        return merge_write_results(tool, chunks, results)
 
-        print("POST RESPONSE RAW:", response)
-        print("POST RESPONSE JSON:", response.json() if response.text else None)
+    def create_record(self, module: str, payload: dict):
+        url = f"{self.api_domain}/crm/v8/{module}"
+
+        if needs_chunking(payload):
+            result = self._write_chunked("POST", url, "records.create", "create_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
+
+        response = self._request("POST", url, "records.create", json=payload)
 
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.create_record(module, payload)
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -251,35 +1020,21 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
     
 
     def create_Task(self, payload: dict):
-        url = f"https://www.zohoapis.com/crm/v8/Tasks"
-
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
-
-        print("POST URL:", url)
-        print("PAYLOAD:", payload)
+        url = f"{self.api_domain}/crm/v8/Tasks"
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = self._request("POST", url, "records.create", json=payload)
 
-        print("POST RESPONSE RAW:", response)
-        print("POST RESPONSE JSON:", response.json() if response.text else None)
-
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.create_Task(payload)
+        self._records_written("Tasks", written_record_ids(payload, response_json(response, None)))
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -287,33 +1042,89 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
 
+    def _sync_users(self) -> requests.Response | None:
+        """
+        Bring self.users up to date: a paginated AllUsers load the first time
+        (and every full_reload_interval), otherwise an If-Modified-Since delta
+        once the TTL has passed. Returns the failing response, or None.
+        """
+        with self._users_lock:
+            if self.users.is_fresh():
+                return None
+
+            full = self.users.needs_full_reload()
+            started = self.users.now()
+            headers = {} if full else {"If-Modified-Since": self.users.if_modified_since()}
+            collected = []
+            page = 1
+
+            while True:
+                url = f"{self.api_domain}/crm/v8/users?type=AllUsers&page={page}&per_page={USERS_PAGE_SIZE}"
+                response = self._request("GET", url, "users.list", headers=headers)
+
+                if response.status_code in (204, 304):
+                    break
+                if response.status_code not in (200, 201):
+                    return response
+
+                body = response_json(response)
+                collected.extend(body.get("users", []))
+                if not body.get("info", {}).get("more_records"):
+                    break
+                page += 1
+
+            if full:
+                self.users.replace(collected, started)
+            else:
+                self.users.merge(collected, started)
+            return None
+
+    def find_user(self, value: str) -> dict | None:
+        """
+        User record by id, email or full name from the cached directory.
+        Raises AmbiguousUserError when several users share the full name.
+        """
+        if self._sync_users() is not None:
+            return None
+        return self.users.find(value)
+
     def get_all_users(self, user_type:str):
-        url = f"https://www.zohoapis.com/crm/v8/users?type={user_type}"
+        if not UsersDirectory.supports(user_type):
+            return self._fetch_users(user_type)
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
+        response = self._sync_users()
+        if response is not None:
+            return tool_error(
+                tool="get_all_users_tool",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=response.status_code,
+                details=response_json(response, {})
+            )
 
-        response = requests.get(url,headers=headers)
+        users = self.users.list(user_type)
+        return {
+            "success": True,
+            "data": {
+                "users": users,
+                "info": {"count": len(users), "more_records": False}
+            }
+        }
 
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_all_users(user_type)
+    def _fetch_users(self, user_type:str):
+        # Types the directory cannot derive (CurrentUser, DeletedUsers, ...) go to Zoho directly.
+        url = f"{self.api_domain}/crm/v8/users?type={user_type}"
 
-        if response.status_code not in (200, 201):
-            print(f"❌ API error {response.status_code}: {response.text}")
-            response.raise_for_status()
+        response = self._request("GET", url, "users.list")
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -321,33 +1132,27 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
 
     def get_specific_user(self, userID:str):
-        url = f"https://www.zohoapis.com/crm/v8/users?{userID}"
+        if self._sync_users() is None:
+            user = self.users.get(userID)
+            if user is not None:
+                return {
+                    "success": True,
+                    "data": {"users": [user]}
+                }
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
-
-        response = requests.get(url,headers=headers)
+        url = f"{self.api_domain}/crm/v8/users/{userID}"
 
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_specific_user(userID)
-
-        if response.status_code not in (200, 201):
-            print(f"❌ API error {response.status_code}: {response.text}")
-            response.raise_for_status()
+        response = self._request("GET", url, "users.get")
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -355,17 +1160,26 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
+        data = response_json(response)
+        self.users.merge(data.get("users", []))
+
         return {
             "success": True,
-            "data": response.json()
+            "data": data
         }
 
 
 
     def update_records(self, module: str, payload: dict, record_id: str = None):
+        if needs_chunking(payload):
+            url = f"{self.api_domain}/crm/v8/{module}"
+            result = self._write_chunked("PUT", url, "records.update", "update_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
+
         is_single = (
             "data" in payload and 
             len(payload["data"]) == 1 and 
@@ -375,68 +1189,72 @@ class ZohoCRMClient:
         # Build URL
         if is_single:
             record_id = payload["data"][0]["id"]
-            url = f"https://www.zohoapis.com/crm/v8/{module}/{record_id}"
+            url = f"{self.api_domain}/crm/v8/{module}/{record_id}"
         else:
-            url = f"https://www.zohoapis.com/crm/v8/{module}"
+            url = f"{self.api_domain}/crm/v8/{module}"
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
+        response = self._request("PUT", url, "records.update", json=payload)
+
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
+
+        if response.status_code not in (200, 201):
+            return tool_error(
+                tool="update_records_tool",
+                error_type="API_ERROR",
+                message="Zoho CRM rejected the request",
+                status_code=response.status_code,
+                details=response_json(response, {})
+            )
+
+        return {
+            "success": True,
+            "data": response_json(response)
         }
 
-        print("PUT URL:", url)
-        print("PAYLOAD:", payload)
 
-        response = requests.put(url, headers=headers, json=payload)
 
-        print("PUT RESPONSE RAW:", response)
-        print("PUT RESPONSE JSON:", response.json() if response.text else None)
+    def upsert_records(self, module: str, payload: dict, duplicate_check_fields: list = None):
+        """
+        Insert-or-update through /{module}/upsert.
+
+        Zoho matches each record on `duplicate_check_fields` (or the
+        module's system duplicate-check fields when omitted) and updates the
+        match instead of creating a duplicate, so no lookup query is needed
+        first. Payloads over 100 records are chunked like create_record.
+        """
+        url = f"{self.api_domain}/crm/v8/{module}/upsert"
+        if duplicate_check_fields:
+            payload = {**payload, "duplicate_check_fields": list(duplicate_check_fields)}
 
-        # Token refresh
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.update_records(module, payload)
+        if needs_chunking(payload):
+            result = self._write_chunked("POST", url, "records.upsert", "upsert_records_tool", payload)
+            self._records_written(module, written_record_ids(payload, result.get("data")))
+            return result
 
+        response = self._request("POST", url, "records.upsert", json=payload)
+        self._records_written(module, written_record_ids(payload, response_json(response, None)))
 
         if response.status_code not in (200, 201):
             return tool_error(
-                tool="update_records_tool",
+                tool="upsert_records_tool",
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
-
-
     def convert_lead(self,record_id:str, payload:dict):
         
-        url = f"https://www.zohoapis.com/crm/v8/Leads/{record_id}/actions/convert"
+        url = f"{self.api_domain}/crm/v8/Leads/{record_id}/actions/convert"
 
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
-
-        print("PUT URL:", url)
-        print("PAYLOAD:", payload)
-
-        response = requests.post(url, headers=headers, json=payload)
+        response = self._request("POST", url, "leads.convert", json=payload)
 
-        print("PUT RESPONSE RAW:", response)
-        print("PUT RESPONSE JSON:", response.json() if response.text else None)
-
-        # Handle token expiry
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.convert_lead(record_id, payload)
+        self._lead_converted(record_id, response_json(response, None))
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -444,16 +1262,16 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
     def send_mail(self, to_mail: str, mail_subject: str, mail_content:str):
-        url = f"https://www.zohoapis.com/crm/v7/functions/agentmail/actions/execute"
+        url = f"{self.api_domain}/crm/v7/functions/agentmail/actions/execute"
 
         params = {
             "auth_type": "apikey",       
@@ -465,13 +1283,8 @@ class ZohoCRMClient:
             "mailContent":mail_content
         }
 
-        print("PUT URL:", url)
-        print("PAYLOAD:", payload)
-
-        response = requests.post(url, json=payload,params=params)
+        response = self._request("POST", url, "functions.mail", auth=False, json=payload, params=params)
 
-        print("PUT RESPONSE RAW:", response)
-        print("PUT RESPONSE JSON:", response.json() if response.text else None)
 
         if response.status_code not in (200, 201):
             return tool_error(
@@ -479,58 +1292,63 @@ class ZohoCRMClient:
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
                 status_code=response.status_code,
-                details=response.json() if response.text else {}
+                details=response_json(response, {})
             )
 
         return {
             "success": True,
-            "data": response.json()
+            "data": response_json(response)
         }
 
     
-    def get_module_api_name(self):
-        url = f"https://www.zohoapis.com/crm/v8/settings/modules"
-
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Zoho-oauthtoken {self.access_token}",
-        }
-
-        response = requests.get(url,headers=headers)
-        print("Module response",response)
-
-        # Handle token expiry
-        if response.status_code == 401:
-            print("⛔ Token expired — refreshing...")
-            self.access_token = self.refresh_access_token()
-            return self.get_module_api_name()
-
-        # Other errors
-        if response.status_code not in (200, 201):
-            print(f"❌ API error {response.status_code}: {response.text}")
-            response.raise_for_status()
+    def get_module_catalog(self) -> ModuleCatalog:
+        """Cached, indexed /settings/modules catalog; raises requests.HTTPError if Zoho rejects it."""
+        catalog = self.module_cache.get(MODULE_CATALOG_KEY)
+
+        if catalog is None:
+            url = f"{self.api_domain}/crm/v8/settings/modules"
+
+            response = self._request("GET", url, "settings.modules")
+
+            if response.status_code not in (200, 201):
+                response.raise_for_status()
+                raise requests.HTTPError(f"Unexpected status {response.status_code}", response=response)
+
+            catalog = ModuleCatalog(response_json(response))
+            self.module_cache.set(MODULE_CATALOG_KEY, catalog)
+            self.module_cache.invalidate(MODULE_CATALOG_FAILED_KEY)
+
+        return catalog
+
+    def resolve_module(self, name: str) -> str | None:
+        """
+        API name for a module given its API name, plural or singular label
+        (any case). None when the module is unknown or the catalog cannot be
+        loaded, so callers can fall back to the name they were given. After
+        a failed load it does not try again for MODULES_FAILURE_TTL seconds,
+        so an outage doesn't add a retried catalog fetch to every tool call.
+        """
+        if self.module_cache.get(MODULE_CATALOG_FAILED_KEY):
+            return None
+        try:
+            return self.get_module_catalog().resolve(name)
+        except requests.RequestException:
+            self.module_cache.set(MODULE_CATALOG_FAILED_KEY, True, ttl=MODULES_FAILURE_TTL)
+            return None
 
-        # return response.json()
-        if response.status_code not in (200, 201):
+    def get_module_api_name(self):
+        try:
+            catalog = self.get_module_catalog()
+        except requests.HTTPError as exc:
             return tool_error(
                 tool="get_module_api_name_tool",
                 error_type="API_ERROR",
                 message="Zoho CRM rejected the request",
-                status_code=response.status_code,
-                details=response.json() if response.text else {}
+                status_code=exc.response.status_code,
+                details=response_json(exc.response, {})
             )
 
-        res_data = []
-        data = response.json()
-        
-        for module in data.get('modules',[]):
-
-          res_data.append({
-              'label': module.get('actual_plural_label', ''),
-              'api_name': module.get('api_name', '')
-          })
-
         return {
             "success": True,
-            "data": res_data
+            "data": format_modules(catalog.data)
         }
@@ -0,0 +1,72 @@
+import copy
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib decoder is used instead
+    orjson = None
+
+
+# "auto" uses orjson when it is installed; "json" forces the stdlib decoder.
+JSON_BACKEND = os.getenv("ZOHO_JSON_BACKEND", "auto")
+
+_MISSING = object()
+_ATTR = "_zoho_json"
+
+
+def loads(data: bytes | str):
+    """Decode JSON with orjson when available, falling back to the stdlib."""
+    if orjson is not None and JSON_BACKEND != "json":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (NaN, integers past 64 bits); let json decide.
+            pass
+    return json.loads(data)
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None and JSON_BACKEND != "json" else "json"
+
+
+def response_json(response, default=_MISSING):
+    """
+    Decoded body of a requests/httpx response, parsed at most once.
+
+    The result is kept on the response, so logging, error details and the
+    return value reuse the same parse (callers that joined a coalesced request
+    get a detached() copy with a parse of their own). With `default`,
+    an empty or non-JSON body returns it instead of raising ValueError.
+    """
+    body = response.__dict__.get(_ATTR, _MISSING)
+    if body is _MISSING:
+        content = response.content
+        try:
+            body = loads(content) if content else ValueError("empty response body")
+        except ValueError as exc:
+            body = exc
+        response.__dict__[_ATTR] = body
+
+    if isinstance(body, ValueError):
+        if default is _MISSING:
+            raise body
+        return default
+    return body
+
+
+def with_json(response, body):
+    """Attach an already decoded body to `response` so it is never re-parsed."""
+    response.__dict__[_ATTR] = body
+    return response
+
+
+def detached(response):
+    """
+    Shallow copy of a fully read response without its decoded body, so the
+    copy parses its own: callers handed the same coalesced response can
+    mutate what they decode without the others seeing it.
+    """
+    clone = copy.copy(response)
+    clone.__dict__.pop(_ATTR, None)
+    return clone
@@ -0,0 +1,198 @@
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Protocol
+
+
+ZOHO_METRICS = os.getenv("ZOHO_METRICS", "false").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Zoho reports the remaining API credits of the current window on each response.
+CREDITS_HEADER = "X-RATELIMIT-REMAINING"
+
+
+class MetricsSink(Protocol):
+    """
+    What the Zoho clients report. ClientMetrics is the built-in
+    implementation; anything with these three methods (a StatsD or
+    OpenTelemetry adapter, a test recorder) can be passed as `metrics=`.
+    """
+
+    def request(
+        self,
+        endpoint: str,
+        method: str,
+        status: str,
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        credits_remaining: int | None = None,
+    ): ...
+
+    def retry(self, endpoint: str, reason: str): ...
+
+    def token_refresh(self, ok: bool): ...
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, not cumulative."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        out = []
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            out.append((str(bound), total))
+        return out
+
+    def snapshot(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+class ClientMetrics:
+    """
+    Thread-safe in-memory MetricsSink: per-endpoint latency and payload-size
+    histograms, response status counts, retries, token refreshes and the
+    last reported API credit balance. render_prometheus() returns the
+    Prometheus text exposition format for a /metrics handler.
+    """
+
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS, size_buckets: tuple = SIZE_BUCKETS):
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency: dict[str, Histogram] = {}
+            self.request_size: dict[str, Histogram] = {}
+            self.response_size: dict[str, Histogram] = {}
+            self.statuses = Counter()
+            self.retries = Counter()
+            self.refreshes = Counter()
+            self.credits_remaining = None
+
+    def request(
+        self,
+        endpoint: str,
+        method: str,
+        status: str,
+        elapsed: float,
+        request_bytes: int,
+        response_bytes: int,
+        credits_remaining: int | None = None,
+    ):
+        with self._lock:
+            self._histogram(self.latency, endpoint, self.latency_buckets).observe(elapsed)
+            self._histogram(self.request_size, endpoint, self.size_buckets).observe(request_bytes)
+            self._histogram(self.response_size, endpoint, self.size_buckets).observe(response_bytes)
+            self.statuses[(endpoint, method, status)] += 1
+            if credits_remaining is not None:
+                self.credits_remaining = credits_remaining
+
+    def retry(self, endpoint: str, reason: str):
+        with self._lock:
+            self.retries[(endpoint, reason)] += 1
+
+    def token_refresh(self, ok: bool):
+        with self._lock:
+            self.refreshes["success" if ok else "failure"] += 1
+
+    @staticmethod
+    def _histogram(histograms: dict, endpoint: str, buckets: tuple) -> Histogram:
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = Histogram(buckets)
+        return histogram
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "latency": {endpoint: h.snapshot() for endpoint, h in self.latency.items()},
+                "request_bytes": {endpoint: h.snapshot() for endpoint, h in self.request_size.items()},
+                "response_bytes": {endpoint: h.snapshot() for endpoint, h in self.response_size.items()},
+                "statuses": {":".join(key): count for key, count in self.statuses.items()},
+                "retries": {":".join(key): count for key, count in self.retries.items()},
+                "token_refreshes": dict(self.refreshes),
+                "credits_remaining": self.credits_remaining,
+            }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, help_text, histograms in (
+                ("zoho_request_duration_seconds", "Zoho API latency per HTTP attempt.", self.latency),
+                ("zoho_request_size_bytes", "Zoho API request body size.", self.request_size),
+                ("zoho_response_size_bytes", "Zoho API response body size.", self.response_size),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for endpoint, histogram in sorted(histograms.items()):
+                    labels = f'endpoint="{endpoint}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            lines += [
+                "# HELP zoho_responses_total Zoho API responses by status (or network error).",
+                "# TYPE zoho_responses_total counter",
+            ]
+            for (endpoint, method, status), count in sorted(self.statuses.items()):
+                lines.append(f'zoho_responses_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            lines += ["# HELP zoho_retries_total Zoho API retries by reason.", "# TYPE zoho_retries_total counter"]
+            for (endpoint, reason), count in sorted(self.retries.items()):
+                lines.append(f'zoho_retries_total{{endpoint="{endpoint}",reason="{reason}"}} {count}')
+
+            lines += ["# HELP zoho_token_refreshes_total OAuth token refreshes.", "# TYPE zoho_token_refreshes_total counter"]
+            for outcome, count in sorted(self.refreshes.items()):
+                lines.append(f'zoho_token_refreshes_total{{outcome="{outcome}"}} {count}')
+
+            if self.credits_remaining is not None:
+                lines += [
+                    "# HELP zoho_api_credits_remaining API credits left in the current window, as last reported by Zoho.",
+                    "# TYPE zoho_api_credits_remaining gauge",
+                    f"zoho_api_credits_remaining {self.credits_remaining}",
+                ]
+        return "\n".join(lines) + "\n"
+
+
+def default_metrics() -> ClientMetrics | None:
+    """A ClientMetrics when ZOHO_METRICS is set, else None (instrumentation off)."""
+    return ClientMetrics() if ZOHO_METRICS else None
+
+
+def observe_response(sink: MetricsSink, method: str, endpoint: str, elapsed: float, response, stream: bool = False):
+    """Report one requests/httpx response to `sink`; streamed bodies are sized from Content-Length."""
+    request_bytes = int(response.request.headers.get("Content-Length") or 0) if response.request is not None else 0
+    if stream:
+        response_bytes = int(response.headers.get("Content-Length") or 0)
+    else:
+        response_bytes = len(response.content)
+    credits = response.headers.get(CREDITS_HEADER)
+    sink.request(
+        endpoint,
+        method,
+        str(response.status_code),
+        elapsed,
+        request_bytes,
+        response_bytes,
+        int(credits) if credits and credits.isdigit() else None,
+    )
@@ -0,0 +1,52 @@
+MODULE_CATALOG_KEY = "modules"
+# Marks a failed catalog fetch, so module resolution skips Zoho for a while.
+MODULE_CATALOG_FAILED_KEY = "modules:failed"
+
+# Every name a user or the model might use for a module.
+_NAME_KEYS = (
+    "api_name",
+    "module_name",
+    "plural_label",
+    "singular_label",
+    "actual_plural_label",
+    "actual_singular_label",
+)
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.replace("_", " ").split()).casefold()
+
+
+class ModuleCatalog:
+    """
+    Indexed view of a /settings/modules payload.
+
+    resolve() maps an API name, plural label or singular label, in any case
+    and with spaces or underscores, to the module's API name with a single
+    dict lookup, so tools can normalize "sales order" / "Sales_Orders" /
+    "SalesOrders" locally instead of asking the model for another round trip.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self._by_name = {}
+
+        for module in data.get("modules", []):
+            for key in _NAME_KEYS:
+                name = module.get(key)
+                if name:
+                    self._by_name.setdefault(_normalize(name), module)
+                    self._by_name.setdefault(_normalize(name).replace(" ", ""), module)
+
+    def __len__(self) -> int:
+        return len(self.data.get("modules", []))
+
+    def get(self, name: str) -> dict | None:
+        if not name:
+            return None
+        normalized = _normalize(name)
+        return self._by_name.get(normalized) or self._by_name.get(normalized.replace(" ", ""))
+
+    def resolve(self, name: str) -> str | None:
+        module = self.get(name)
+        return module.get("api_name") if module else None
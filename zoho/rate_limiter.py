@@ -0,0 +1,166 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+
+# Endpoint label (as passed to ZohoCRMClient._request) -> limiter class.
+ENDPOINT_CLASSES = {
+    "coql": "coql",
+    "composite": "read",
+    "records.list": "read",
+    "records.get": "read",
+    "records.create": "write",
+    "records.update": "write",
+    "records.upsert": "write",
+    "leads.convert": "write",
+    "functions.mail": "write",
+    "settings.fields": "settings",
+    "settings.modules": "settings",
+    "users.list": "settings",
+    "users.get": "settings",
+    "settings.org": "settings",
+    "bulk.read.create": "bulk",
+    "bulk.read.status": "bulk",
+    "bulk.read.download": "bulk",
+    "bulk.write.upload": "bulk",
+    "bulk.write.create": "bulk",
+    "bulk.write.status": "bulk",
+    "bulk.write.download": "bulk",
+}
+
+
+# Waits shorter than this are bookkeeping noise, not queueing.
+QUEUED_THRESHOLD = 0.001
+
+
+class EndpointLimit:
+    """Token bucket (`rate` calls/s, `burst` capacity) plus a cap on in-flight calls."""
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_env(cls, name: str, default: "EndpointLimit") -> "EndpointLimit":
+        """Read "rate,burst,concurrency" from ZOHO_RATE_LIMIT_<NAME>, e.g. "5,10,5"."""
+        raw = os.getenv(f"ZOHO_RATE_LIMIT_{name.upper()}")
+        if not raw:
+            return default
+        rate, burst, concurrency = (part.strip() for part in raw.split(","))
+        return cls(float(rate), int(burst), int(concurrency))
+
+
+DEFAULT_LIMITS = {
+    "coql": EndpointLimit.from_env("coql", EndpointLimit(rate=5, burst=10, concurrency=5)),
+    "read": EndpointLimit.from_env("read", EndpointLimit(rate=10, burst=20, concurrency=10)),
+    "write": EndpointLimit.from_env("write", EndpointLimit(rate=5, burst=10, concurrency=5)),
+    "settings": EndpointLimit.from_env("settings", EndpointLimit(rate=5, burst=10, concurrency=5)),
+    "bulk": EndpointLimit.from_env("bulk", EndpointLimit(rate=1, burst=5, concurrency=3)),
+}
+
+
+class _Bucket:
+    def __init__(self, limit: EndpointLimit, clock):
+        self.limit = limit
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(limit.burst)
+        self._updated = clock()
+        self.semaphore = threading.BoundedSemaphore(limit.concurrency)
+        self._async_semaphore = None
+        self._async_loop = None
+
+        self.calls = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Take one token, possibly from the future; return how long to wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.limit.burst, self._tokens + (now - self._updated) * self.limit.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.limit.rate
+
+    def async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore is None or self._async_loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.limit.concurrency)
+            self._async_loop = loop
+        return self._async_semaphore
+
+    def record(self, wait: float):
+        with self._lock:
+            self.calls += 1
+            if wait >= QUEUED_THRESHOLD:
+                self.waited += 1
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+
+class RateLimiter:
+    """
+    Client-side limiter that keeps us inside Zoho's API credit and
+    concurrency limits by queueing calls instead of letting them fail.
+
+    Each endpoint class (coql, read, write, settings, bulk) has its own bucket and
+    in-flight cap. Callers block (or await) until both allow them through;
+    the time spent queued is exposed per class through stats().
+    Endpoints that are not classified (e.g. the OAuth token call) pass through.
+    """
+
+    def __init__(self, limits: dict = None, clock=time.monotonic):
+        self._clock = clock
+        self._buckets = {
+            name: _Bucket(limit, clock)
+            for name, limit in (limits or DEFAULT_LIMITS).items()
+        }
+
+    def _bucket(self, endpoint: str) -> _Bucket | None:
+        return self._buckets.get(ENDPOINT_CLASSES.get(endpoint, endpoint))
+
+    @contextmanager
+    def limit(self, endpoint: str):
+        bucket = self._bucket(endpoint)
+        if bucket is None:
+            yield
+            return
+
+        start = self._clock()
+        with bucket.semaphore:
+            delay = bucket.reserve()
+            if delay:
+                time.sleep(delay)
+            bucket.record(self._clock() - start)
+            yield
+
+    @asynccontextmanager
+    async def alimit(self, endpoint: str):
+        bucket = self._bucket(endpoint)
+        if bucket is None:
+            yield
+            return
+
+        start = self._clock()
+        async with bucket.async_semaphore():
+            delay = bucket.reserve()
+            if delay:
+                await asyncio.sleep(delay)
+            bucket.record(self._clock() - start)
+            yield
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "calls": bucket.calls,
+                "queued": bucket.waited,
+                "queue_wait_seconds": round(bucket.wait_seconds, 6),
+                "max_queue_wait_seconds": round(bucket.max_wait_seconds, 6),
+            }
+            for name, bucket in self._buckets.items()
+        }
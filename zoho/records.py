@@ -0,0 +1,119 @@
+import os
+
+
+RECORDS_MAX_PER_PAGE = 200
+RECORDS_SORT_FIELDS = ("id", "Created_Time", "Modified_Time")
+
+
+def list_params(
+    fields: list,
+    per_page: int = RECORDS_MAX_PER_PAGE,
+    sort_by: str = None,
+    sort_order: str = None,
+    cvid: str = None,
+) -> dict:
+    """Query string for GET /crm/v8/{module}, minus the paging keys."""
+    if not fields:
+        raise ValueError("fields is required when listing records")
+    if sort_by is not None and sort_by not in RECORDS_SORT_FIELDS:
+        raise ValueError(f"sort_by must be one of {', '.join(RECORDS_SORT_FIELDS)}")
+
+    params = {"fields": ",".join(fields), "per_page": min(per_page, RECORDS_MAX_PER_PAGE)}
+    if sort_by:
+        params["sort_by"] = sort_by
+    if sort_order:
+        params["sort_order"] = sort_order
+    if cvid:
+        params["cvid"] = cvid
+    return params
+
+
+def next_page(info: dict, page: int) -> dict | None:
+    """
+    Paging keys for the page after `page`, or None on the last page.
+
+    Zoho only serves `page` numbers within the first 2000 records; past
+    that the listing has to continue from `next_page_token`, so the token
+    is preferred whenever the response carries one.
+    """
+    if not info.get("more_records"):
+        return None
+    if info.get("next_page_token"):
+        return {"page_token": info["next_page_token"]}
+    return {"page": page + 1}
+
+
+RECORDS_MAX_PER_WRITE = 100
+WRITE_CONCURRENCY = int(os.getenv("ZOHO_WRITE_CONCURRENCY", "4"))
+
+
+def needs_chunking(payload: dict) -> bool:
+    return len(payload.get("data") or []) > RECORDS_MAX_PER_WRITE
+
+
+def chunk_payload(payload: dict, size: int = RECORDS_MAX_PER_WRITE) -> list[dict]:
+    """Split payload["data"] into `size`-record payloads that keep the other top-level keys (trigger, ...)."""
+    data = payload.get("data") or []
+    return [{**payload, "data": data[start:start + size]} for start in range(0, len(data), size)]
+
+
+def _chunk_error(status_code: int | None, body: dict) -> dict:
+    return {
+        "status": "error",
+        "code": body.get("code", "REQUEST_FAILED"),
+        "message": body.get("message", "Zoho CRM rejected the request"),
+        "details": {"status_code": status_code, **(body.get("details") or {})},
+    }
+
+
+def merge_write_results(tool: str, chunks: list[dict], results: list[tuple[int | None, dict]]) -> dict:
+    """
+    Merge per-chunk write responses back into one response in input order.
+
+    `results` holds (status_code, body) per chunk; status_code is None when
+    the request never got a response. A chunk Zoho rejected as a whole
+    contributes one error entry per record it carried, so data[i] always
+    describes the i-th input record.
+    """
+    merged = []
+    failed_chunks = []
+
+    for index, (chunk, (status_code, body)) in enumerate(zip(chunks, results)):
+        entries = body.get("data") if isinstance(body, dict) else None
+        if status_code is not None and isinstance(entries, list) and len(entries) == len(chunk["data"]):
+            merged.extend(entries)
+            continue
+
+        failed_chunks.append({"chunk": index, "status_code": status_code, "details": body})
+        merged.extend(_chunk_error(status_code, body if isinstance(body, dict) else {}) for _ in chunk["data"])
+
+    succeeded = sum(1 for entry in merged if entry.get("status") == "success")
+    failed = len(merged) - succeeded
+
+    return {
+        "success": succeeded > 0 or not merged,
+        "tool": tool,
+        "partial_failure": failed > 0,
+        "summary": {
+            "total": len(merged),
+            "succeeded": succeeded,
+            "failed": failed,
+            "chunks": len(chunks),
+            "failed_chunks": failed_chunks,
+        },
+        "data": {"data": merged},
+    }
+
+
+RECORDS_CACHE_TTL = float(os.getenv("ZOHO_RECORDS_CACHE_TTL", "120"))
+RECORDS_CACHE_SIZE = int(os.getenv("ZOHO_RECORDS_CACHE_SIZE", "1000"))
+
+
+def written_record_ids(payload: dict = None, body: dict = None) -> set[str]:
+    """Ids a write touched: those sent in payload["data"] plus those Zoho reports back in body["data"]."""
+    ids = {str(record["id"]) for record in (payload or {}).get("data") or [] if record.get("id")}
+    for entry in (body or {}).get("data") or []:
+        record_id = (entry.get("details") or {}).get("id")
+        if record_id:
+            ids.add(str(record_id))
+    return ids
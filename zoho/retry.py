@@ -0,0 +1,96 @@
+import os
+import random
+import threading
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Bounded retry with exponential backoff and full jitter.
+
+    - 429 is always retried (Zoho rejected it before doing any work) and
+      waits for Retry-After when the header is present.
+    - 5xx, timeouts and dropped connections are retried only for idempotent
+      requests: GET/PUT/DELETE, or a POST explicitly marked `idempotent=True`
+      such as a COQL read. Creates, lead conversion and mail are never replayed.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = int(os.getenv("ZOHO_RETRY_MAX_ATTEMPTS", "4")),
+        backoff_base: float = float(os.getenv("ZOHO_RETRY_BACKOFF_BASE", "0.5")),
+        backoff_max: float = float(os.getenv("ZOHO_RETRY_BACKOFF_MAX", "20")),
+        retry_statuses: frozenset = RETRYABLE_STATUSES,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+
+    @staticmethod
+    def is_idempotent(method: str, idempotent: bool | None = None) -> bool:
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        if status_code == 429:
+            return True
+        return idempotent and status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to sleep before retry number `attempt` (1-based)."""
+        hinted = parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(hinted, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class RetryStats:
+    """Thread-safe retry counters keyed by (endpoint, reason)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, endpoint: str, reason: str):
+        with self._lock:
+            self._counts[(endpoint, reason)] += 1
+
+    def by_endpoint(self) -> dict:
+        totals = Counter()
+        with self._lock:
+            for (endpoint, _), count in self._counts.items():
+                totals[endpoint] += count
+        return dict(totals)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {f"{endpoint}:{reason}": count for (endpoint, reason), count in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
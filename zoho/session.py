@@ -0,0 +1,43 @@
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("ZOHO_HTTP_POOL_CONNECTIONS", "4"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("ZOHO_HTTP_POOL_MAXSIZE", "20"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("ZOHO_HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("ZOHO_HTTP_READ_TIMEOUT", "60"))
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with a sized urllib3 connection pool and a default timeout.
+
+    Connections to zohoapis.com / accounts.zoho.com are kept alive and reused
+    across calls, so only the first request per pooled connection pays for
+    the TCP + TLS handshake.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        pool_block: bool = False,
+    ):
+        super().__init__()
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update({"Connection": "keep-alive"})
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+
+# Request kwargs that identify a read; anything else (files, stream, ...) is never shared.
+_KEY_KWARGS = frozenset({"params", "json", "headers"})
+
+
+def request_key(method: str, url: str, kwargs: dict) -> Hashable | None:
+    """Identity of a request for coalescing, or None if it must not be shared."""
+    if not _KEY_KWARGS.issuperset(kwargs):
+        return None
+    return method, url, json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the
+    same key wait for it and share its result (or exception). `shared`
+    counts the calls that were saved this way. With `share`, each waiting
+    caller gets share(result) instead of the leader's object, e.g. a copy
+    it may mutate.
+    """
+
+    def __init__(self, share: Callable[[Any], Any] = None):
+        self._share = share
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._share(call.result) if self._share else call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "calls": self.calls, "saved_calls": self.shared}
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines. The shared call runs as its own task, so a
+    caller that gets cancelled does not cancel it for the others. `share`
+    works as in SingleFlight.
+    """
+
+    def __init__(self, share: Callable[[Any], Any] = None):
+        self._share = share
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._loop = None
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._tasks, self._loop = {}, loop
+
+        task = self._tasks.get(key)
+        leader = task is None
+        if leader:
+            task = self._tasks[key] = loop.create_task(fn())
+            task.add_done_callback(lambda done: self._tasks.get(key) is done and self._tasks.pop(key))
+            self.calls += 1
+        else:
+            self.shared += 1
+        result = await asyncio.shield(task)
+        return self._share(result) if self._share and not leader else result
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._tasks), "calls": self.calls, "saved_calls": self.shared}
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Awaitable, Callable
+
+
+DEFAULT_REFRESH_MARGIN = float(os.getenv("ZOHO_TOKEN_REFRESH_MARGIN", "300"))
+DEFAULT_EXPIRES_IN = 3600
+
+
+class TokenState:
+    """
+    The current access token and its expiry (on the managers' clock).
+
+    Pass one instance to the TokenManager and AsyncTokenManager of the same
+    Zoho org so the sync and async clients use and refresh one token: a
+    refresh by either is seen by both. Each manager coalesces its own
+    callers; a sync and an async refresh racing each other may still both
+    fetch, and both tokens are valid.
+    """
+
+    def __init__(self):
+        self.token = None
+        self.expires_at = 0.0
+
+
+class TokenManager:
+    """
+    Thread-safe holder for a Zoho OAuth access token.
+
+    `fetch` performs the actual /oauth/v2/token call and returns the decoded
+    response ({"access_token": ..., "expires_in": ...}) or None on failure.
+
+    - get_token() returns the cached token while it is valid. Inside the last
+      `refresh_margin` seconds it still returns the current token but starts
+      one background refresh, so callers never wait on an hourly expiry.
+    - refresh(stale_token) is single-flight: concurrent callers that saw the
+      same rejected token share one fetch and all receive its result. A failed
+      refresh after a rejection clears the token; a failed background refresh
+      keeps the still-valid one.
+
+    `state` (a TokenState) may be shared with other managers of the same org.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict | None],
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.monotonic,
+        state: TokenState = None,
+    ):
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self.state = state if state is not None else TokenState()
+
+        self._lock = threading.Lock()
+        self._background = None
+        self.refresh_count = 0
+
+    @property
+    def token(self) -> str | None:
+        return self.state.token
+
+    @property
+    def expires_in(self) -> float:
+        return max(0.0, self.state.expires_at - self._clock())
+
+    def set_token(self, token: str | None, expires_in: float = DEFAULT_EXPIRES_IN):
+        self.state.token = token
+        self.state.expires_at = self._clock() + expires_in if token else 0.0
+
+    def get_token(self) -> str | None:
+        remaining = self.state.expires_at - self._clock()
+
+        if self.state.token is None or remaining <= 0:
+            return self.refresh(self.state.token)
+
+        if remaining <= self.refresh_margin:
+            self._refresh_in_background()
+
+        return self.state.token
+
+    def refresh(self, stale_token: str | None = None) -> str | None:
+        return self._refresh(stale_token, keep_current=False)
+
+    def _refresh(self, stale_token: str | None, keep_current: bool) -> str | None:
+        with self._lock:
+            if self.state.token is not None and self.state.token != stale_token and self.expires_in > 0:
+                return self.state.token
+
+            data = self._fetch()
+            self.refresh_count += 1
+            if data and data.get("access_token"):
+                self.set_token(data["access_token"], float(data.get("expires_in", DEFAULT_EXPIRES_IN)))
+            elif not keep_current:
+                self.set_token(None)
+            return self.state.token
+
+    def _refresh_in_background(self):
+        if self._background is not None and self._background.is_alive():
+            return
+
+        stale_token = self.state.token
+        self._background = threading.Thread(
+            target=self._refresh,
+            args=(stale_token, True),
+            name="zoho-token-refresh",
+            daemon=True,
+        )
+        self._background.start()
+
+
+class AsyncTokenManager:
+    """
+    asyncio flavour of TokenManager: refreshes are coalesced behind an
+    asyncio.Lock and proactive refreshes run as a background task.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[dict | None]],
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.monotonic,
+        state: TokenState = None,
+    ):
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self.state = state if state is not None else TokenState()
+
+        self._lock = None
+        self._lock_loop = None
+        self._background = None
+        self.refresh_count = 0
+
+    @property
+    def token(self) -> str | None:
+        return self.state.token
+
+    @property
+    def expires_in(self) -> float:
+        return max(0.0, self.state.expires_at - self._clock())
+
+    def set_token(self, token: str | None, expires_in: float = DEFAULT_EXPIRES_IN):
+        self.state.token = token
+        self.state.expires_at = self._clock() + expires_in if token else 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def get_token(self) -> str | None:
+        remaining = self.state.expires_at - self._clock()
+
+        if self.state.token is None or remaining <= 0:
+            return await self.refresh(self.state.token)
+
+        if remaining <= self.refresh_margin:
+            self._refresh_in_background()
+
+        return self.state.token
+
+    async def refresh(self, stale_token: str | None = None) -> str | None:
+        return await self._refresh(stale_token, keep_current=False)
+
+    async def _refresh(self, stale_token: str | None, keep_current: bool) -> str | None:
+        async with self._get_lock():
+            if self.state.token is not None and self.state.token != stale_token and self.expires_in > 0:
+                return self.state.token
+
+            data = await self._fetch()
+            self.refresh_count += 1
+            if data and data.get("access_token"):
+                self.set_token(data["access_token"], float(data.get("expires_in", DEFAULT_EXPIRES_IN)))
+            elif not keep_current:
+                self.set_token(None)
+            return self.state.token
+
+    def _refresh_in_background(self):
+        if self._background is not None and not self._background.done():
+            return
+
+        self._background = asyncio.get_running_loop().create_task(self._refresh(self.state.token, True))
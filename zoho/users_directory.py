@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from email.utils import formatdate
+from typing import Callable
+
+
+USERS_CACHE_TTL = float(os.getenv("ZOHO_USERS_CACHE_TTL", "300"))
+USERS_FULL_RELOAD_INTERVAL = float(os.getenv("ZOHO_USERS_FULL_RELOAD_INTERVAL", "86400"))
+USERS_PAGE_SIZE = 200
+
+
+def _is_active(user: dict) -> bool:
+    return user.get("status") == "active"
+
+
+def _is_admin(user: dict) -> bool:
+    return (user.get("profile") or {}).get("name") == "Administrator"
+
+
+# Zoho `type` values that can be answered from the AllUsers snapshot.
+USER_TYPE_FILTERS: dict[str, Callable[[dict], bool]] = {
+    "AllUsers": lambda user: True,
+    "ActiveUsers": _is_active,
+    "DeactiveUsers": lambda user: user.get("status") == "disabled",
+    "ConfirmedUsers": lambda user: bool(user.get("confirm")),
+    "NotConfirmedUsers": lambda user: not user.get("confirm"),
+    "ActiveConfirmedUsers": lambda user: _is_active(user) and bool(user.get("confirm")),
+    "AdminUsers": _is_admin,
+    "ActiveConfirmedAdmins": lambda user: _is_admin(user) and _is_active(user) and bool(user.get("confirm")),
+}
+
+
+def _key(value: str) -> str:
+    return " ".join(str(value).split()).casefold()
+
+
+class AmbiguousUserError(LookupError):
+    """A full name matched more than one user; `matches` lists them."""
+
+    def __init__(self, name: str, matches: list[dict]):
+        super().__init__(f"{len(matches)} users are named {name!r}; use an id or email")
+        self.name = name
+        self.matches = matches
+
+
+class UsersDirectory:
+    """
+    In-memory copy of the org's users with O(1) lookups by id, email and
+    full name. Full names are not unique: every user sharing one is kept,
+    and a lookup by a shared name raises AmbiguousUserError.
+
+    The client fills it with a paginated AllUsers load, then keeps it
+    current with If-Modified-Since deltas once `ttl` seconds have passed,
+    and does a full reload every `full_reload_interval` seconds to drop
+    users Zoho no longer returns.
+    """
+
+    def __init__(
+        self,
+        ttl: float = USERS_CACHE_TTL,
+        full_reload_interval: float = USERS_FULL_RELOAD_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.full_reload_interval = full_reload_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._by_id: dict[str, dict] = {}
+        self._by_email: dict[str, dict] = {}
+        # name key -> {user id: user} for every user with that full name
+        self._by_name: dict[str, dict[str, dict]] = {}
+        self.loaded_at: float | None = None
+        self.synced_at: float | None = None
+
+    @staticmethod
+    def supports(user_type: str) -> bool:
+        return user_type in USER_TYPE_FILTERS
+
+    def now(self) -> float:
+        return self._clock()
+
+    def is_fresh(self) -> bool:
+        return self.synced_at is not None and self._clock() - self.synced_at < self.ttl
+
+    def needs_full_reload(self) -> bool:
+        return self.loaded_at is None or self._clock() - self.loaded_at >= self.full_reload_interval
+
+    def if_modified_since(self) -> str:
+        return formatdate(self.synced_at, usegmt=True)
+
+    def replace(self, users: list[dict], synced_at: float):
+        with self._lock:
+            self._by_id.clear()
+            self._by_email.clear()
+            self._by_name.clear()
+            for user in users:
+                self._index(user)
+            self.loaded_at = self.synced_at = synced_at
+
+    def merge(self, users: list[dict], synced_at: float | None = None):
+        with self._lock:
+            for user in users:
+                self._index(user)
+            if synced_at is not None:
+                self.synced_at = synced_at
+
+    def _index(self, user: dict):
+        user_id = str(user.get("id", ""))
+        if not user_id:
+            return
+
+        previous = self._by_id.get(user_id)
+        if previous is not None:
+            # Only drop keys this user still owns; another user may hold them now.
+            if previous.get("email"):
+                email = _key(previous["email"])
+                if str(self._by_email.get(email, {}).get("id")) == user_id:
+                    del self._by_email[email]
+            if previous.get("full_name"):
+                name = _key(previous["full_name"])
+                named = self._by_name.get(name, {})
+                named.pop(user_id, None)
+                if not named:
+                    self._by_name.pop(name, None)
+
+        self._by_id[user_id] = user
+        if user.get("email"):
+            self._by_email[_key(user["email"])] = user
+        if user.get("full_name"):
+            self._by_name.setdefault(_key(user["full_name"]), {})[user_id] = user
+
+    def get(self, user_id: str) -> dict | None:
+        return self._by_id.get(str(user_id))
+
+    def by_email(self, email: str) -> dict | None:
+        return self._by_email.get(_key(email))
+
+    def named(self, full_name: str) -> list[dict]:
+        """Every user with this full name."""
+        return list(self._by_name.get(_key(full_name), {}).values())
+
+    def by_name(self, full_name: str) -> dict | None:
+        """The user with this full name; raises AmbiguousUserError if several share it."""
+        matches = self.named(full_name)
+        if len(matches) > 1:
+            raise AmbiguousUserError(full_name, matches)
+        return matches[0] if matches else None
+
+    def find(self, value: str) -> dict | None:
+        """Look a user up by id, then email, then full name (AmbiguousUserError if the name is shared)."""
+        return self.get(value) or self.by_email(value) or self.by_name(value)
+
+    def list(self, user_type: str = "AllUsers") -> list[dict]:
+        keep = USER_TYPE_FILTERS[user_type]
+        return [user for user in list(self._by_id.values()) if keep(user)]
+
+    def __len__(self) -> int:
+        return len(self._by_id)